@@ -41,10 +41,12 @@ from backend.app.scripts.create_proxy_records import create_proxies
 from backend.app.scripts.create_work_queues import create_default_work_queues
 from backend.app.scripts.payer_backbone.load_payer_backbone import load_payer_backbone
 from backend.app.utils.cors import cors
+from backend.app.utils.logger import change_log_writer
 from backend.app.utils.logging import Logger, get_app_logger
 from backend.app.utils.user import get_provider_detail
 from backend.common.db.init import init_db
 from backend.common.db.migrations import confirm_migration_quality, run_migrations
+from backend.common.events.event_publisher import event_publisher
 from backend.common.models.proxy import Proxy
 
 app = FastAPI()
@@ -77,6 +79,12 @@ async def app_init():
     await create_pipeline_registry()
 
 
+@app.on_event("shutdown")
+async def app_shutdown():
+    await event_publisher.close()
+    await change_log_writer.close()
+
+
 # must be first, reverse order...
 @app.exception_handler(Exception)
 async def last_chance_exception_handle(request, exc):
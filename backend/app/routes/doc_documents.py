@@ -21,6 +21,7 @@ from backend.app.services.payer_backbone.payer_backbone_querier import (
     ControlledLivesResponse,
     PayerBackboneQuerier,
 )
+from backend.app.utils.logger import Logger
 from backend.app.utils.user import get_current_user
 from backend.common.models.base_document import BaseModel
 from backend.common.models.doc_document import (
@@ -211,7 +212,8 @@ async def bulk_doc_type_update(
     targets: FindMany[DocDocument] = DocDocument.find_many({"_id": {"$in": body.ids}})
     update = body.update
 
-    doc_documents_repo = DocDocumentRepository()
+    logger = Logger(buffered=True)
+    doc_documents_repo = DocDocumentRepository(logger=logger)
 
     counts, errors = {"suc": 0, "err": 0}, []
 
@@ -242,6 +244,7 @@ async def bulk_doc_type_update(
             await gather_tasks(tasks)
             tasks = []
     await gather_tasks(tasks)
+    await logger.flush()
 
     return BulkUpdateResponse(count_success=counts["suc"], count_error=counts["err"], errors=errors)
 
@@ -15,6 +15,7 @@ from backend.common.storage.hash import hash_full_text
 from backend.scrapeworker.common.utils import normalize_string, tokenize_string
 from backend.scrapeworker.doc_type_classifier import guess_doc_type
 from backend.scrapeworker.document_tagging.indication_tagging import IndicationTagger
+from backend.scrapeworker.document_tagging.tag_focusing import FocusConfigProvider
 from backend.scrapeworker.document_tagging.therapy_tagging import TherapyTagger
 from backend.scrapeworker.file_parsers import docx, html, pdf, text, xlsx
 
@@ -23,8 +24,11 @@ class ReTagger:
     def __init__(self):
         self.indication = IndicationTagger()
         self.therapy = TherapyTagger()
+        # site focus configs for the whole run, documents do not query sites again
+        self.focus_config_provider = FocusConfigProvider()
 
     async def retag_docs_on_site(self, site: Site, total: int = 0):
+        self.focus_config_provider.add_site(site)
         async for doc in DocDocument.find({"locations.site_id": site.id}):
             await self.retag_document(doc, site, total)
             total += 1
@@ -49,14 +53,24 @@ class ReTagger:
         tokens = tokenize_string(doc_text)
 
         (therapy_tags, url_therapy_tags, link_therapy_tags) = await self.therapy.tag_document(
-            doc_text, document_type, url, link_text, document=rdoc
+            doc_text,
+            document_type,
+            url,
+            link_text,
+            document=rdoc,
+            focus_config_provider=self.focus_config_provider,
         )
         (
             indication_tags,
             url_indication_tags,
             link_indication_tags,
         ) = await self.indication.tag_document(
-            doc_text, document_type, url, link_text, document=rdoc
+            doc_text,
+            document_type,
+            url,
+            link_text,
+            document=rdoc,
+            focus_config_provider=self.focus_config_provider,
         )
 
         update = {
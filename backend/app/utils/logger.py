@@ -10,13 +10,41 @@ from jsonpatch import JsonPatch, JsonPointer
 from motor.motor_asyncio import AsyncIOMotorClientSession
 from pydantic import BaseModel
 
+from backend.common.core.batch_queue import BatchQueue
 from backend.common.models.change_log import ChangeLog
 from backend.common.models.user import User
 
 
+class ChangeLogWriter(BatchQueue[ChangeLog]):
+    """
+    Writes change logs from a bounded background queue with insert_many,
+    so logs from many requests share a single round trip.
+    """
+
+    def __init__(
+        self, max_batch_size: int = 500, flush_interval: float = 1, max_buffered: int = 10000
+    ) -> None:
+        super().__init__(max_batch_size, flush_interval, max_buffered)
+
+    async def write(self, logs: list[ChangeLog]):
+        for log in logs:
+            await self.put(log)
+
+    async def process_batch(self, batch: list[ChangeLog]):
+        await ChangeLog.insert_many(batch)
+
+
+change_log_writer = ChangeLogWriter()
+
+
 class Logger:
-    def __init__(self, background_tasks: BackgroundTasks | None = None) -> None:
+    def __init__(
+        self, background_tasks: BackgroundTasks | None = None, buffered: bool = False
+    ) -> None:
         self.background_tasks = background_tasks
+        # buffered loggers hold their logs until flush, for bulk edits
+        self.buffered = buffered
+        self.pending: list[ChangeLog] = []
 
     async def log_change(self, user: User, target: Document, action: str, delta):
         collection = target.get_motor_collection().name
@@ -28,14 +56,26 @@ class Logger:
             collection=collection,
             delta=delta,
         )
-        await log.save()
+        if not self.buffered:
+            await log.save()
+            return
+
+        self.pending.append(log)
+        if len(self.pending) >= change_log_writer.max_batch_size:
+            await self.flush()
 
     async def background_log_change(self, user: User, target: Document, action, delta=None):
-        if self.background_tasks:
+        if self.background_tasks and not self.buffered:
             self.background_tasks.add_task(self.log_change, user, target, action, delta)
         else:
             await self.log_change(user, target, action, delta)
 
+    async def flush(self):
+        if not self.pending:
+            return
+        logs, self.pending = self.pending, []
+        await change_log_writer.write(logs)
+
 
 async def get_logger(background_tasks: BackgroundTasks):
     return Logger(background_tasks)
@@ -0,0 +1,37 @@
+from random import random
+
+import pytest_asyncio
+
+from backend.app.utils.logger import Logger, change_log_writer
+from backend.common.db.init import init_db
+from backend.common.models.change_log import ChangeLog
+from backend.common.models.site import Site
+from backend.common.models.user import User
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def before_each_test():
+    random_name = str(random())
+    await init_db(mock=True, database_name=random_name)
+
+
+async def test_buffered_logger_writes_on_flush():
+    user = User(email="example@me.com", full_name="John Doe", hashed_password="example")
+    await user.save()
+    sites = [Site(name=f"site{i}") for i in range(3)]
+    for site in sites:
+        await site.save()
+
+    logger = Logger(buffered=True)
+    for site in sites:
+        await logger.log_change(user, site, "UPDATE", [])
+        await logger.background_log_change(user, site, "CREATE")
+
+    assert await ChangeLog.count() == 0
+
+    await logger.flush()
+    await change_log_writer.close()
+
+    assert logger.pending == []
+    assert await ChangeLog.count() == 6
+    assert await ChangeLog.find({"action": "CREATE"}).count() == 3
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class BatchQueue(ABC, Generic[T]):
+    """
+    Bounded queue drained by a background task, which hands items to `process_batch` in batches.
+    A batch is processed once it is full or `flush_interval` seconds after its first item.
+    The task runs on the loop the queue was first used on and is restarted on a new loop.
+    """
+
+    def __init__(self, max_batch_size: int, flush_interval: float, max_buffered: int) -> None:
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.draining = False
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        if self.task and not self.task.done() and self.loop is loop:
+            return
+
+        self.loop = loop
+        self.draining = False
+        self.queue = asyncio.Queue(maxsize=self.max_buffered)
+        self.task = asyncio.create_task(self.run())
+
+    async def put(self, item: T):
+        self.start()
+        # blocks only when the buffer is full, applying backpressure to the caller
+        await self.queue.put(item)
+
+    async def next_batch(self) -> list[T]:
+        batch = [await self.queue.get()]
+        deadline = self.loop.time() + self.flush_interval
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            if self.draining:
+                break
+
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    @abstractmethod
+    async def process_batch(self, batch: list[T]):
+        ...
+
+    async def run(self):
+        while True:
+            batch = await self.next_batch()
+            try:
+                await self.process_batch(batch)
+            except Exception:
+                logging.error(
+                    f"{type(self).__name__} batch error, dropped {len(batch)} items", exc_info=True
+                )
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def close(self):
+        """
+        Processes everything still buffered and stops the background task.
+        """
+        if not self.task or self.loop is not asyncio.get_running_loop():
+            return
+
+        self.draining = True
+        await self.queue.join()
+        self.task.cancel()
+        self.task = None
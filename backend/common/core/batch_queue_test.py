@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from backend.common.core.batch_queue import BatchQueue
+
+
+class ListQueue(BatchQueue[int]):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.batches: list[list[int]] = []
+
+    async def process_batch(self, batch: list[int]):
+        if 13 in batch:
+            raise ValueError("unlucky")
+        self.batches.append(batch)
+
+
+@pytest.mark.asyncio
+async def test_batch_flushed_after_interval():
+    queue = ListQueue(max_batch_size=100, flush_interval=0.01, max_buffered=100)
+    await queue.put(1)
+    await queue.put(2)
+    await asyncio.sleep(0.05)
+
+    assert queue.batches == [[1, 2]]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_close_drains_and_survives_batch_errors():
+    queue = ListQueue(max_batch_size=3, flush_interval=60, max_buffered=100)
+    for i in range(10, 17):
+        await queue.put(i)
+    await queue.close()
+
+    assert queue.batches == [[10, 11, 12], [16]]
+    assert queue.task is None
@@ -51,6 +51,22 @@ class SearchableType(str, Enum):
     UNIVERSAL = "UNIVERSAL"
 
 
+class PdfParserBackend(str, Enum):
+    Poppler = "POPPLER"
+    MuPdf = "MUPDF"
+
+
+class XlsxParserBackend(str, Enum):
+    Pandas = "PANDAS"
+    Streaming = "STREAMING"
+
+
+class HtmlParserBackend(str, Enum):
+    # BeautifulSoup tree builders
+    Python = "html.parser"
+    Lxml = "lxml"
+
+
 class DocumentType(str, Enum):
     AnnualNoticeOfChanges = "Annual Notice of Changes"
     AuthorizationPolicy = "Authorization Policy"
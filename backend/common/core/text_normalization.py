@@ -0,0 +1,50 @@
+import re
+import string
+import unicodedata
+from typing import Iterable
+
+
+def char_table(chars: Iterable[str], replacement: str = " ") -> dict[int, str]:
+    """`str.translate` table replacing each of chars"""
+    return str.maketrans(dict.fromkeys(chars, replacement))
+
+
+# every ascii char that is not a letter, digit or space becomes a space
+alnum_chars = string.ascii_letters + string.digits + " "
+scrub_table = char_table(chr(code) for code in range(128) if chr(code) not in alnum_chars)
+scrub_lower_table = {**scrub_table, **str.maketrans(string.ascii_uppercase, string.ascii_lowercase)}
+
+
+class RegexReplacer:
+    """
+    Applies a list of (pattern, replacement) substitutions in one scan of the text
+    using a single alternation; at any position the earliest listed pattern wins.
+    Equivalent to applying them one after the other as long as no replacement
+    produces text another pattern matches.
+    """
+
+    def __init__(self, replacements: Iterable[tuple[str, str]], flags: int = 0) -> None:
+        self.replacements: list[str] = []
+        patterns: list[str] = []
+        for index, (pattern, replacement) in enumerate(replacements):
+            patterns.append(f"(?P<r{index}>{pattern})")
+            self.replacements.append(replacement)
+        self.rgx = re.compile("|".join(patterns), flags)
+
+    def replace_match(self, match: re.Match) -> str:
+        return self.replacements[int(match.lastgroup[1:])]  # type: ignore
+
+    def sub(self, text: str) -> str:
+        return self.rgx.sub(self.replace_match, text)
+
+
+def deburr(text: str) -> str:
+    """Remove or replace non ascii chars, ® is removed while ö becomes o"""
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def scrub(text: str, lower: bool = False) -> str:
+    """Keep only letters, digits and single spaces between words of ascii text"""
+    return " ".join(text.translate(scrub_lower_table if lower else scrub_table).split())
@@ -0,0 +1,30 @@
+import re
+
+from backend.common.core.text_normalization import RegexReplacer, char_table, deburr, scrub
+
+
+def test_char_table():
+    table = char_table(["®", "™"])
+    assert "DRUG® and DRUG™".translate(table) == "DRUG  and DRUG "
+
+
+def test_regex_replacer_matches_sequential_subs():
+    replacements = [(r"\btabs?\b", "tablet"), (r"\bcaps?\b", "capsule"), (r"\ber\b", "ER")]
+    replacer = RegexReplacer(replacements, re.IGNORECASE)
+    text = "Drug TABS 10mg, drug cap er, tablets"
+
+    expected = text
+    for pattern, replacement in replacements:
+        expected = re.sub(pattern, replacement, expected, flags=re.IGNORECASE)
+    assert replacer.sub(text) == expected == "Drug tablet 10mg, drug capsule ER, tablets"
+
+
+def test_regex_replacer_first_pattern_wins():
+    replacer = RegexReplacer([(r"\s+\.(?=\d)", "0."), (r"\s+", " ")])
+    assert replacer.sub("take \n .5  mg") == "take0.5 mg"
+
+
+def test_deburr_and_scrub():
+    assert deburr("Köln®") == "Koln"
+    assert scrub("  Some-Drug_Name (10 mg)  ") == "Some Drug Name 10 mg"
+    assert scrub("Some-Drug_Name", lower=True) == "some drug name"
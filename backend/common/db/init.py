@@ -38,6 +38,7 @@ from backend.common.models.site_scrape_task import SiteScrapeTask
 from backend.common.models.tag_comparison import TagComparison
 from backend.common.models.tasks import TaskLog
 from backend.common.models.translation_config import TranslationConfig
+from backend.common.models.url_index import SiteUrlIndex
 from backend.common.models.user import User
 from backend.common.models.work_queue import WorkQueue, WorkQueueLog, WorkQueueMetric
 
@@ -98,6 +99,7 @@ document_models = [
     TaskLog,
     PipelineRegistry,
     TagComparison,
+    SiteUrlIndex,
 ]
 
 
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+
+import typer
+
+from backend.common.core.batch_queue import BatchQueue
+from backend.common.events.send_event_client import SendEventClient
+from backend.common.events.settings import settings
+
+
+class EventPublisher(BatchQueue[dict]):
+    """
+    Buffers events and sends them to EventBridge in batches, off the event loop.
+    A batch is sent once it is full or `flush_interval` seconds after its first event.
+    Only the entries EventBridge reports as failed are retried.
+    """
+
+    def __init__(
+        self,
+        client: SendEventClient | None = None,
+        flush_interval: float = 1,
+        max_attempts: int = 3,
+        retry_wait: float = 1,
+        max_buffered: int = 1000,
+    ) -> None:
+        # PutEvents accepts at most 10 entries per call
+        super().__init__(
+            max_batch_size=10, flush_interval=flush_interval, max_buffered=max_buffered
+        )
+        self.client = client
+        self.max_attempts = max_attempts
+        self.retry_wait = retry_wait
+
+    async def publish(self, detail_type, message_body):
+        if settings.disable_sending_events:
+            typer.secho(
+                "Due to local.env DISABLE_SENDING_EVENTS, event will not be sent.",
+                fg=typer.colors.RED,
+            )
+            return
+
+        if not self.client:
+            self.client = SendEventClient()
+        await self.put(self.client.build_entry(detail_type, message_body))
+
+    async def process_batch(self, entries: list[dict]):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await self.loop.run_in_executor(None, self.client.put_entries, entries)
+            except Exception:
+                logging.error(f"event batch send error attempt={attempt}", exc_info=True)
+            else:
+                failed_count = response.get("FailedEntryCount")
+                logging.info(f"Sent {len(entries)} events, FailedEntryCount={failed_count}")
+                if not failed_count:
+                    return
+                # results are returned in the same order as the request entries
+                entries = [
+                    entry
+                    for entry, result in zip(entries, response["Entries"])
+                    if result.get("ErrorCode")
+                ]
+
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.retry_wait * 2 ** (attempt - 1))
+
+        logging.error(f"Dropping {len(entries)} events after {self.max_attempts} attempts")
+
+
+# shared per process, so events from many documents coalesce into the same batches
+event_publisher = EventPublisher()
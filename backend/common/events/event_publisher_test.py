@@ -0,0 +1,49 @@
+import pytest
+
+from backend.common.events.event_publisher import EventPublisher
+from backend.common.events.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def enable_sending_events(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "disable_sending_events", False)
+
+
+class FakeEventClient:
+    def __init__(self, failures: list[int] | None = None) -> None:
+        self.calls: list[list[dict]] = []
+        self.failures = failures or []
+
+    def build_entry(self, detail_type, message_body):
+        return {"DetailType": detail_type, "Detail": message_body}
+
+    def put_entries(self, entries: list[dict]):
+        self.calls.append(entries)
+        failed = self.failures.pop(0) if self.failures else 0
+        results = [{"ErrorCode": "Throttled"} if i < failed else {} for i in range(len(entries))]
+        return {"FailedEntryCount": failed, "Entries": results}
+
+
+@pytest.mark.asyncio
+async def test_publish_batches_by_size():
+    client = FakeEventClient()
+    publisher = EventPublisher(client=client, flush_interval=60)
+    for i in range(25):
+        await publisher.publish("document-details", str(i))
+    await publisher.close()
+
+    assert [len(call) for call in client.calls] == [10, 10, 5]
+    details = [entry["Detail"] for call in client.calls for entry in call]
+    assert details == [str(i) for i in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_publish_retries_failed_entries_only():
+    client = FakeEventClient(failures=[2])
+    publisher = EventPublisher(client=client, flush_interval=0.01, retry_wait=0)
+    for i in range(4):
+        await publisher.publish("document-details", str(i))
+    await publisher.close()
+
+    assert len(client.calls) == 2
+    assert [entry["Detail"] for entry in client.calls[1]] == ["0", "1"]
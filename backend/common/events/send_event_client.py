@@ -33,15 +33,17 @@ class SendEventClient:
         logging.info(
             f"Will send {detail_type} event with {self.source} source to {self.event_bus_name} event bus"  # noqa
         )
-        response = self.client.put_events(
-            Entries=[
-                {
-                    "Source": self.source,
-                    "DetailType": detail_type,
-                    "Detail": message_body,
-                    "EventBusName": self.event_bus_name,
-                }
-            ]
-        )
+        response = self.put_entries([self.build_entry(detail_type, message_body)])
         logging.info(f"Event Send Response: {response}")
         return response
+
+    def build_entry(self, detail_type, message_body):
+        return {
+            "Source": self.source,
+            "DetailType": detail_type,
+            "Detail": message_body,
+            "EventBusName": self.event_bus_name,
+        }
+
+    def put_entries(self, entries: list[dict]):
+        return self.client.put_events(Entries=entries)
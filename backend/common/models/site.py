@@ -6,10 +6,13 @@ from pydantic import Field, HttpUrl
 from backend.common.core.enums import (
     CmsDocType,
     CollectionMethod,
+    HtmlParserBackend,
+    PdfParserBackend,
     ScrapeMethod,
     SearchableType,
     SectionType,
     SiteStatus,
+    XlsxParserBackend,
 )
 from backend.common.models.base_document import BaseDocument, BaseModel
 from backend.common.models.pipeline import SitePipelineStages
@@ -52,6 +55,14 @@ class ScrapeMethodConfiguration(BaseModel):
     allow_docdoc_updates: bool = False
     cms_doc_types: list[CmsDocType] = []
     prompt_button_selector: str | None = None
+    # poppler subprocesses or in-process PyMuPDF, which falls back to poppler on errors.
+    # The text of the two differs in line breaks and spacing, so switching a site changes the
+    # text and content checksums of its documents, which are then seen as changed.
+    pdf_parser: PdfParserBackend = PdfParserBackend.Poppler
+    # pandas tables, or rows streamed in one read-only pass with a size cap. The text of the
+    # two differs, switching a site changes the text checksums of its spreadsheets.
+    xlsx_parser: XlsxParserBackend = XlsxParserBackend.Pandas
+    html_parser: HtmlParserBackend = HtmlParserBackend.Python
     debug: bool = False
 
     # Follow Links
@@ -64,6 +75,8 @@ class ScrapeMethodConfiguration(BaseModel):
     # Searchables
     searchable: bool = False
     search_prefix_length: int | None = None
+    # pages searching codes at the same time
+    searchable_concurrency: int = 1
     searchable_playbook: str | None = None
     searchable_type: list[SearchableType] = []
     searchable_input: AttrSelector | None = None
@@ -58,6 +58,8 @@ class SiteScrapeTask(BaseDocument):
     work_list: list[ManualWorkItem] | None = []
     batch_status: BatchStatus | None = BatchStatus()
     attempt_count: int = 0
+    # searchable codes already searched, so a requeued task can resume
+    searched_codes: list[str] = []
 
 
 class UpdateSiteScrapeTask(BaseModel):
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import pymongo
+from beanie import PydanticObjectId
+from pymongo import IndexModel
+
+from backend.common.models.base_document import BaseDocument
+
+
+class SiteUrlIndex(BaseDocument):
+    """Last known state of a url collected for a site, kept across scrape tasks"""
+
+    site_id: PydanticObjectId
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    checksum: str | None = None
+    retrieved_document_id: PydanticObjectId | None = None
+    last_checked: datetime | None = None
+
+    class Settings:
+        indexes = [
+            IndexModel([("site_id", pymongo.ASCENDING), ("url", pymongo.ASCENDING)], unique=True)
+        ]
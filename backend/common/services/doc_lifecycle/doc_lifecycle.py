@@ -7,7 +7,7 @@ from beanie import PydanticObjectId
 from backend.app.core.settings import settings
 from backend.common.core.enums import ApprovalStatus, TaskStatus
 from backend.common.events.event_convert import EventConvert
-from backend.common.events.send_event_client import SendEventClient
+from backend.common.events.event_publisher import event_publisher
 from backend.common.models.content_extraction_task import ContentExtractionTask
 from backend.common.models.doc_document import DocDocument
 from backend.common.models.document_family import DocumentFamily
@@ -210,8 +210,7 @@ class DocLifecycleService:
                 edit = True
             if not settings.is_local:
                 document_json = await EventConvert().convert(doc)
-                send_event_client = SendEventClient()
-                send_event_client.send_event("document-details", document_json)
+                await event_publisher.publish("document-details", document_json)
         else:
             if doc.status != ApprovalStatus.PENDING:
                 doc.status = ApprovalStatus.PENDING
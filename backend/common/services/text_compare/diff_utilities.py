@@ -1,11 +1,12 @@
 import re
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
 
 from diff_match_patch import diff_match_patch
 
-from backend.scrapeworker.common.date_parser import DateParser
-from backend.scrapeworker.common.utils import date_rgxs, digit_rgx, label_rgxs
+from backend.scrapeworker.common.date_parser import date_detector
+from backend.scrapeworker.common.utils import digit_rgx, label_rgxs
 
 
 @dataclass
@@ -107,6 +108,7 @@ class Dmp(diff_match_patch):
     """
 
     SPECIAL_CHARS = re.compile(r"[^\w%<>= ]")  # any non-word char, except %<>=
+    WORD_END = re.compile(r"[\s\n\f]")
 
     def __init__(self, exclude_digits: bool = False, *args, **kwargs):
         super(Dmp, self).__init__(*args, **kwargs)
@@ -120,14 +122,17 @@ class Dmp(diff_match_patch):
         return self.remove_diffs(deletes, inserts, a_text, b_text)
 
     def _has_remove_text(self, text: str) -> bool:
-        strp_text = text.strip()
-        date_parser = DateParser(date_rgxs, label_rgxs)
-        dates = date_parser.get_dates(strp_text)
-        match = next(dates, None)
-        if not match and self.exclude_digits:
+        return self.is_remove_text(text.strip(), self.exclude_digits)
+
+    @staticmethod
+    @lru_cache(100_000)
+    def is_remove_text(strp_text: str, exclude_digits: bool) -> bool:
+        """Whether a word is a date, digits, special chars or a date label, words repeat a lot"""
+        match = date_detector.has_date(strp_text)
+        if not match and exclude_digits:
             match = re.match(digit_rgx, strp_text)
         if not match:
-            match = re.fullmatch(self.SPECIAL_CHARS, strp_text)
+            match = re.fullmatch(Dmp.SPECIAL_CHARS, strp_text)
         if not match:
             for rgx in label_rgxs[0]:
                 match = re.match(rgx, strp_text)
@@ -321,20 +326,28 @@ class Dmp(diff_match_patch):
                     normalized_text = no_special_chars
             return normalized_text
 
+        # words repeat a lot, normalize each once. None for whitespace only words
+        word_keys: dict[str, str | None] = {}
+
+        def word_key(word: str) -> str | None:
+            if word not in word_keys:
+                normalized_word = normalize_text(word)
+                word_keys[word] = None if re.fullmatch(r"\s*", normalized_word) else normalized_word
+            return word_keys[word]
+
         def diff_wordsToCharsMunge(text: str):
             chars = []
             wordStart = 0
             wordEnd = -1
             while wordEnd < len(text) - 1:
-                word_match = re.search(r"[\s\n\f]", text[wordStart:])
+                word_match = self.WORD_END.search(text, wordStart)
                 if word_match:
-                    wordEnd = word_match.start() + wordStart
+                    wordEnd = word_match.start()
                 else:
                     wordEnd = len(text) - 1
-                word = text[wordStart : wordEnd + 1]  # noqa
-                word = normalize_text(word)
+                word = word_key(text[wordStart : wordEnd + 1])  # noqa
                 # if word is only white space, skip
-                if re.fullmatch(r"\s*", word):
+                if word is None:
                     pass
                 elif word in wordHash:
                     chars.append(chr(wordHash[word]))
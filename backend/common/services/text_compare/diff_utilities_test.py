@@ -17,6 +17,27 @@ def test_clean_line():
     ]
 
 
+def test_remove_text_cache():
+    Dmp.is_remove_text.cache_clear()
+    line = "Updated 12/1/2022 and Updated 12/1/2022 again"
+    Dmp()._clean_line(line, 0, 0)
+    clean_line, words_removed = Dmp()._clean_line(line, 1, 0)
+    blank = " " * len("Updated 12/1/2022")
+    assert clean_line == f"{blank} and {blank} again"
+    assert len(words_removed) == 4
+    assert Dmp.is_remove_text.cache_info().misses == 4
+    # digits are only removed when excluded, cached separately
+    assert not Dmp()._has_remove_text("12")
+    assert Dmp(exclude_digits=True)._has_remove_text("12")
+
+
+def test_words_to_chars_normalizes_repeated_words():
+    chars1, chars2, words = Dmp().diff_wordsToChars("Drug drug\n\fDRUG  ", "drug, other")
+    assert words == ["", "drug ", "drug, ", "other"]
+    assert chars1 == "\x01\x01\x01"
+    assert chars2 == "\x02\x03"
+
+
 class TestPreProcessText:
     def test_preprocess_text_delta(self):
         a_line = "Testing remove words: Updated 12/1/2022\fMore words 12/2/20"
@@ -1,8 +1,7 @@
-import asyncio
-
 from backend.common.storage.hash import hash_full_text
 from backend.common.storage.s3_client import AsyncS3Client
 from backend.common.storage.settings import settings
+from backend.common.storage.text_diff import create_unified_diff
 
 
 class AsyncTextHandler:
@@ -51,18 +50,8 @@ class AsyncTextHandler:
 
         a_path = f"{a_name}.txt"
         b_path = f"{b_name}.txt"
-        async with self.text_client.read_object_to_tempfile(
-            a_path
-        ) as a_file, self.text_client.read_object_to_tempfile(b_path) as b_file:
-            process = await asyncio.create_subprocess_exec(
-                "git",
-                "diff",
-                "-U1",
-                a_file,
-                b_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,
-            )
-            diff_out, _ = await process.communicate()
-            diff_name = await self.save_diff(diff_out, a_name, b_name)
-            return diff_name, diff_out
+        a_text = await self.text_client.read_object(a_path)
+        b_text = await self.text_client.read_object(b_path)
+        diff_out = await create_unified_diff(a_text, b_text, a_path, b_path)
+        diff_name = await self.save_diff(diff_out, a_name, b_name)
+        return diff_name, diff_out
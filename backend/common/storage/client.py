@@ -128,3 +128,7 @@ class TextStorageClient(BaseS3Client):
 
 class DiffStorageClient(BaseS3Client):
     root_path = settings.diff_path
+
+
+class TagCacheStorageClient(BaseS3Client):
+    root_path = settings.tag_cache_path
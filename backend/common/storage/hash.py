@@ -1,5 +1,4 @@
 import hashlib
-import re
 
 import aiofiles
 import aiofiles.os
@@ -23,6 +22,21 @@ class DocStreamHasher:
         return self.hasher.hexdigest()
 
 
+class TextStreamHasher(DocStreamHasher):
+    """Builds an md5 hash from text with all whitespace removed, one chunk at a time"""
+
+    # characters per chunk, bounds the extra memory used while hashing
+    chunk_size = 1 << 20
+
+    def update_text(self, text: str):
+        for start in range(0, len(text), self.chunk_size):
+            # split() drops the same characters as re's \s, and dropping
+            # (rather than collapsing) whitespace is safe across chunk boundaries
+            chunk = text[start : start + self.chunk_size]  # noqa: E203
+            self.update("".join(chunk.split()).encode())
+        return self
+
+
 def get_document_hash(extractor: TextExtractor) -> str:
     """Determine how to hash document based on mimetype."""
     mimetype = extractor.mimetype
@@ -40,9 +54,7 @@ def hash_bytes(document_bytes: bytes) -> str:
 
 def hash_full_text(text: str) -> str:
     """Generate a hash from a fulltext string."""
-    stripped_text = re.sub(r"\s+", "", text)
-    stripped_bytes = stripped_text.encode()
-    return hash_bytes(document_bytes=stripped_bytes)
+    return TextStreamHasher().update_text(text).hexdigest()
 
 
 async def get_raw_bytes(filename: str):
@@ -51,10 +63,7 @@ async def get_raw_bytes(filename: str):
 
 
 async def hash_content(text: str, files: list[str] = []) -> str:
-    stripped_text = re.sub(r"\s+", "", text)
-    stripped_bytes = stripped_text.encode()
-
-    hasher: DocStreamHasher = DocStreamHasher(stripped_bytes)
+    hasher = TextStreamHasher().update_text(text)
     for file in files:
         image_bytes = await get_raw_bytes(file)
         hasher.update(image_bytes)
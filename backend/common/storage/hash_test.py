@@ -1,9 +1,10 @@
 import os
+import re
 import pytest
 import aiofiles
 from asyncio import gather
 from backend.scrapeworker.file_parsers import docx
-from backend.common.storage.hash import hash_full_text, hash_bytes
+from backend.common.storage.hash import TextStreamHasher, hash_full_text, hash_bytes
 
 current_path = os.path.dirname(os.path.realpath(__file__))
 fixture_path = os.path.join(current_path, "__fixtures__")
@@ -58,3 +59,14 @@ async def test_hash_full_text_same_text():
 
     # the real purpose, all content hashes match
     assert content_hash_a == content_hash_b == content_hash_c
+
+
+def test_hash_full_text_chunked_matches_regex_strip(monkeypatch: pytest.MonkeyPatch):
+    text = "Effective  Date:\t01/01/2022\n\u00a0Policy\u2003Number \r\n" * 50
+    expected = hash_bytes(re.sub(r"\s+", "", text).encode())
+
+    assert hash_full_text(text) == expected
+
+    # whitespace runs and words straddle chunk boundaries
+    monkeypatch.setattr(TextStreamHasher, "chunk_size", 7)
+    assert hash_full_text(text) == expected
@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     model_path: str = config["S3_MODEL_PATH"]
     text_path: str = config["S3_TEXT_PATH"]
     diff_path: str = config["S3_DIFF_PATH"]
+    tag_cache_path: str = config["S3_TAG_CACHE_PATH"]
     endpoint_url: str = config["S3_ENDPOINT_URL"]
     document_bucket: str = config["S3_DOCUMENT_BUCKET"]
     pass
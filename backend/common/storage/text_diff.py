@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+
+# diffs are cpu bound, keep them off the event loop without spawning processes
+diff_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="text-diff")
+
+# edit distance at which myers gives up and we fall back to difflib's matcher
+MAX_EDIT_COST = 2000
+
+# git's hunk header function context is at most 80 bytes
+FUNC_LINE_SIZE = 80
+
+
+def _split_records(data: bytes) -> list[bytes]:
+    """Split into lines the way git does, keeping the newline on each record."""
+    lines = data.split(b"\n")
+    records = [line + b"\n" for line in lines[:-1]]
+    if lines[-1]:
+        records.append(lines[-1])
+    return records
+
+
+def _blob_id(data: bytes) -> str:
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()[:7]
+
+
+def _myers(a: list[int], b: list[int], max_cost: int) -> list[tuple[str, int]] | None:
+    """
+    Greedy forward myers over the (already trimmed) sequences.
+    Returns edits as ("-", index in a) / ("+", index in b), or None if the edit
+    distance exceeds max_cost.
+    """
+    n, m = len(a), len(b)
+    offset = max_cost + 1
+    v = [0] * (2 * offset + 1)
+    trace: list[list[int]] = []
+
+    for d in range(max_cost + 1):
+        # only diagonals -d-1..d+1 are read while backtracking from this step
+        trace.append(v[offset - d - 1 : offset + d + 2])  # noqa: E203
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: list[list[int]], n: int, m: int) -> list[tuple[str, int]]:
+    edits: list[tuple[str, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        if prev_k == k + 1:
+            edits.append(("+", prev_y))
+        else:
+            edits.append(("-", prev_x))
+        x, y = prev_x, prev_y
+    return edits
+
+
+def _mark_changes(a: list[bytes], b: list[bytes], max_cost: int) -> tuple[list[bool], list[bool]]:
+    """Flag every line of a and b that is not part of the common subsequence."""
+    changed_a = [False] * len(a)
+    changed_b = [False] * len(b)
+
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    ids: dict[bytes, int] = {}
+    trimmed_a = [ids.setdefault(line, len(ids)) for line in a[start:end_a]]
+    trimmed_b = [ids.setdefault(line, len(ids)) for line in b[start:end_b]]
+
+    edits = _myers(trimmed_a, trimmed_b, max_cost)
+    if edits is not None:
+        for op, index in edits:
+            if op == "-":
+                changed_a[start + index] = True
+            else:
+                changed_b[start + index] = True
+        return changed_a, changed_b
+
+    matcher = SequenceMatcher(None, trimmed_a, trimmed_b)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            changed_a[start + i1 : start + i2] = [True] * (i2 - i1)  # noqa: E203
+            changed_b[start + j1 : start + j2] = [True] * (j2 - j1)  # noqa: E203
+    return changed_a, changed_b
+
+
+def _build_changes(changed_a: list[bool], changed_b: list[bool]) -> list[tuple[int, int, int, int]]:
+    """Collapse line flags into (a_start, b_start, a_count, b_count) change records."""
+    changes = []
+    i, j = 0, 0
+    len_a, len_b = len(changed_a), len(changed_b)
+    while i < len_a or j < len_b:
+        if i < len_a and j < len_b and not changed_a[i] and not changed_b[j]:
+            i += 1
+            j += 1
+            continue
+        i1, j1 = i, j
+        while i < len_a and changed_a[i]:
+            i += 1
+        while j < len_b and changed_b[j]:
+            j += 1
+        changes.append((i1, j1, i - i1, j - j1))
+    return changes
+
+
+def _func_line(record: bytes) -> bytes | None:
+    """git's default funcname rule: lines starting with a letter, '_' or '$'."""
+    if not record or not (record[:1].isalpha() or record[:1] in (b"_", b"$")):
+        return None
+    return record[:FUNC_LINE_SIZE].rstrip(b" \t\n\v\f\r")
+
+
+def _emit_record(out: list[bytes], prefix: bytes, record: bytes):
+    out.append(prefix + record)
+    if not record.endswith(b"\n"):
+        out.append(b"\n\\ No newline at end of file\n")
+
+
+def _range(start: int, count: int) -> str:
+    if count == 1:
+        return str(start + 1)
+    return f"{start if count == 0 else start + 1},{count}"
+
+
+def unified_diff(
+    a: bytes,
+    b: bytes,
+    a_name: str = "a",
+    b_name: str = "b",
+    context: int = 1,
+    max_cost: int = MAX_EDIT_COST,
+) -> bytes:
+    """
+    Unified diff matching the output of `git diff -U{context} a_name b_name`,
+    including hunk header function context and missing newline markers.
+    Identical inputs produce an empty diff.
+    """
+    if a == b:
+        return b""
+
+    a_records, b_records = _split_records(a), _split_records(b)
+    changed_a, changed_b = _mark_changes(a_records, b_records, max_cost)
+    changes = _build_changes(changed_a, changed_b)
+
+    out = [
+        f"diff --git a/{a_name} b/{b_name}\n".encode(),
+        f"index {_blob_id(a)}..{_blob_id(b)} 100644\n".encode(),
+        f"--- a/{a_name}\n".encode(),
+        f"+++ b/{b_name}\n".encode(),
+    ]
+
+    func: bytes | None = None
+    func_search_limit = -1
+    index = 0
+    while index < len(changes):
+        # merge changes whose gap fits in the shared context
+        last = index
+        while last + 1 < len(changes):
+            prev_i1, _, prev_chg1, _ = changes[last]
+            if changes[last + 1][0] - (prev_i1 + prev_chg1) > 2 * context:
+                break
+            last += 1
+
+        first_i1, first_i2, _, _ = changes[index]
+        last_i1, last_i2, last_chg1, last_chg2 = changes[last]
+        s1 = max(first_i1 - context, 0)
+        s2 = max(first_i2 - context, 0)
+        e1 = min(last_i1 + last_chg1 + context, len(a_records))
+        e2 = min(last_i2 + last_chg2 + context, len(b_records))
+
+        for line in range(s1 - 1, func_search_limit, -1):
+            if (found := _func_line(a_records[line])) is not None:
+                func = found
+                break
+        func_search_limit = s1 - 1
+
+        header = f"@@ -{_range(s1, e1 - s1)} +{_range(s2, e2 - s2)} @@".encode()
+        out.append(header + (b" " + func if func else b"") + b"\n")
+
+        line = s1
+        for i1, i2, chg1, chg2 in changes[index : last + 1]:  # noqa: E203
+            for record in a_records[line:i1]:
+                _emit_record(out, b" ", record)
+            for record in a_records[i1 : i1 + chg1]:  # noqa: E203
+                _emit_record(out, b"-", record)
+            for record in b_records[i2 : i2 + chg2]:  # noqa: E203
+                _emit_record(out, b"+", record)
+            line = i1 + chg1
+        for record in a_records[line:e1]:
+            _emit_record(out, b" ", record)
+
+        index = last + 1
+
+    return b"".join(out)
+
+
+async def create_unified_diff(a: bytes, b: bytes, a_name: str = "a", b_name: str = "b") -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(diff_executor, unified_diff, a, b, a_name, b_name)
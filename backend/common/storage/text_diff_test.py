@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from backend.common.storage.text_diff import create_unified_diff, unified_diff
+
+current_path = os.path.dirname(os.path.realpath(__file__))
+fixture_path = os.path.join(current_path, "__fixtures__")
+
+
+def _read_fixture_file(file_name: str) -> bytes:
+    with open(os.path.join(fixture_path, file_name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.asyncio
+async def test_matches_git_diff_output():
+    a = _read_fixture_file("diff_test_a.txt")
+    b = _read_fixture_file("diff_test_b.txt")
+    # generated with `git diff --no-index -U1 diff_test_a.txt diff_test_b.txt`
+    expected = _read_fixture_file("diff_test_a-diff_test_b.diff")
+
+    diff = await create_unified_diff(a, b, "diff_test_a.txt", "diff_test_b.txt")
+
+    assert diff == expected
+
+
+def test_no_diff():
+    a = _read_fixture_file("diff_test_a.txt")
+    assert unified_diff(a, a) == b""
+
+
+def test_hunk_ranges():
+    a = b"one\ntwo\nthree\n"
+
+    diff = unified_diff(a, b"one\nthree\n").decode()
+    assert "@@ -1,3 +1,2 @@\n one\n-two\n three\n" in diff
+
+    diff = unified_diff(b"", a).decode()
+    assert "@@ -0,0 +1,3 @@\n+one\n+two\n+three\n" in diff
+
+
+def test_fallback_over_max_cost():
+    a = b"".join(f"a{i}\n".encode() for i in range(50))
+    b = b"".join(f"b{i}\n".encode() for i in range(50))
+
+    diff = unified_diff(a, b, max_cost=10).decode()
+
+    assert diff.count("\n-a") == 50
+    assert diff.count("\n+b") == 50
@@ -1,7 +1,6 @@
-import asyncio
-
 from backend.common.storage.client import DiffStorageClient, TextStorageClient
 from backend.common.storage.hash import hash_full_text
+from backend.common.storage.text_diff import create_unified_diff
 
 
 class TextHandler:
@@ -33,18 +32,8 @@ class TextHandler:
 
         a_path = f"{a_name}.txt"
         b_path = f"{b_name}.txt"
-        with self.text_client.read_object_to_tempfile(
-            a_path
-        ) as a_file, self.text_client.read_object_to_tempfile(b_path) as b_file:
-            process = await asyncio.create_subprocess_exec(
-                "git",
-                "diff",
-                "-U1",
-                a_file,
-                b_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,
-            )
-            diff_out, _ = await process.communicate()
-            diff_name = self.save_diff(diff_out, a_name, b_name)
-            return diff_name, diff_out
+        a_text = self.text_client.read_object(a_path)
+        b_text = self.text_client.read_object(b_path)
+        diff_out = await create_unified_diff(a_text, b_text, a_path, b_path)
+        diff_name = self.save_diff(diff_out, a_name, b_name)
+        return diff_name, diff_out
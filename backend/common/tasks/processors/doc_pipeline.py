@@ -6,6 +6,7 @@ from backend.common.models.pipeline import DocPipelineStages, PipelineRegistry
 from backend.common.models.tasks import TaskLog
 from backend.common.tasks.processors import task_processor_factory
 from backend.common.tasks.task_processor import TaskProcessor
+from backend.scrapeworker.document_tagging.tag_focusing import FocusConfigProvider
 
 
 class DocPipelineTaskProcessor(TaskProcessor):
@@ -23,6 +24,7 @@ class DocPipelineTaskProcessor(TaskProcessor):
         task: tasks.DocPipelineTask,
         stage_versions: PipelineRegistry | None = None,
         doc: DocDocument | None = None,
+        focus_config_provider: FocusConfigProvider | None = None,
     ):
         if not stage_versions:
             stage_versions = await PipelineRegistry.fetch()
@@ -69,7 +71,12 @@ class DocPipelineTaskProcessor(TaskProcessor):
                 group_id="",
             )
             task_processor: TaskProcessor = task_processor_factory(task)
-            result = await task_processor.exec(task.payload)
+            if isinstance(task_payload, tasks.TagTask):
+                result = await task_processor.exec(
+                    task.payload, focus_config_provider=focus_config_provider
+                )
+            else:
+                result = await task_processor.exec(task.payload)
             results.append(result)
 
         self.logger.debug(f"pipeline processed for doc_id={doc.id}")
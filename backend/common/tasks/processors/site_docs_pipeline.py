@@ -7,6 +7,7 @@ from backend.common.models.site import Site
 from backend.common.models.tasks import TaskLog
 from backend.common.tasks.processors.doc_pipeline import DocPipelineTaskProcessor
 from backend.common.tasks.task_processor import TaskProcessor
+from backend.scrapeworker.document_tagging.tag_focusing import FocusConfigProvider
 
 
 class SiteDocsPipelineTaskProcessor(TaskProcessor):
@@ -22,6 +23,8 @@ class SiteDocsPipelineTaskProcessor(TaskProcessor):
     async def exec(self, task_payload: tasks.SiteDocsPipelineTask):
         stage_versions = await PipelineRegistry.fetch()
         site = await Site.get(task_payload.site_id)
+        # shared by every doc, sites are only queried once for the whole site
+        focus_config_provider = FocusConfigProvider([site])
 
         results = []
         async for doc_doc in DocDocument.find({"locations.site_id": site.id}):
@@ -39,6 +42,7 @@ class SiteDocsPipelineTaskProcessor(TaskProcessor):
                 task.payload,
                 stage_versions=stage_versions,
                 doc=doc_doc,
+                focus_config_provider=focus_config_provider,
             )
             results.append({"doc_doc_id": doc_doc.id, "result": result})
 
@@ -11,6 +11,7 @@ from backend.common.storage.client import TextStorageClient
 from backend.common.tasks.task_processor import TaskProcessor
 from backend.scrapeworker.common.utils import normalize_string, tokenize_string
 from backend.scrapeworker.document_tagging.indication_tagging import IndicationTagger
+from backend.scrapeworker.document_tagging.tag_focusing import FocusConfigProvider
 from backend.scrapeworker.document_tagging.taggers import Taggers, indication_tagger, therapy_tagger
 from backend.scrapeworker.document_tagging.therapy_tagging import TherapyTagger
 
@@ -37,7 +38,11 @@ class TagTaskProcessor(TaskProcessor):
         self.indication_tagger = indication_tagger or taggers.indication
         self.therapy_tagger = therapy_tagger or taggers.therapy
 
-    async def exec(self, task: tasks.TagTask):
+    async def exec(
+        self,
+        task: tasks.TagTask,
+        focus_config_provider: FocusConfigProvider | None = None,
+    ):
         stage_versions = await PipelineRegistry.fetch()
         if not stage_versions:
             raise Exception("Pipeline Registry not found")
@@ -71,17 +76,31 @@ class TagTaskProcessor(TaskProcessor):
         if not doc_type:
             raise Exception(f"No Document Type set for {doc.id}")
 
+        # scoped to the task unless given one for a batch, site focus configs are fetched once
+        focus_config_provider = focus_config_provider or FocusConfigProvider()
         (
             therapy_tags,
             url_therapy_tags,
             link_therapy_tags,
-        ) = await self.therapy_tagger.tag_document(raw_text, doc_type, url, link_text, document=doc)
+        ) = await self.therapy_tagger.tag_document(
+            raw_text,
+            doc_type,
+            url,
+            link_text,
+            document=doc,
+            focus_config_provider=focus_config_provider,
+        )
         (
             indication_tags,
             url_indication_tags,
             link_indication_tags,
         ) = await self.indication_tagger.tag_document(
-            raw_text, doc_type, url, link_text, document=doc
+            raw_text,
+            doc_type,
+            url,
+            link_text,
+            document=doc,
+            focus_config_provider=focus_config_provider,
         )
 
         current_stage = PipelineStage(
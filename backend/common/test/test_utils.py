@@ -19,6 +19,10 @@ def mock_s3_client(monkeypatch: pytest.MonkeyPatch):
         assert type(object) == bytes
         return None
 
+    def read_object(self, relative_key: str) -> bytes:
+        with open(relative_key, "rb") as f:
+            return f.read()
+
     @contextmanager
     def read_object_to_tempfile(self, relative_key: str):
         with tempfile.NamedTemporaryFile() as temp:
@@ -33,5 +37,6 @@ def mock_s3_client(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.delattr(BaseS3Client, "__init__")
     monkeypatch.setattr(BaseS3Client, "write_object_mem", write_object_mem)
     monkeypatch.setattr(BaseS3Client, "write_object", write_object)
+    monkeypatch.setattr(BaseS3Client, "read_object", read_object)
     monkeypatch.setattr(BaseS3Client, "read_object_to_tempfile", read_object_to_tempfile)
     monkeypatch.setattr(BaseS3Client, "object_exists", object_exists)
@@ -6,6 +6,7 @@ newrelic.agent.initialize(Path(__file__).parent / "newrelic.ini")
 
 import asyncio
 import logging
+import signal
 import sys
 import traceback
 from datetime import datetime, timezone
@@ -19,6 +20,7 @@ from pymongo import ReturnDocument
 sys.path.append(str(Path(__file__).parent.joinpath("../..").resolve()))
 from backend.common.core.enums import TaskStatus
 from backend.common.db.init import init_db
+from backend.common.events.event_publisher import event_publisher
 from backend.common.models.content_extraction_task import ContentExtractionTask
 from backend.common.models.doc_document import DocDocument
 from backend.common.models.translation_config import TranslationConfig
@@ -29,6 +31,13 @@ from backend.parseworker.extractor import TableContentExtractor
 app = typer.Typer()
 
 
+def shutdown(signum, frame):
+    raise SystemExit
+
+
+signal.signal(signal.SIGTERM, shutdown)
+
+
 async def start_worker_async():
     await init_db()
     worker_id = uuid4()
@@ -105,10 +114,18 @@ async def start_worker_async():
         await asyncio.sleep(5)
 
 
+async def run_worker_async():
+    try:
+        await start_worker_async()
+    finally:
+        # events of the last documents may still be buffered
+        await event_publisher.close()
+
+
 @app.command()
 def start_worker():
     typer.secho("Starting Parse Worker", fg=typer.colors.GREEN)
-    asyncio.run(start_worker_async())
+    asyncio.run(run_worker_async())
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from scispacy.candidate_generation import (
 )
 from scispacy.linking_utils import KnowledgeBase
 
+from backend.common.core.text_normalization import RegexReplacer
 from backend.common.models.app_config import AppConfig
 from backend.common.models.translation_config import TranslationRule
 from backend.common.storage.client import ModelStorageClient
@@ -107,7 +108,9 @@ class RxNormEntityLinkerModel:
         (r"\bactuat\b", "actuation"),
         (r"\bpow\b", "powder"),
     ]
-    form_abbr = [(re.compile(rgx, re.IGNORECASE), st) for rgx, st in form_abbr]
+    form_abbr_replacer = RegexReplacer(form_abbr, re.IGNORECASE)
+    # whitespace runs become one space, " .5" becomes "0.5"
+    spacing_replacer = RegexReplacer([(r"\s+\.(?=\d)", "0."), (r"\s+", " ")])
 
     form_abbr_caps = [
         "MISC",
@@ -220,8 +223,7 @@ class RxNormEntityLinkerModel:
         for text in texts:
             if text is None:
                 text = ""
-            text = re.sub(r"\s+", " ", text)
-            text = re.sub(r" \.(\d)", r"0.\1", text)
+            text = self.spacing_replacer.sub(text)
 
             split_texts = [text]
             if rule.separator2:
@@ -236,8 +238,7 @@ class RxNormEntityLinkerModel:
                 split_texts = [f"{name.strip()} {fands.strip()}" for fands in form_and_strengths]
 
             for text in split_texts:
-                for rgx, st in self.form_abbr:
-                    text = re.sub(rgx, st, text)
+                text = self.form_abbr_replacer.sub(text)
                 if rule.separator:
                     splits = re.split(f"[{rule.separator}]", text)
                     name, strengths = splits[0], splits[1:]
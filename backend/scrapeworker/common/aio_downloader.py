@@ -1,7 +1,9 @@
 import os
 import ssl
+import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from http import HTTPStatus
 from http.cookies import CookieError, Morsel
 from random import shuffle
 from ssl import SSLContext
@@ -9,9 +11,18 @@ from typing import AsyncGenerator, Coroutine
 
 import aiofiles
 from aiofiles.threadpool.binary import AsyncBufferedReader
-from aiohttp import BasicAuth, ClientHttpProxyError, ClientResponse, ClientSession, TCPConnector
+from aiohttp import (
+    BasicAuth,
+    ClientHttpProxyError,
+    ClientProxyConnectionError,
+    ClientResponse,
+    ClientSession,
+    CookieJar,
+    TCPConnector,
+)
 from playwright.async_api import ProxySettings
 from tenacity._asyncio import AsyncRetrying
+from tenacity.retry import retry_if_not_exception_type
 from tenacity.stop import stop_after_attempt
 from tenacity.wait import wait_random
 
@@ -19,9 +30,18 @@ from backend.common.core.config import config
 from backend.common.models.link_task_log import InvalidResponse, ValidResponse
 from backend.common.models.proxy import Proxy
 from backend.common.storage.client import DocumentStorageClient
-from backend.common.storage.hash import DocStreamHasher
+from backend.common.storage.hash import DocStreamHasher, TextStreamHasher
 from backend.common.storage.s3_client import AsyncS3Client
+from backend.scrapeworker.common.exceptions import (
+    DownloadRejectedException,
+    ProxiesUnavailableException,
+)
 from backend.scrapeworker.common.models import DownloadContext
+from backend.scrapeworker.common.utils import (
+    get_mimetype_from_buffer,
+    unsupported_mimetype_prefixes,
+    unsupported_mimetypes,
+)
 
 default_headers: dict[str, str] = {
     "Accept-Language": "en-US,en;q=0.9",
@@ -29,6 +49,12 @@ default_headers: dict[str, str] = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.88 Safari/537.36",  # noqa
 }
 
+# bodies larger than this are not documents we can parse
+max_download_size = 256 * 1024 * 1024
+# text types are parsed by decoding every byte as latin-1, see TextParser
+text_mimetypes = ["text/plain", "text/csv"]
+text_encoding = "iso-8859-1"
+
 
 @dataclass
 class AioProxy:
@@ -36,16 +62,77 @@ class AioProxy:
     proxy_auth: BasicAuth | None
 
 
-class AioDownloader:
+@dataclass
+class ProxyCircuit:
+    failures: int = 0
+    opened_at: float | None = None
+
+
+class ProxyCircuitBreaker:
+    """
+    Stops routing requests through a proxy after `failure_threshold` consecutive proxy errors.
+    Once `reset_timeout` seconds pass, requests are let through again;
+    a success closes the circuit, another failure keeps it open.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.circuits: dict[str, ProxyCircuit] = {}
+
+    def is_available(self, proxy_url: str) -> bool:
+        circuit = self.circuits.get(proxy_url)
+        if not circuit or circuit.opened_at is None:
+            return True
+        return time.monotonic() - circuit.opened_at >= self.reset_timeout
+
+    def record_success(self, proxy_url: str):
+        self.circuits.pop(proxy_url, None)
 
-    session: ClientSession
+    def record_failure(self, proxy_url: str):
+        circuit = self.circuits.setdefault(proxy_url, ProxyCircuit())
+        circuit.failures += 1
+        if circuit.failures >= self.failure_threshold:
+            circuit.opened_at = time.monotonic()
+
+
+class AioDownloader:
+    # connections are pooled per host and proxy, and kept alive between downloads
+    connection_limit = 100
+    connections_per_host = 20
+    keepalive_timeout = 30
+    dns_cache_ttl = 300
+    # bytes buffered to sniff the file type before anything is written
+    sniff_size = 8192
 
     def __init__(self, doc_client: DocumentStorageClient | AsyncS3Client, log, scrape_temp_path):
         self.doc_client = doc_client
         self.log = log
-        self.session = ClientSession(connector=TCPConnector(ssl=self.permissive_ssl_context()))
+        self.ssl_context = self.permissive_ssl_context()
+        # one session per proxy, so a dead proxy's connections never hold a direct download's
+        self.sessions: dict[str | None, ClientSession] = {}
+        self.cookie_jar: CookieJar | None = None
+        self.circuit_breaker = ProxyCircuitBreaker()
         self.scrape_temp_path = scrape_temp_path
 
+    def get_session(self, proxy: AioProxy | None) -> ClientSession:
+        key = proxy.proxy if proxy else None
+        session = self.sessions.get(key)
+        if not session or session.closed:
+            if not self.cookie_jar:
+                self.cookie_jar = CookieJar()
+            connector = TCPConnector(
+                ssl=self.ssl_context,
+                limit=self.connection_limit,
+                limit_per_host=self.connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                enable_cleanup_closed=True,
+            )
+            session = ClientSession(connector=connector, cookie_jar=self.cookie_jar)
+            self.sessions[key] = session
+        return session
+
     def permissive_ssl_context(self):
         context = SSLContext()
         context.options |= ssl.OP_NO_SSLv2
@@ -61,7 +148,9 @@ class AioDownloader:
 
     async def close(self):
         self.log.info("Before attempting downloader close")
-        await self.session.close()
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions = {}
         self.log.info("After attempting downloader close")
 
     def valid_cookie(self, cookie):
@@ -88,18 +177,26 @@ class AioDownloader:
             if self.valid_cookie(cookie):
                 cookies[cookie["name"]] = cookie["value"]  # type: ignore
 
+        start = time.monotonic()
+        session = self.get_session(proxy)
         if proxy:
-            response = await self.session.request(
-                url=download.request.url,
-                method=download.request.method,
-                headers=headers,
-                cookies=cookies,
-                data=download.request.data,
-                proxy=proxy.proxy,
-                proxy_auth=proxy.proxy_auth,
-            )
+            try:
+                response = await session.request(
+                    url=download.request.url,
+                    method=download.request.method,
+                    headers=headers,
+                    cookies=cookies,
+                    data=download.request.data,
+                    proxy=proxy.proxy,
+                    proxy_auth=proxy.proxy_auth,
+                )
+            except (ClientHttpProxyError, ClientProxyConnectionError):
+                # only errors of the proxy itself, a dead target host must not open every circuit
+                self.circuit_breaker.record_failure(proxy.proxy)
+                raise
+            self.circuit_breaker.record_success(proxy.proxy)
         else:
-            response = await self.session.request(
+            response = await session.request(
                 url=download.request.url,
                 method=download.request.method,
                 headers=headers,
@@ -108,6 +205,7 @@ class AioDownloader:
             )
 
         download.response.status = response.status
+        download.response.elapsed = time.monotonic() - start
         self.log.info(f"Downloaded {download.request.url}, got {response.status}")
         return response
 
@@ -144,6 +242,16 @@ class AioDownloader:
         shuffle(_proxies)
         return _proxies, len(_proxies)
 
+    def next_available_proxy(
+        self, aio_proxies: list[tuple[Proxy | None, AioProxy | None]], index: int
+    ) -> tuple[Proxy | None, AioProxy | None]:
+        """Rotate from `index` to the first proxy whose circuit is not open."""
+        for offset in range(len(aio_proxies)):
+            proxy_record, proxy = aio_proxies[(index + offset) % len(aio_proxies)]
+            if proxy and self.circuit_breaker.is_available(proxy.proxy):
+                return proxy_record, proxy
+        raise ProxiesUnavailableException("Every proxy is failing, not retrying")
+
     async def set_download_data(self, download: DownloadContext, path: str) -> None:
         download.file_path = path
         if not download.mimetype:
@@ -153,23 +261,64 @@ class AioDownloader:
         # NOTE always set file size
         download.file_size = os.path.getsize(download.file_path)
 
+    def check_sniffed_type(self, head: bytes) -> str:
+        mimetype = get_mimetype_from_buffer(head)
+        if mimetype in unsupported_mimetypes or mimetype.startswith(unsupported_mimetype_prefixes):
+            raise DownloadRejectedException(f"Mimetype not supported. mimetype={mimetype}")
+        return mimetype
+
+    def check_size(self, size: int, max_file_size: int | None):
+        if max_file_size and size > max_file_size:
+            raise DownloadRejectedException(
+                f"File too large. size={size} max_file_size={max_file_size}"
+            )
+
     async def write_response_to_file(
         self,
         download: DownloadContext,
         response: ClientResponse,
         temp: AsyncBufferedReader,
+        max_file_size: int | None = max_download_size,
     ):
+        self.check_size(download.response.content_length or 0, max_file_size)
+
         hasher = DocStreamHasher()
+        # plain text parses to its own bytes, so its text hash can be built in the same pass
+        text_hasher: TextStreamHasher | None = None
+        head = b""
+        sniffed_mimetype: str | None = None
+        size = 0
 
         async with aiofiles.open(temp.name, "wb") as fd:
             async for data in response.content.iter_any():
-                await fd.write(data)
+                size += len(data)
+                self.check_size(size, max_file_size)
                 hasher.update(data)
+                if not sniffed_mimetype:
+                    # nothing is written until the type is known to be worth keeping
+                    head += data
+                    if len(head) < self.sniff_size:
+                        continue
+                    sniffed_mimetype = self.check_sniffed_type(head)
+                    if sniffed_mimetype in text_mimetypes:
+                        text_hasher = TextStreamHasher()
+                    data, head = head, b""
+                if text_hasher:
+                    text_hasher.update_text(data.decode(text_encoding))
+                await fd.write(data)
+
+            if head:
+                sniffed_mimetype = self.check_sniffed_type(head)
+                if sniffed_mimetype in text_mimetypes:
+                    text_hasher = TextStreamHasher().update_text(head.decode(text_encoding))
+                await fd.write(head)
             await fd.flush()
 
         await self.set_download_data(download, str(temp.name))
 
         download.file_hash = hasher.hexdigest()
+        if text_hasher:
+            download.text_checksum = text_hasher.hexdigest()
         self.log.info(f"mimetype={download.mimetype} file_hash={download.file_hash}")  # noqa
         return download.file_path, download.file_hash
 
@@ -186,6 +335,7 @@ class AioDownloader:
         self,
         download: DownloadContext,
         proxies: list[tuple[Proxy | None, ProxySettings | None]] = [],
+        max_file_size: int | None = max_download_size,
     ) -> AsyncGenerator[tuple[str | None, str | None], None]:
 
         url = download.request.url
@@ -214,6 +364,7 @@ class AioDownloader:
             async for attempt in AsyncRetrying(
                 stop=stop_after_attempt(retries),
                 wait=wait_random(min=1, max=5),
+                retry=retry_if_not_exception_type(ProxiesUnavailableException),
                 reraise=True,
             ):
                 with attempt:
@@ -224,7 +375,9 @@ class AioDownloader:
                     index = attempt_number - 1
 
                     _proxy_record, proxy = (
-                        aio_proxies[index % proxy_count] if proxy_count else [None, None]
+                        self.next_available_proxy(aio_proxies, index)
+                        if proxy_count
+                        else (None, None)
                     )
 
                     async with aiofiles.tempfile.NamedTemporaryFile(
@@ -255,14 +408,33 @@ class AioDownloader:
                             )
                             download.invalid_responses.append(invalid_response)
                             self.log.error(invalid_response)
+                            if response:
+                                # don't leave the connection checked out of the pool
+                                response.release()
                             raise Exception("invalid response but lets retry ¯\\_(ツ)_/¯")
                         else:
                             download.valid_response = ValidResponse(
                                 proxy_url=proxy_url, **download.response.dict()
                             )
 
+                            if response.status == HTTPStatus.NOT_MODIFIED:
+                                # conditional request, the caller already has this file
+                                download.not_modified = True
+                                yield None, download.file_hash
+                                return
+
                             # We only need this now due to the xlsx lib needing an ext (derp)
                             # TODO see if we can unhave this; the excel lib is dumb
                             download.guess_extension()
-                            result = await self.write_response_to_file(download, response, temp)
+                            try:
+                                result = await self.write_response_to_file(
+                                    download, response, temp, max_file_size
+                                )
+                            except DownloadRejectedException as ex:
+                                # retrying would download the same unwanted body again
+                                response.close()
+                                download.rejected_reason = str(ex)
+                                self.log.error(f"{ex} url={url}")
+                                yield None, None
+                                return
                             yield result
@@ -0,0 +1,143 @@
+import logging
+import os
+from random import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientConnectorError, ClientProxyConnectionError
+
+from backend.common.db.init import init_db
+from backend.common.models.proxy import Proxy
+from backend.common.storage.hash import hash_full_text
+from backend.scrapeworker.common.aio_downloader import AioDownloader, AioProxy, ProxyCircuitBreaker
+from backend.scrapeworker.common.exceptions import (
+    DownloadRejectedException,
+    ProxiesUnavailableException,
+)
+from backend.scrapeworker.common.models import DownloadContext, Request
+
+current_path = os.path.dirname(os.path.realpath(__file__))
+fixture_path = os.path.join(current_path, "__fixtures__")
+
+
+@pytest_asyncio.fixture()
+async def db():
+    await init_db(mock=True, database_name=str(random()))
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = ProxyCircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("http://a")
+    assert breaker.is_available("http://a")
+    breaker.record_success("http://a")
+    breaker.record_failure("http://a")
+    assert breaker.is_available("http://a")
+    breaker.record_failure("http://a")
+    assert not breaker.is_available("http://a")
+    assert breaker.is_available("http://b")
+
+    breaker.reset_timeout = 0
+    assert breaker.is_available("http://a")
+
+
+def test_next_available_proxy_skips_open_circuits(tmp_path):
+    downloader = AioDownloader(None, logging.getLogger(__name__), tmp_path)
+    proxies = [(None, AioProxy(proxy=f"http://{name}", proxy_auth=None)) for name in "abc"]
+    for _ in range(3):
+        downloader.circuit_breaker.record_failure("http://b")
+
+    assert downloader.next_available_proxy(proxies, 1)[1].proxy == "http://c"
+    assert downloader.next_available_proxy(proxies, 4)[1].proxy == "http://c"
+    assert downloader.next_available_proxy(proxies, 0)[1].proxy == "http://a"
+
+
+@pytest.mark.asyncio
+async def test_only_proxy_errors_open_the_circuit(tmp_path):
+    downloader = AioDownloader(None, logging.getLogger(__name__), tmp_path)
+    session = MagicMock()
+    downloader.get_session = MagicMock(return_value=session)
+    proxy = AioProxy(proxy="http://a", proxy_auth=None)
+    download = DownloadContext(request=Request(url="https://dead.example.com/a.pdf"))
+
+    session.request = AsyncMock(side_effect=ClientConnectorError(MagicMock(), OSError()))
+    for _ in range(3):
+        with pytest.raises(ClientConnectorError):
+            await downloader.send_request(download, proxy)
+    assert downloader.circuit_breaker.is_available("http://a")
+
+    session.request = AsyncMock(side_effect=ClientProxyConnectionError(MagicMock(), OSError()))
+    for _ in range(3):
+        with pytest.raises(ClientProxyConnectionError):
+            await downloader.send_request(download, proxy)
+    assert not downloader.circuit_breaker.is_available("http://a")
+
+
+@pytest.mark.asyncio
+async def test_download_stops_when_every_proxy_is_failing(db, tmp_path):
+    downloader = AioDownloader(None, logging.getLogger(__name__), tmp_path)
+    downloader.send_request = AsyncMock()
+    proxy = Proxy(name="proxy", endpoints=["a:80", "b:80"])
+    for endpoint in proxy.endpoints:
+        for _ in range(3):
+            downloader.circuit_breaker.record_failure(f"http://{endpoint}")
+
+    download = DownloadContext(request=Request(url="https://example.com/a.pdf"))
+    with pytest.raises(ProxiesUnavailableException):
+        async with downloader.try_download_to_tempfile(download, [(proxy, None)]):
+            pass
+
+    downloader.send_request.assert_not_awaited()
+
+
+def fake_response(body: bytes, chunk_size: int = 1000):
+    async def iter_any():
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]  # noqa: E203
+
+    response = MagicMock()
+    response.content.iter_any = iter_any
+    return response
+
+
+async def write_fixture(tmp_path, body: bytes, **kwargs):
+    downloader = AioDownloader(None, logging.getLogger(__name__), tmp_path)
+    download = DownloadContext(request=Request(url="https://example.com/file"))
+    temp = MagicMock()
+    temp.name = str(tmp_path / "download")
+    await downloader.write_response_to_file(download, fake_response(body), temp, **kwargs)
+    return download, temp.name
+
+
+@pytest.mark.asyncio
+async def test_write_response_rejects_unsupported_type_before_writing(tmp_path):
+    with open(os.path.join(fixture_path, "music.mp3"), "rb") as file:
+        body = file.read()
+
+    with pytest.raises(DownloadRejectedException, match="audio/mpeg"):
+        await write_fixture(tmp_path, body)
+    assert os.path.getsize(tmp_path / "download") == 0
+
+
+@pytest.mark.asyncio
+async def test_write_response_rejects_oversized_body(tmp_path):
+    with pytest.raises(DownloadRejectedException, match="too large"):
+        await write_fixture(tmp_path, b"a" * 20000, max_file_size=10000)
+
+
+@pytest.mark.asyncio
+async def test_write_response_hashes_during_transfer(tmp_path):
+    with open(os.path.join(fixture_path, "test.docx"), "rb") as file:
+        body = file.read()
+
+    download, path = await write_fixture(tmp_path, body)
+    with open(path, "rb") as file:
+        assert file.read() == body
+    assert download.file_extension == "docx"
+    assert download.file_hash
+    assert download.text_checksum is None
+
+    text = "Policy 1234\r\n  effective\xa0date 01/01/2022\n" * 500
+    download, path = await write_fixture(tmp_path, text.encode("iso-8859-1"))
+    assert download.file_extension == "txt"
+    assert download.text_checksum == hash_full_text(text)
@@ -1,16 +1,149 @@
+import copy
 import logging
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Generator, Iterator
+from functools import lru_cache
+from typing import Callable, Generator, Iterator
 
 from dateutil import parser
 
-from backend.scrapeworker.common.utils import quarter_rgxs
+from backend.scrapeworker.common.utils import date_rgxs, date_start_rgx, label_rgxs, quarter_rgxs
 
 QTR_FMTS, QTR_NUM_FMTS, YEAR_FMT = quarter_rgxs
 
 
+# date regexes to try, with their index, and the pattern finding where any of them match
+DateScanner = tuple[list[tuple[int, re.Pattern[str]]], re.Pattern[str] | None]
+
+
+@lru_cache(32)
+def date_candidates_rgx(patterns: tuple[str, ...], start: str, flags: int) -> re.Pattern[str]:
+    """
+    One pattern matching (empty) at every position any of the date patterns matches.
+    All patterns are only tried where `start` matches, if given.
+    """
+    alternation = "|".join(f"(?=(?:{pattern}))" for pattern in patterns)
+    if start:
+        return re.compile(f"(?=(?:{start}))(?:{alternation})", flags)
+    return re.compile(alternation, flags)
+
+
+month_names = [
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+]
+month_numbers = {
+    **{name: i + 1 for i, name in enumerate(month_names)},
+    **{name[:3]: i + 1 for i, name in enumerate(month_names)},
+    "sept": 9,
+}
+
+numeric_ymd_rgx = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+named_ymd_rgx = re.compile(r"(\d{4})-([a-z]+)-(\d{1,2})", re.IGNORECASE)
+separated_ymd_rgx = re.compile(r"(\d{4})([/.-])(\d{1,2})\2(\d{1,2})")
+separated_mdy_rgx = re.compile(r"(\d{1,2})([/.-])(\d{1,2})\2(\d{4}|\d{2})")
+month_day_year_rgx = re.compile(r"([a-z]+)\.?,? (\d{1,2})(?:st|nd|rd|th)?,? (\d{4})", re.IGNORECASE)
+day_month_year_rgx = re.compile(r"(\d{1,2}) ([a-z]+)\.?,? (\d{4})", re.IGNORECASE)
+
+
+def build_date(year: int, month: int | None, day: int) -> datetime | None:
+    # dateutil reads some out of range months as days, leave those to it
+    if not month or month > 12:
+        return None
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def expand_year(year: str) -> int:
+    """Two digit years are read like dateutil does, as the closest to the current year"""
+    if len(year) != 2:
+        return int(year)
+    current_year = datetime.now().year
+    full_year = int(year) + current_year // 100 * 100
+    if full_year >= current_year + 50:
+        full_year -= 100
+    elif full_year < current_year - 50:
+        full_year += 100
+    return full_year
+
+
+def numeric_ymd(datetext: str) -> datetime | None:
+    """2021-1-31"""
+    if match := numeric_ymd_rgx.fullmatch(datetext):
+        year, month, day = match.groups()
+        return build_date(int(year), int(month), int(day))
+
+
+def named_ymd(datetext: str) -> datetime | None:
+    """2021-Jan-31"""
+    if match := named_ymd_rgx.fullmatch(datetext):
+        year, month, day = match.groups()
+        return build_date(int(year), month_numbers.get(month.lower()), int(day))
+
+
+def separated_ymd(datetext: str) -> datetime | None:
+    """2021/1/31, 2021-1-31 or 2021.1.31"""
+    if match := separated_ymd_rgx.fullmatch(datetext):
+        year, _, month, day = match.groups()
+        return build_date(int(year), int(month), int(day))
+
+
+def separated_mdy(datetext: str) -> datetime | None:
+    """1/31/2021, 1-31-21 or 1.31.2021"""
+    if match := separated_mdy_rgx.fullmatch(datetext):
+        month, _, day, year = match.groups()
+        return build_date(expand_year(year), int(month), int(day))
+
+
+def month_day_year(datetext: str) -> datetime | None:
+    """Jan 31, 2021, January 31st 2021 or Jan, 31 2021"""
+    if match := month_day_year_rgx.fullmatch(datetext):
+        month, day, year = match.groups()
+        return build_date(int(year), month_numbers.get(month.lower()), int(day))
+
+
+def day_month_year(datetext: str) -> datetime | None:
+    """31 Jan 2021 or 31 January, 2021"""
+    if match := day_month_year_rgx.fullmatch(datetext):
+        day, month, year = match.groups()
+        return build_date(int(year), month_numbers.get(month.lower()), int(day))
+
+
+# by date regex index, converts the date text built from a match without dateutil
+# or returns None when it is not sure, dateutil is used then
+date_converters: list[Callable[[str], datetime | None]] = [
+    named_ymd,  # yyyyMMM
+    numeric_ymd,  # yyyy
+    numeric_ymd,  # mmYYYY or YYYYmm
+    numeric_ymd,  # mmddyyyy yyyymmdd
+    separated_ymd,  # yyyy-MM-dd
+    separated_mdy,  # dd-MM-yyyy, dd-mm-yy
+    month_day_year,  # M d, yyyy
+    day_month_year,  # d M yyyy
+    day_month_year,  # d M yyyy
+    month_day_year,  # M d, yyyy
+    month_day_year,  # M, dd
+    month_day_year,  # M, dd
+    named_ymd,  # M, yyyy
+    named_ymd,  # M, yyyy
+    numeric_ymd,  # MM/yy
+    numeric_ymd,  # MM/yyyy
+]
+
+
 @dataclass
 class LabelMatch:
     text: str
@@ -56,8 +189,12 @@ class DateParser:
         self,
         date_rgxs: list[re.Pattern[str]],
         label_rgxs: tuple[list[re.Pattern[str]], dict[str, str]],
+        date_start: str = date_start_rgx,
+        date_converters: list[Callable[[str], datetime | None]] = date_converters,
     ) -> None:
         self.date_rgxs = date_rgxs
+        self.date_start = date_start
+        self.date_converters = date_converters
         self.label_rgxs = label_rgxs
         self.whitespace_rgx = re.compile(r"\S")
         self.hyphen_rgx = re.compile(r"[\u2010-\u2015]|\u00AD|-")  # unicode hyphens
@@ -71,6 +208,9 @@ class DateParser:
         self.unclassified_dates: set[datetime] = set()
         self.heading_dates: list[DateMatch] = []
         self.identified_dates_limit = 25
+        # the same text after a hyphen is searched again for every date before it
+        self.closest_date = lru_cache(1024)(self._closest_date)
+        self.date_scanners: dict[tuple[int, ...], DateScanner] = {}
 
     NON_LABEL_RGX = [0, 2, 3, 14, 15]
     CONTEXT_CHARS = re.compile(
@@ -150,7 +290,7 @@ class DateParser:
         year_num, month_num, day_num = int(year), (int(quarter) * 3) - 2, 1
         if self.valid_range(month=month_num, year=year_num, day=day_num):
             date_text = f"{year_num}-{month_num}-{day_num}"
-            date = parser.parse(date_text, ignoretz=True)
+            date = numeric_ymd(date_text) or parser.parse(date_text, ignoretz=True)
             return date
 
     def check_quarter_text(self, text: str):
@@ -334,17 +474,43 @@ class DateParser:
             return True
         return False
 
+    def date_scanner(self, rgx_excludes: tuple[int, ...]) -> DateScanner:
+        if rgx_excludes not in self.date_scanners:
+            rgxs = [(i, rgx) for i, rgx in enumerate(self.date_rgxs) if i not in rgx_excludes]
+            scanner = None
+            if rgxs:
+                patterns = tuple(rgx.pattern for _, rgx in rgxs)
+                # date regexes are compiled with the same flags
+                scanner = date_candidates_rgx(patterns, self.date_start, rgxs[0][1].flags)
+            self.date_scanners[rgx_excludes] = rgxs, scanner
+        return self.date_scanners[rgx_excludes]
+
+    def find_date_matches(self, text: str, rgx_excludes: list[int] = []) -> list[list[re.Match]]:
+        """
+        Matches of each date regex, the same as running its own `finditer`, from one scan
+        of the text for positions where any of them match.
+        """
+        rgxs, scanner = self.date_scanner(tuple(rgx_excludes))
+        matches: list[list[re.Match]] = [[] for _ in self.date_rgxs]
+        if not scanner:
+            return matches
+        next_start = [0] * len(self.date_rgxs)
+        for candidate in scanner.finditer(text):
+            position = candidate.start()
+            for i, rgx in rgxs:
+                if position >= next_start[i] and (m := rgx.match(text, position)):
+                    matches[i].append(m)
+                    next_start[i] = m.end()
+        return matches
+
     def get_dates(
         self, text: str, rgx_excludes: list[int] = []
     ) -> Generator[DateMatch, None, None]:
         match_count = 0
         secondary_match: DateMatch | None = None
-        for i, rgx in enumerate(self.date_rgxs):
-            if i in rgx_excludes:
-                continue
-            match = rgx.finditer(text)
+        for i, rgx_matches in enumerate(self.find_date_matches(text, rgx_excludes)):
             last_index = 0
-            for m in match:
+            for m in rgx_matches:
                 try:
                     datetext = m.group()
                     if i == 0:
@@ -371,7 +537,7 @@ class DateParser:
                         else:
                             continue
                     datetext = datetext.replace("|", "-")
-                    date = parser.parse(datetext, ignoretz=True)
+                    date = self.convert_date(i, datetext)
                     if self.valid_range(month=date.month, year=date.year, day=date.day):
                         dm = DateMatch(date, m, last_index, rgx=i)
                         match_count += 1
@@ -387,6 +553,19 @@ class DateParser:
             # only yield these if no other matches
             yield secondary_match
 
+    def convert_date(self, rgx: int, datetext: str) -> datetime:
+        """Date from the text built for a match of date regex `rgx`, dateutil if no fast path"""
+        converter = self.date_converters[rgx] if rgx < len(self.date_converters) else None
+        date = converter(datetext) if converter else None
+        return date or parser.parse(datetext, ignoretz=True)
+
+    def has_date(self, text: str) -> bool:
+        """
+        Whether text has a date. Only reads the parser's regexes, never its extracted dates,
+        so one parser can be shared, including between threads, see `date_detector`.
+        """
+        return next(self.get_dates(text), None) is not None
+
     def extract_date_span(self, text: str, start: int) -> DateMatch | None:
         """
         Return date found in text if date is preceded by dash
@@ -397,16 +576,21 @@ class DateParser:
             dash_index = separator_match.start()
             if self.whitespace_rgx.search(text, start, dash_index):
                 return None
-            closest_match: DateMatch | None = None
-            for m in self.get_dates(text[dash_index:]):
-                if not closest_match or m.start < closest_match.start:
-                    closest_match = m
+            closest_match = self.closest_date(text[dash_index:])
             if closest_match:
                 second_date = dash_index + closest_match.start
                 if not self.whitespace_rgx.search(text, dash_index + 1, second_date):
-                    return closest_match
+                    # cached matches are shared, labels are set on the returned one
+                    return copy.copy(closest_match)
         return None
 
+    def _closest_date(self, text: str) -> DateMatch | None:
+        closest_match: DateMatch | None = None
+        for m in self.get_dates(text):
+            if not closest_match or m.start < closest_match.start:
+                closest_match = m
+        return closest_match
+
     def update_label(self, match: DateMatch, label: LabelMatch) -> None:
         """
         Check existing date label for previous best match.
@@ -513,3 +697,7 @@ class DateParser:
             word_count += len(line.split(" "))
 
         self.check_effective_date(label_texts)
+
+
+# for callers that only check texts for dates
+date_detector = DateParser(date_rgxs, label_rgxs)
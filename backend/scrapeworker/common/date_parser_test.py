@@ -1,8 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from date_parser import timezone
-
-from backend.scrapeworker.common.date_parser import DateParser
+from dateutil import parser as dateutil_parser
+
+from backend.scrapeworker.common.date_parser import (
+    DateParser,
+    date_converters,
+    date_detector,
+    expand_year,
+)
 from backend.scrapeworker.common.utils import date_rgxs, label_rgxs
 
 
@@ -503,3 +510,69 @@ def test_doc_name_dates():
     parser.extract_dates(text, ["aetna-value-drug-list"])
     assert len(parser.unclassified_dates) == 0
     assert parser.effective_date.date is None
+
+
+def test_find_date_matches_same_as_each_regex():
+    text = (
+        "2020Dec 2021 012022 01022021 2021-01-02 1-2-2021 Jan 3, 2021 3 March, 2021 "
+        "Jan, 3 June, 2022 Dec. 2021 01/22 1/2022 - 12 mg 01/22/2021-02/22/2021"
+    )
+    parser = DateParser(date_rgxs, label_rgxs)
+    for excludes in [[], DateParser.NON_LABEL_RGX]:
+        matches = parser.find_date_matches(text, excludes)
+        for i, rgx in enumerate(date_rgxs):
+            expected = [] if i in excludes else [m.span() for m in rgx.finditer(text)]
+            assert [m.span() for m in matches[i]] == expected
+
+
+def test_cached_date_span():
+    parser = DateParser(date_rgxs, label_rgxs)
+    first = parser.extract_date_span("Jan 1, 2021 - Feb 1, 2021", 11)
+    second = parser.extract_date_span("Mar 1, 2021 - Feb 1, 2021", 11)
+    assert first and second and first is not second
+    assert first.date == second.date == datetime(2021, 2, 1)
+    assert parser.closest_date.cache_info().hits == 1
+
+
+def test_date_converters_match_dateutil():
+    texts = [
+        (0, "2020-Dec-01"),
+        (2, "2021-4-01"),
+        (4, "2021/04/20"),
+        (4, "2021.4.2"),
+        (5, "04-20-2020"),
+        (5, "4.20.21"),
+        (6, "Sept. 3rd, 2021"),
+        (8, "3 March, 2021"),
+        (10, "Jan, 3 2022"),
+        (12, "2022-June-01"),
+    ]
+    for rgx, text in texts:
+        date = date_converters[rgx](text)
+        assert date and date == dateutil_parser.parse(text, ignoretz=True)
+
+
+def test_date_converters_fallback():
+    parser = DateParser(date_rgxs, label_rgxs)
+    # day first dates are left to dateutil
+    assert date_converters[5]("20-04-2020") is None
+    assert parser.convert_date(5, "20-04-2020") == datetime(2020, 4, 20)
+    assert date_converters[6]("Janx 3, 2021") is None
+    assert date_converters[1]("2021-2-30") is None
+
+
+def test_expand_year():
+    current_year = datetime.now().year
+    assert expand_year("2021") == 2021
+    assert expand_year(str(current_year)[2:]) == current_year
+    assert expand_year(str(current_year + 50)[2:]) == current_year - 50
+
+
+def test_shared_date_detector():
+    words = ["Updated", "12/1/2022", "01.02.21", "words", "Jan", "2021", "40mg"] * 20
+    expected = [DateParser(date_rgxs, label_rgxs).has_date(word) for word in words]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(date_detector.has_date, words)) == expected
+    assert expected[:3] == [False, True, True]
+    assert date_detector.effective_date.date is None
+    assert date_detector.unclassified_dates == set()
@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from logging import Logger
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+
+from backend.scrapeworker.common.models import DownloadContext
+from backend.scrapeworker.common.rate_limiter import HostConcurrencyLimiter
+
+
+class DownloadPool:
+    """
+    Sliding window of downloads: another download starts as soon as one finishes,
+    up to max_concurrency overall and the adaptive limit of each host.
+    Host limits are kept between runs so later batches start from what was learned.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[DownloadContext], Awaitable],
+        stop_if_canceled: Callable[[], Awaitable],
+        log: Logger,
+        fail_fast: bool = False,
+        cancel_check_interval: float = 10,
+    ) -> None:
+        self.download = download
+        self.stop_if_canceled = stop_if_canceled
+        self.log = log
+        self.fail_fast = fail_fast
+        self.cancel_check_interval = cancel_check_interval
+        self.limiters: dict[str, HostConcurrencyLimiter] = {}
+
+    def limiter(self, host: str) -> HostConcurrencyLimiter:
+        if host not in self.limiters:
+            self.limiters[host] = HostConcurrencyLimiter()
+        return self.limiters[host]
+
+    async def run_download(self, download: DownloadContext, limiter: HostConcurrencyLimiter):
+        try:
+            # the slot was taken when the download was selected, give it back even if cancelled
+            await limiter.wait()
+            await self.download(download)
+        finally:
+            statuses = [response.status for response in download.invalid_responses]
+            if download.response.status:
+                statuses.append(download.response.status)
+            limiter.release(statuses, download.response.elapsed)
+
+    def next_downloads(
+        self, queues: dict[str, deque[DownloadContext]], slots: int
+    ) -> list[tuple[DownloadContext, HostConcurrencyLimiter]]:
+        # round robin over hosts with capacity, so one slow host can not hold every slot
+        selected: list[tuple[DownloadContext, HostConcurrencyLimiter]] = []
+        while queues and len(selected) < slots:
+            selected_count = len(selected)
+            for host, queue in list(queues.items()):
+                if len(selected) == slots:
+                    break
+                limiter = self.limiter(host)
+                if not limiter.try_acquire():
+                    continue
+                selected.append((queue.popleft(), limiter))
+                if not queue:
+                    del queues[host]
+            if len(selected) == selected_count:
+                break
+        return selected
+
+    async def run(self, downloads: list[DownloadContext], max_concurrency: int = 20):
+        queues: dict[str, deque[DownloadContext]] = {}
+        for download in downloads:
+            host = urlparse(download.request.url).netloc
+            queues.setdefault(host, deque()).append(download)
+        downloads.clear()
+
+        loop = asyncio.get_running_loop()
+        last_cancel_check = loop.time()
+        pending: set[asyncio.Task] = set()
+        try:
+            while queues or pending:
+                for download, limiter in self.next_downloads(
+                    queues, max_concurrency - len(pending)
+                ):
+                    pending.add(asyncio.create_task(self.run_download(download, limiter)))
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if exception := task.exception():
+                        if self.fail_fast:
+                            raise exception
+                        self.log.error("download error", exc_info=exception)
+
+                if loop.time() - last_cancel_check >= self.cancel_check_interval:
+                    last_cancel_check = loop.time()
+                    await self.stop_if_canceled()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        await self.stop_if_canceled()
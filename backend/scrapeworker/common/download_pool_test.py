@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.scrapeworker.common.download_pool import DownloadPool
+from backend.scrapeworker.common.models import DownloadContext, Request
+
+
+def downloads_for(*urls: str):
+    return [DownloadContext(request=Request(url=url)) for url in urls]
+
+
+@pytest.mark.asyncio
+async def test_slow_download_does_not_hold_the_window():
+    started: list[str] = []
+    finished: list[str] = []
+
+    async def download(context: DownloadContext):
+        url = context.request.url
+        started.append(url)
+        await asyncio.sleep(0.2 if url.endswith("slow.pdf") else 0.01)
+        context.response.status = 200
+        context.response.elapsed = 0.01
+        finished.append(url)
+
+    stop_if_canceled = AsyncMock()
+    pool = DownloadPool(download, stop_if_canceled, MagicMock())
+    urls = ["https://a.com/slow.pdf"] + [f"https://a.com/{i}.pdf" for i in range(10)]
+    queue = downloads_for(*urls)
+    await pool.run(queue, max_concurrency=2)
+
+    assert queue == []
+    assert sorted(started) == sorted(urls)
+    # every other download finished while the slow one was still running
+    assert finished[-1] == "https://a.com/slow.pdf"
+    stop_if_canceled.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_hosts_share_the_window_round_robin():
+    started: list[str] = []
+
+    async def download(context: DownloadContext):
+        started.append(context.request.url)
+
+    pool = DownloadPool(download, AsyncMock(), MagicMock())
+    queue = downloads_for("https://a.com/1", "https://a.com/2", "https://b.com/1")
+    await pool.run(queue, max_concurrency=2)
+
+    assert started[:2] == ["https://a.com/1", "https://b.com/1"]
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_raises_download_errors():
+    async def download(context: DownloadContext):
+        raise ValueError(context.request.url)
+
+    pool = DownloadPool(download, AsyncMock(), MagicMock(), fail_fast=True)
+    with pytest.raises(ValueError):
+        await pool.run(downloads_for("https://a.com/1"))
+
+    pool = DownloadPool(download, AsyncMock(), MagicMock())
+    await pool.run(downloads_for("https://a.com/1"))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_releases_host_slot():
+    pool = DownloadPool(AsyncMock(), AsyncMock(), MagicMock())
+    limiter = pool.limiter("a.com")
+    assert limiter.try_acquire()
+    limiter.wait = AsyncMock(side_effect=asyncio.CancelledError)
+
+    with pytest.raises(asyncio.CancelledError):
+        await pool.run_download(downloads_for("https://a.com/1")[0], limiter)
+    assert limiter.in_flight == 0
@@ -1,5 +1,14 @@
 class NoDocsCollectedException(Exception):
     pass
 
+
 class CanceledTaskException(Exception):
     pass
+
+
+class ProxiesUnavailableException(Exception):
+    pass
+
+
+class DownloadRejectedException(Exception):
+    pass
@@ -42,6 +42,10 @@ class Response(BaseModel):
     content_disposition: str | None = None
     status: int | None = None
     content_length: int | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    # seconds until the response headers arrived
+    elapsed: float | None = None
 
     def from_aio_response(self, response: ClientResponse):
         headers = response.headers
@@ -49,6 +53,8 @@ class Response(BaseModel):
         self.content_type = self.get_content_type(headers)
         self.content_disposition_filename = self.get_content_disposition_filename(headers)
         self.content_length = int(headers.get("content-length", 0))
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
 
     def get_content_disposition_filename(self, headers) -> str | None:
         matched = None
@@ -94,6 +100,12 @@ class DownloadContext(BaseModel):
     content_type: str | None = None
     mimetype: str | None = None
     is_searchable: bool = False
+    # server answered a conditional request with 304, nothing was downloaded
+    not_modified: bool = False
+    # whitespace-stripped text hash, computed during transfer for plain text files
+    text_checksum: str | None = None
+    # why the downloader stopped before the whole file was received
+    rejected_reason: str | None = None
 
     valid_response: ValidResponse | None = None
     invalid_responses: list[InvalidResponse] = []
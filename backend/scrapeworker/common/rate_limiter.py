@@ -6,10 +6,10 @@ from tenacity.stop import stop_after_attempt
 
 
 class RateLimiter:
-    def __init__(self, wait_between_requests: float = 1) -> None:
+    def __init__(self, wait_between_requests: float = 1, min_wait: float = 1) -> None:
         self.last_request_time = datetime.now(tz=timezone.utc)
         self.wait_between_requests = wait_between_requests
-        pass
+        self.min_wait = min_wait
 
     def remaining_wait(self):
         time_since_last_request = datetime.now(tz=timezone.utc) - self.last_request_time
@@ -28,7 +28,7 @@ class RateLimiter:
             self.wait_between_requests *= 1.5
 
     def decrease_wait(self):
-        if self.wait_between_requests > 1:
+        if self.wait_between_requests > self.min_wait:
             self.wait_between_requests /= 1.5
 
     async def attempt_with_backoff(self, stop_attempts=4):
@@ -48,3 +48,55 @@ class RateLimiter:
                 self.increase_wait()
             else:
                 self.decrease_wait()
+
+
+class HostConcurrencyLimiter:
+    """
+    Adaptive limit on concurrent requests to a single host.
+    The limit grows while the host answers quickly, shrinks as its latency climbs,
+    and halves when it throttles or fails (429/5xx), which also spaces out requests.
+    """
+
+    throttled_statuses = {429, 500, 502, 503, 504}
+    # requests are spaced at least this far apart once a host has throttled us
+    throttle_wait: float = 0.5
+
+    def __init__(self, initial_limit: float = 4, max_limit: float = 20) -> None:
+        self.limit = initial_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.min_latency: float | None = None
+        self.rate_limiter = RateLimiter(wait_between_requests=0, min_wait=0)
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    async def wait(self):
+        await self.rate_limiter.wait()
+        self.rate_limiter.last_request_time = datetime.now(tz=timezone.utc)
+
+    def release(self, statuses: list[int], latency: float | None = None):
+        self.in_flight -= 1
+        if any(status in self.throttled_statuses for status in statuses):
+            self.limit = max(1, self.limit / 2)
+            self.rate_limiter.wait_between_requests = max(
+                self.rate_limiter.wait_between_requests, self.throttle_wait
+            )
+            self.rate_limiter.increase_wait()
+            return
+
+        if latency is None:
+            return
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+        if self.latency > 2 * self.min_latency:
+            # the host is queueing our requests, back off gently
+            self.limit = max(1, self.limit - 1)
+        else:
+            # roughly one more slot per window of successful requests
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.rate_limiter.decrease_wait()
@@ -1,6 +1,6 @@
 import math
 import pytest
-from backend.scrapeworker.common.rate_limiter import RateLimiter
+from backend.scrapeworker.common.rate_limiter import HostConcurrencyLimiter, RateLimiter
 
 
 @pytest.mark.asyncio
@@ -15,3 +15,36 @@ async def test_retrier():
                 raise Exception("Second Failure")
 
     assert math.isclose(rl.wait_between_requests, wait_between_requests * 1.5**2)
+
+
+def test_host_limiter_grows_while_fast():
+    limiter = HostConcurrencyLimiter(initial_limit=2, max_limit=4)
+    for _ in range(20):
+        assert limiter.try_acquire()
+        limiter.release([200], latency=0.1)
+
+    assert limiter.limit == 4
+
+
+def test_host_limiter_halves_and_spaces_requests_when_throttled():
+    limiter = HostConcurrencyLimiter(initial_limit=8)
+    assert limiter.try_acquire()
+    limiter.release([429, 200], latency=0.1)
+
+    assert limiter.limit == 4
+    assert limiter.rate_limiter.wait_between_requests > 0
+    for _ in range(4):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+
+def test_host_limiter_backs_off_as_latency_climbs():
+    limiter = HostConcurrencyLimiter(initial_limit=4)
+    limiter.try_acquire()
+    limiter.release([200], latency=0.1)
+    grown = limiter.limit
+    for _ in range(5):
+        limiter.try_acquire()
+        limiter.release([200], latency=2)
+
+    assert limiter.limit < grown
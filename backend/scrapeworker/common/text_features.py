@@ -0,0 +1,48 @@
+from functools import cached_property
+
+from gensim.utils import simple_preprocess
+
+
+class TextFeatures:
+    """
+    Tokens of a document's text, computed once on first use and shared by the doc type rules
+    and the doc type classifier. The rules only look at the leading tokens, which come from a
+    prefix of the text unless the whole text was already tokenized for the classifier.
+    """
+
+    prefix_length: int = 4096
+
+    def __init__(self, text: str, take_count: int = 50) -> None:
+        self.text = text
+        self.take_count = take_count
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        return simple_preprocess(self.text)
+
+    @cached_property
+    def leading_tokens(self) -> list[str]:
+        if "tokens" in self.__dict__:
+            return self.tokens[: self.take_count]
+
+        prefix_length = self.prefix_length
+        while prefix_length < len(self.text):
+            tokens = simple_preprocess(self.text[:prefix_length])
+            # the last token can be cut short by the end of the prefix, those before it can not
+            if len(tokens) > self.take_count:
+                return tokens[: self.take_count]
+            prefix_length *= 4
+        return self.tokens[: self.take_count]
+
+    @cached_property
+    def leading_text(self) -> str:
+        return " ".join(self.leading_tokens)
+
+    @cached_property
+    def token_set(self) -> set[str]:
+        """Unique leading tokens, already lowercase"""
+        return set(self.leading_tokens)
+
+    @cached_property
+    def fasttext_input(self) -> str:
+        return " ".join(self.tokens)
@@ -0,0 +1,33 @@
+from gensim.utils import simple_preprocess
+
+from backend.scrapeworker.common.text_features import TextFeatures
+
+text = "Prior Authorization Criteria, Step-Therapy for naïve patients x 12 " * 40
+
+
+def test_leading_tokens_from_prefix():
+    features = TextFeatures(text, take_count=50)
+    features.prefix_length = 10
+
+    assert features.leading_tokens == simple_preprocess(text)[:50]
+    assert features.leading_text == " ".join(simple_preprocess(text)[:50])
+    assert features.token_set == {"prior", "authorization", "criteria", "step", "therapy"} | {
+        "for",
+        "naïve",
+        "patients",
+    }
+    # the whole text was never needed
+    assert "tokens" not in vars(features)
+
+
+def test_leading_tokens_reuse_classifier_tokens():
+    features = TextFeatures(text, take_count=3)
+
+    assert features.fasttext_input == " ".join(simple_preprocess(text))
+    assert features.leading_tokens == ["prior", "authorization", "criteria"]
+
+
+def test_short_text():
+    features = TextFeatures("PA list")
+    assert features.leading_tokens == ["pa", "list"]
+    assert TextFeatures("").leading_text == ""
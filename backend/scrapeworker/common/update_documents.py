@@ -57,47 +57,53 @@ class DocumentUpdater:
         parsed_content: dict,
         focus_configs: list[FocusSectionConfig] | None = None,
     ) -> UpdateRetrievedDocument:
-        now: datetime = datetime.now(tz=timezone.utc)
-
         location: RetrievedDocumentLocation = document.get_site_location(self.site.id)
-        context_metadata = download.metadata.dict()
-        new_location = None
-
         if location:
-            location.link_text = download.metadata.link_text
-            location.siblings_text = download.metadata.siblings_text
-            location.context_metadata = context_metadata
-            location.last_collected_date = now
-        else:
-            await get_tags(parsed_content, focus_configs=focus_configs)
-            new_location = RetrievedDocumentLocation(
-                base_url=download.metadata.base_url,
-                first_collected_date=now,
-                last_collected_date=now,
-                site_id=self.site.id,
-                url=download.request.url,
-                context_metadata=context_metadata,
-                link_text=download.metadata.link_text,
-                siblings_text=download.metadata.siblings_text,
-                url_therapy_tags=parsed_content["url_therapy_tags"],
-                url_indication_tags=parsed_content["url_indication_tags"],
-                link_therapy_tags=parsed_content["link_therapy_tags"],
-                link_indication_tags=parsed_content["link_indication_tags"],
-            )
+            return await self.update_collected_location(document, location, download)
+
+        now: datetime = datetime.now(tz=timezone.utc)
+        await get_tags(parsed_content, focus_configs=focus_configs)
+        new_location = RetrievedDocumentLocation(
+            base_url=download.metadata.base_url,
+            first_collected_date=now,
+            last_collected_date=now,
+            site_id=self.site.id,
+            url=download.request.url,
+            context_metadata=download.metadata.dict(),
+            link_text=download.metadata.link_text,
+            siblings_text=download.metadata.siblings_text,
+            url_therapy_tags=parsed_content["url_therapy_tags"],
+            url_indication_tags=parsed_content["url_indication_tags"],
+            link_therapy_tags=parsed_content["link_therapy_tags"],
+            link_indication_tags=parsed_content["link_indication_tags"],
+        )
 
         # Must handle locations separately to avoid overwriting concurrent updates
-        if new_location:
-            await RetrievedDocument.find({"_id": document.id}).update(
-                {"$push": {"locations": new_location}}
-            )
-        elif location:
-            await RetrievedDocument.find(
-                {"_id": document.id, "locations.site_id": self.site.id}
-            ).update({"$set": {"locations.$": location}})
+        await RetrievedDocument.find({"_id": document.id}).update(
+            {"$push": {"locations": new_location}}
+        )
+        await document.update({"$set": {"last_collected_date": now}})
+
+        return True
 
+    async def update_collected_location(
+        self,
+        document: RetrievedDocument,
+        location: RetrievedDocumentLocation,
+        download: DownloadContext,
+    ) -> bool:
+        now: datetime = datetime.now(tz=timezone.utc)
+        location.link_text = download.metadata.link_text
+        location.siblings_text = download.metadata.siblings_text
+        location.context_metadata = download.metadata.dict()
+        location.last_collected_date = now
+
+        await RetrievedDocument.find(
+            {"_id": document.id, "locations.site_id": self.site.id}
+        ).update({"$set": {"locations.$": location}})
         await document.update({"$set": {"last_collected_date": now}})
 
-        return bool(new_location)
+        return False
 
     async def update_doc_document(
         self,
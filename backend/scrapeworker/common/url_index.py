@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from logging import Logger
+
+from beanie import PydanticObjectId
+
+from backend.common.models.url_index import SiteUrlIndex
+from backend.scrapeworker.common.models import DownloadContext
+
+
+class UrlIndex:
+    """
+    Per site record of collected urls, persisted across scrape tasks.
+    Lets a scrape skip documents that have not changed since the last run,
+    either through a conditional request or by matching the downloaded file hash.
+    """
+
+    def __init__(self, site_id: PydanticObjectId, log: Logger) -> None:
+        self.site_id = site_id
+        self.log = log
+        self.entries: dict[str, SiteUrlIndex] | None = None
+
+    async def load(self) -> dict[str, SiteUrlIndex]:
+        if self.entries is None:
+            self.entries = {
+                entry.url: entry async for entry in SiteUrlIndex.find({"site_id": self.site_id})
+            }
+            self.log.debug(f"loaded url index site_id={self.site_id} urls={len(self.entries)}")
+        return self.entries
+
+    def is_indexable(self, download: DownloadContext):
+        # only plain GETs are identified by their url alone
+        return (
+            download.request.method == "GET"
+            and not download.request.data
+            and not download.direct_scrape
+            and not download.playwright_download
+        )
+
+    async def get(self, download: DownloadContext) -> SiteUrlIndex | None:
+        if not self.is_indexable(download):
+            return None
+        entries = await self.load()
+        return entries.get(download.request.url)
+
+    async def add_validators(self, download: DownloadContext) -> SiteUrlIndex | None:
+        """Make the download conditional on the file having changed since it was indexed."""
+        entry = await self.get(download)
+        if not entry or not entry.retrieved_document_id:
+            return None
+
+        if entry.etag:
+            download.request.headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            download.request.headers["If-Modified-Since"] = entry.last_modified
+        download.file_hash = entry.checksum
+        return entry
+
+    def remove_validators(self, download: DownloadContext):
+        download.request.headers.pop("If-None-Match", None)
+        download.request.headers.pop("If-Modified-Since", None)
+        download.not_modified = False
+        download.file_hash = None
+
+    async def invalidate(self, download: DownloadContext):
+        """Forget the document of an entry, so the url is no longer downloaded conditionally."""
+        entry = await self.get(download)
+        if not entry:
+            return
+
+        entry.retrieved_document_id = None
+        await SiteUrlIndex.get_motor_collection().update_one(
+            {"site_id": self.site_id, "url": entry.url}, {"$set": {"retrieved_document_id": None}}
+        )
+
+    async def record(
+        self, download: DownloadContext, checksum: str, retrieved_document_id: PydanticObjectId
+    ):
+        if not self.is_indexable(download):
+            return
+
+        url = download.request.url
+        update = {
+            "etag": download.response.etag,
+            "last_modified": download.response.last_modified,
+            "checksum": checksum,
+            "retrieved_document_id": retrieved_document_id,
+            "last_checked": datetime.now(tz=timezone.utc),
+        }
+        if download.not_modified:
+            # a 304 may omit validators, keep the ones we sent
+            update = {key: value for key, value in update.items() if value is not None}
+
+        await SiteUrlIndex.get_motor_collection().update_one(
+            {"site_id": self.site_id, "url": url}, {"$set": update}, upsert=True
+        )
+
+        entries = await self.load()
+        if entry := entries.get(url):
+            for key, value in update.items():
+                setattr(entry, key, value)
+        else:
+            entries[url] = SiteUrlIndex(site_id=self.site_id, url=url, **update)
@@ -0,0 +1,71 @@
+import logging
+from random import random
+
+import pytest_asyncio
+from beanie import PydanticObjectId
+
+from backend.common.db.init import init_db
+from backend.common.models.url_index import SiteUrlIndex
+from backend.scrapeworker.common.models import DownloadContext, Request
+from backend.scrapeworker.common.url_index import UrlIndex
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def before_each_test():
+    random_name = str(random())
+    await init_db(mock=True, database_name=random_name)
+
+
+def simple_download(url="https://example.com/policy.pdf", **kwargs) -> DownloadContext:
+    return DownloadContext(request=Request(url=url), **kwargs)
+
+
+async def test_record_and_add_validators():
+    site_id = PydanticObjectId()
+    doc_id = PydanticObjectId()
+    download = simple_download()
+    download.response.etag = '"abc"'
+    download.response.last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+    await UrlIndex(site_id, logging.getLogger()).record(download, "checksum", doc_id)
+    assert await SiteUrlIndex.find({"site_id": site_id}).count() == 1
+
+    # a later scrape task loads the persisted entry
+    url_index = UrlIndex(site_id, logging.getLogger())
+    next_download = simple_download()
+    entry = await url_index.add_validators(next_download)
+
+    assert entry and entry.retrieved_document_id == doc_id
+    assert next_download.request.headers["If-None-Match"] == '"abc"'
+    assert next_download.request.headers["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert next_download.file_hash == "checksum"
+
+    url_index.remove_validators(next_download)
+    assert next_download.request.headers == {}
+    assert next_download.file_hash is None
+
+
+async def test_not_modified_keeps_validators():
+    site_id = PydanticObjectId()
+    url_index = UrlIndex(site_id, logging.getLogger())
+    download = simple_download()
+    download.response.etag = '"abc"'
+    await url_index.record(download, "checksum", PydanticObjectId())
+
+    not_modified = simple_download(not_modified=True)
+    await url_index.record(not_modified, "checksum", PydanticObjectId())
+
+    entry = await SiteUrlIndex.find_one({"site_id": site_id})
+    assert entry and entry.etag == '"abc"'
+
+
+async def test_skips_non_get_and_browser_downloads():
+    url_index = UrlIndex(PydanticObjectId(), logging.getLogger())
+    post = DownloadContext(request=Request(url="https://example.com/search", method="POST"))
+    browser = simple_download(playwright_download=True)
+
+    for download in [post, browser]:
+        await url_index.record(download, "checksum", PydanticObjectId())
+        assert await url_index.add_validators(download) is None
+
+    assert await SiteUrlIndex.count() == 0
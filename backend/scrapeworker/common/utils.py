@@ -2,7 +2,6 @@
 import os
 import pathlib
 import re
-import unicodedata
 from html import unescape
 from itertools import groupby
 from typing import Callable
@@ -10,6 +9,8 @@ from urllib.parse import unquote, urljoin, urlparse
 
 import magic
 
+from backend.common.core import text_normalization
+
 
 def compile_date_rgx():
     date_formats = [
@@ -90,6 +91,8 @@ def compile_label_rgx():
 
 
 date_rgxs = compile_date_rgx()
+# every date format starts with a digit or a month, lets one scan find them all quickly
+date_start_rgx = r"\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec"
 label_rgxs = compile_label_rgx()
 quarter_rgxs = compile_qtr_rgx()
 digit_rgx = r"\b\d+\b"
@@ -110,6 +113,18 @@ mimetype_to_extension_map = {
 extension_to_mimetype_map = {v: k for k, v in mimetype_to_extension_map.items()}
 
 supported_extensions = [*mimetype_to_extension_map.values()]
+
+# types a download can be recognised as from its first bytes and that we never parse;
+# zip and ole containers are left alone, they are also how docx, xlsx, doc and xls start
+unsupported_mimetype_prefixes = ("image/", "audio/", "video/", "font/")
+unsupported_mimetypes = [
+    "application/gzip",
+    "application/x-7z-compressed",
+    "application/x-dosexec",
+    "application/x-executable",
+    "application/x-rar",
+    "application/x-tar",
+]
 supported_mimetypes = [*extension_to_mimetype_map.values()]
 
 
@@ -139,6 +154,11 @@ def get_mimetype(file_path: str | None):
     return mime.from_file(file_path)
 
 
+def get_mimetype_from_buffer(data: bytes) -> str:
+    mime = magic.Magic(mime=True)
+    return mime.from_buffer(data)
+
+
 def get_extension_from_file_mimetype(file_path: str | None) -> str | None:
     if file_path is None:
         return None
@@ -206,7 +226,7 @@ def jaccard(a: list, b: list):
 def deburr(input: str = "") -> str:
     if input is None:
         return ""
-    return unicodedata.normalize("NFKD", input).encode("ascii", "ignore").decode()
+    return text_normalization.deburr(input)
 
 
 def normalize_spaces(input: str = "") -> str:
@@ -235,9 +255,9 @@ def normalize_string(input: str | None = "", html=False, url=True, lower=True, s
     # remove or replace non-ascii; ® gets removed while ö is the is replaced by o
     input = deburr(input)
     # replace non meaningful chars with space; the space keeps word boundaries
+    # scrubbing, lowering and trimming in one pass over the text
     if strip:
-        input = scrub_string(input)
-        input = normalize_spaces(input)
+        return text_normalization.scrub(input, lower=lower)
 
     if lower:
         input = input.lower()
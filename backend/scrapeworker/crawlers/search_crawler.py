@@ -1,10 +1,14 @@
+import asyncio
 from dataclasses import dataclass
 from logging import Logger
+from typing import AsyncGenerator
 
 from playwright.async_api import Locator, Page
 
 from backend.common.models.search_codes import SearchCodeSet
 from backend.common.models.site import ScrapeMethodConfiguration
+from backend.common.models.site_scrape_task import SiteScrapeTask
+from backend.scrapeworker.common.rate_limiter import RateLimiter
 from backend.scrapeworker.common.selectors import to_xpath
 from backend.scrapeworker.playbook import PlaybookContext, ScrapePlaybook
 
@@ -18,6 +22,8 @@ class NavState:
 
 
 class SearchableCrawler:
+    # seconds between searches when codes are searched on more than one page
+    pool_wait_between_searches: float = 1
     inside_a_tag_expression: str = """
         (node) => {
             let n = node;
@@ -32,8 +38,14 @@ class SearchableCrawler:
         }
     """
 
-    def __init__(self, config: ScrapeMethodConfiguration, log: Logger) -> None:
+    def __init__(
+        self,
+        config: ScrapeMethodConfiguration,
+        log: Logger,
+        scrape_task: SiteScrapeTask | None = None,
+    ) -> None:
         self.config = config
+        self.scrape_task = scrape_task
         self.input_selector: str | None = (
             to_xpath(config.searchable_input) if config.searchable_input else None
         )
@@ -44,6 +56,8 @@ class SearchableCrawler:
         )
         self.log = log
         self.searchable_playbook = ScrapePlaybook(config.searchable_playbook)
+        # codes searched without errors, whose results are not downloaded yet
+        self.pending_codes: list[str] = []
 
     def _get_prefix_codes(self, search_codes: list[str], prefix_length: int) -> list[str]:
         prefix_codes: set[str] = set()
@@ -124,22 +138,116 @@ class SearchableCrawler:
         else:
             await page.keyboard.press("Enter")
 
-    async def run_searchable(self, page: Page, playbook_context: PlaybookContext):
-        base_url = page.url
+    async def search_code(self, page: Page, code: str):
+        # runs searchable playbook if provided from collection settings
+        await self.run_searchable_playbook(page)
+        await self.__type(page, code)
+        await self.__select(page, code)
+        await self.__search(page)
+
+    async def open_search_page(self, page: Page, base_url: str, playbook_context: PlaybookContext):
+        await page.goto(base_url)
+        await self.replay_playbook(page, playbook_context)
+        await page.wait_for_timeout(self.config.wait_for_timeout_ms)
+
+    async def remaining_codes(self) -> list[str]:
         codes = await self.__codes()
+        if self.scrape_task and self.scrape_task.searched_codes:
+            # resuming a requeued task, skip codes searched by the previous attempt
+            searched_codes = set(self.scrape_task.searched_codes)
+            codes = [code for code in codes if code not in searched_codes]
+        return codes
+
+    def searched(self, code: str):
+        self.pending_codes.append(code)
+
+    def take_searched(self) -> list[str]:
+        codes, self.pending_codes = self.pending_codes, []
+        return codes
+
+    async def checkpoint(self, codes: list[str]):
+        """
+        Records codes whose results were downloaded, so a requeued task does not search them again.
+        """
+        if not self.scrape_task or not codes:
+            return
+        await SiteScrapeTask.get_motor_collection().update_one(
+            {"_id": self.scrape_task.id}, {"$addToSet": {"searched_codes": {"$each": codes}}}
+        )
+
+    async def run_searchable_pool(
+        self, page: Page, playbook_context: PlaybookContext, concurrency: int | None = None
+    ) -> AsyncGenerator[tuple[Page, str], None]:
+        """
+        Searches every code, sharded across `concurrency` pages of the same browser context.
+        Yields the page showing the results of each code; the page is not reused
+        until the caller asks for the next result.
+        """
+        base_url = page.url
+        codes = await self.remaining_codes()
+        concurrency = max(1, min(concurrency or self.config.searchable_concurrency, len(codes)))
+        # a single page searches as fast as it can, a pool shares the site's request budget
+        wait_between_searches = self.pool_wait_between_searches if concurrency > 1 else 0
+        rate_limiter = RateLimiter(wait_between_requests=wait_between_searches)
+
+        code_queue: asyncio.Queue[str] = asyncio.Queue()
         for code in codes:
-            nav_state = NavState()
+            code_queue.put_nowait(code)
+        results: asyncio.Queue[tuple[Page, str, asyncio.Future] | None] = asyncio.Queue()
+
+        async def search_codes(search_page: Page):
+            while not code_queue.empty():
+                code = code_queue.get_nowait()
+                nav_state = NavState()
+                search_page.on("load", nav_state.handle_nav)
+                try:
+                    async for attempt in rate_limiter.attempt_with_backoff(stop_attempts=1):
+                        with attempt:
+                            await self.search_code(search_page, code)
+                    consumed = asyncio.get_running_loop().create_future()
+                    await results.put((search_page, code, consumed))
+                    await consumed
+                except Exception as e:
+                    self.log.error(f"Searchable Execution Error: {e}", exc_info=e)
+                finally:
+                    search_page.remove_listener("load", nav_state.handle_nav)
+                if nav_state.has_navigated or search_page.url != base_url:
+                    await self.open_search_page(search_page, base_url, playbook_context)
+
+        async def run_worker(worker: int):
+            search_page = page
             try:
-                page.on("load", nav_state.handle_nav)
-                # runs searchable playbook if provided from collection settings
-                await self.run_searchable_playbook(page)
-                await self.__type(page, code)
-                await self.__select(page, code)
-                await self.__search(page)
-                yield code
+                if worker > 0:
+                    search_page = await page.context.new_page()
+                    extra_pages.append(search_page)
+                    await self.open_search_page(search_page, base_url, playbook_context)
+                await search_codes(search_page)
             except Exception as e:
-                self.log.error(f"Searchable Execution Error: {e}", exc_info=e)
-            if nav_state.has_navigated or page.url != base_url:
-                await page.goto(base_url)
-                await self.replay_playbook(page, playbook_context)
-                await page.wait_for_timeout(self.config.wait_for_timeout_ms)
+                self.log.error(f"Searchable Worker Error: {e}", exc_info=e)
+            finally:
+                await results.put(None)
+
+        extra_pages: list[Page] = []
+        workers = [asyncio.create_task(run_worker(worker)) for worker in range(concurrency)]
+        try:
+            finished = 0
+            while finished < concurrency:
+                result = await results.get()
+                if result is None:
+                    finished += 1
+                    continue
+                search_page, code, consumed = result
+                try:
+                    yield search_page, code
+                finally:
+                    consumed.set_result(None)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for extra_page in extra_pages:
+                await extra_page.close()
+
+    async def run_searchable(self, page: Page, playbook_context: PlaybookContext):
+        async for _, code in self.run_searchable_pool(page, playbook_context, concurrency=1):
+            yield code
@@ -1,6 +1,14 @@
+from datetime import datetime
+from random import random
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
+import pytest_asyncio
+from beanie import PydanticObjectId
 
+from backend.common.db.init import init_db
 from backend.common.models.site import ScrapeMethodConfiguration
+from backend.common.models.site_scrape_task import SiteScrapeTask
 from backend.scrapeworker.crawlers.search_crawler import SearchableCrawler
 
 
@@ -20,3 +28,102 @@ def test_get_prefix_codes(crawler: SearchableCrawler):
     prefix_codes = crawler._get_prefix_codes(search_codes, prefix_length=3)
     assert len(prefix_codes) == 5
     assert prefix_codes == ["12", "123", "aaa", "aba", "abb"]
+
+
+class FakeSearchPage:
+    def __init__(self, context=None) -> None:
+        self.url = "https://www.example.com/search"
+        self.context = context
+        self.closed = False
+
+    def on(self, event, handler):
+        pass
+
+    def remove_listener(self, event, handler):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[FakeSearchPage] = []
+
+    async def new_page(self):
+        page = FakeSearchPage(self)
+        self.pages.append(page)
+        return page
+
+
+@pytest_asyncio.fixture()
+async def scrape_task():
+    await init_db(mock=True, database_name=str(random()))
+    task = SiteScrapeTask(site_id=PydanticObjectId(), queued_time=datetime.now())
+    await task.save()
+    return task
+
+
+def pool_crawler(scrape_task: SiteScrapeTask, codes: list[str]):
+    config = ScrapeMethodConfiguration(searchable_concurrency=3)
+    search_crawler = SearchableCrawler(config=config, log=MagicMock(), scrape_task=scrape_task)
+    search_crawler.pool_wait_between_searches = 0.01
+    search_crawler._SearchableCrawler__codes = AsyncMock(return_value=codes)
+    search_crawler.search_code = AsyncMock()
+    search_crawler.open_search_page = AsyncMock()
+    return search_crawler
+
+
+@pytest.mark.asyncio
+async def test_run_searchable_pool_shards_codes(scrape_task: SiteScrapeTask):
+    codes = [f"J{i}" for i in range(10)]
+    search_crawler = pool_crawler(scrape_task, codes)
+    context = FakeContext()
+    base_page = FakeSearchPage(context)
+
+    searched: dict[str, FakeSearchPage] = {}
+    async for page, code in search_crawler.run_searchable_pool(base_page, []):
+        searched[code] = page
+
+    assert sorted(searched) == sorted(codes)
+    assert len(context.pages) == 2
+    assert set(searched.values()) == {base_page, *context.pages}
+    assert all(page.closed for page in context.pages)
+    assert not base_page.closed
+
+    # codes are checkpointed by the caller, once their results are downloaded
+    task = await SiteScrapeTask.get(scrape_task.id)
+    assert task.searched_codes == []
+
+
+@pytest.mark.asyncio
+async def test_run_searchable_pool_resumes_from_checkpoint(scrape_task: SiteScrapeTask):
+    scrape_task.searched_codes = ["J0", "J1"]
+    search_crawler = pool_crawler(scrape_task, ["J0", "J1", "J2"])
+
+    searched = [code async for code in search_crawler.run_searchable(FakeSearchPage(), [])]
+
+    assert searched == ["J2"]
+
+
+@pytest.mark.asyncio
+async def test_run_searchable_pool_skips_failed_searches(scrape_task: SiteScrapeTask):
+    search_crawler = pool_crawler(scrape_task, ["J0", "J1", "J2"])
+    search_crawler.search_code = AsyncMock(side_effect=[None, ValueError("timeout"), None])
+
+    searched = [code async for code in search_crawler.run_searchable(FakeSearchPage(), [])]
+
+    assert searched == ["J0", "J2"]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_searched_codes(scrape_task: SiteScrapeTask):
+    search_crawler = pool_crawler(scrape_task, [])
+    search_crawler.searched("J0")
+    search_crawler.searched("J1")
+    await search_crawler.checkpoint(search_crawler.take_searched())
+    await search_crawler.checkpoint(search_crawler.take_searched())
+
+    task = await SiteScrapeTask.get(scrape_task.id)
+    assert task.searched_codes == ["J0", "J1"]
+    assert search_crawler.pending_codes == []
@@ -4,9 +4,9 @@ from pathlib import Path
 from typing import Any, Tuple
 
 import fasttext
-import gensim
 
 from backend.common.core.enums import DocumentType
+from backend.scrapeworker.common.text_features import TextFeatures
 from backend.scrapeworker.doc_type_matcher import DocTypeMatcher
 
 logging.basicConfig(format="%(asctime)s : %(levelname)s : %(message)s", level=logging.INFO)
@@ -18,8 +18,10 @@ def get_model(dir: Path):
     return fasttext.load_model(str(dir.joinpath("./doc_type_model/fasttext_model.bin").resolve()))
 
 
-def classify_doc_type(raw_text: str) -> Tuple[str, float, Any]:
-    clean_text = " ".join(gensim.utils.simple_preprocess(raw_text))
+def classify_doc_type(
+    raw_text: str, text_features: TextFeatures | None = None
+) -> Tuple[str, float, Any]:
+    clean_text = (text_features or TextFeatures(raw_text)).fasttext_input
     fasttext_model = get_model(local_dir)
     vector = fasttext_model.get_sentence_vector(clean_text).tolist()
     prediction, confidence = fasttext_model.predict(clean_text)
@@ -41,6 +43,7 @@ def guess_doc_type(
     raw_url: str | None,
     raw_name: str | None,
     is_searchable: bool = False,
+    text_features: TextFeatures | None = None,
 ) -> Tuple[str, float, Any, Any]:
 
     raw_text = raw_text or ""
@@ -49,13 +52,17 @@ def guess_doc_type(
     raw_name = raw_name or ""
 
     doc_type_match = None
+    # tokenized once, for both the classifier and the rules
+    text_features = text_features or TextFeatures(raw_text)
     # always classify for vectors
-    _doc_type, _confidence, doc_vectors = classify_doc_type(raw_text)
+    _doc_type, _confidence, doc_vectors = classify_doc_type(raw_text, text_features)
 
     if is_searchable:
         doc_type = DocumentType.MedicalCoverageStatus
         confidence = 1
-    elif doc_type_match := DocTypeMatcher(raw_text, raw_link_text, raw_url, raw_name).exec():
+    elif doc_type_match := DocTypeMatcher(
+        raw_text, raw_link_text, raw_url, raw_name, text_features=text_features
+    ).exec():
         doc_type = doc_type_match.document_type
         confidence = doc_type_match.confidence
     else:
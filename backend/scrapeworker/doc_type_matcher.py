@@ -4,6 +4,7 @@ from gensim.utils import simple_preprocess
 
 from backend.common.core.enums import DocumentType
 from backend.common.models.shared import DocTypeMatch, MatchSource
+from backend.scrapeworker.common.text_features import TextFeatures
 from backend.scrapeworker.common.utils import tokenize_filename, tokenize_url
 
 
@@ -15,8 +16,11 @@ class DocTypeMatcher:
         raw_url: str,
         raw_name: str,
         take_count: int = 50,
+        text_features: TextFeatures | None = None,
     ):
         self.matched_rule = None
+        # words of each text, so single word terms are found with a set lookup
+        self.token_sets: dict[str, set[str]] = {}
 
         if raw_url:
             [*path_parts, filename] = tokenize_url(raw_url)
@@ -27,9 +31,11 @@ class DocTypeMatcher:
             self.filename_text = ""
 
         if raw_text:
-            self.doc_tokens = simple_preprocess(raw_text)
-            self.doc_tokens = self.doc_tokens[:take_count]
-            self.doc_text = " ".join(self.doc_tokens).lower()
+            # only the leading tokens are matched, no need to tokenize the whole text
+            text_features = text_features or TextFeatures(raw_text, take_count)
+            self.doc_tokens = text_features.leading_tokens
+            self.doc_text = text_features.leading_text
+            self.token_sets[self.doc_text] = text_features.token_set
         else:
             self.doc_text = ""
 
@@ -53,10 +59,21 @@ class DocTypeMatcher:
                 self.is_pennsylvania = True
                 break
 
+    def _token_set(self, text: str) -> set[str]:
+        if text not in self.token_sets:
+            self.token_sets[text] = set(text.split(" "))
+        return self.token_sets[text]
+
+    def _contains_term(self, text: str, term: str) -> bool:
+        term = term.lower()
+        if " " in term:
+            return f" {text} ".find(f" {term} ") > -1
+        # same as the padded find for a single word
+        return term in self._token_set(text)
+
     def _contains(self, text: str, terms: list[str]) -> bool:
         for term in terms:
-            term = term.lower()
-            if f" {text} ".find(f" {term} ") > -1:
+            if self._contains_term(text, term):
                 return True
         return False
 
@@ -65,8 +82,7 @@ class DocTypeMatcher:
 
     def _contains_all(self, text: str, terms: list[str]) -> bool:
         for term in terms:
-            term = term.lower()
-            if f" {text} ".find(f" {term} ") == -1:
+            if not self._contains_term(text, term):
                 return False
         return True
 
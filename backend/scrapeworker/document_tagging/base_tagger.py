@@ -1,5 +1,7 @@
+import asyncio
 import tempfile
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 
 import spacy
 
@@ -7,6 +9,7 @@ from backend.common.core.enums import SectionType
 from backend.common.models.app_config import AppConfig
 from backend.common.models.site import FocusSectionConfig
 from backend.common.storage.client import ModelStorageClient
+from backend.scrapeworker.document_tagging.span_cache import CachedSpan, page_span_cache
 
 
 class BaseTagger(ABC):
@@ -16,6 +19,8 @@ class BaseTagger(ABC):
     def __init__(self) -> None:
         self.nlp = None
         self.version = None
+        # one worker per model, so different models tag at the same time
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.model_key)
 
     def _filter_focus_configs(self, configs: list[FocusSectionConfig], doc_type: str):
         filtered = [
@@ -49,3 +54,18 @@ class BaseTagger(ABC):
             self.nlp = None
 
         return self.nlp
+
+    async def page_spans(self, nlp, page: str) -> list[CachedSpan]:
+        """Model spans of a page, only running the model on pages it has not seen"""
+        version = str(self.version)
+        key = page_span_cache.key(self.model_key, version, page)
+        spans = await page_span_cache.get(key, version)
+        if spans is None:
+            loop = asyncio.get_running_loop()
+            doc = await loop.run_in_executor(self.executor, nlp, page)
+            spans = [
+                CachedSpan(span.text, span.start_char, span.end_char, span.vocab[span.label].text)
+                for span in doc.spans.get("sc", [])
+            ]
+            await page_span_cache.set(key, version, spans)
+        return spans
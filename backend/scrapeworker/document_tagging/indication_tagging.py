@@ -1,6 +1,6 @@
-import asyncio
-
-from spacy.tokens import Span
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple
 
 from backend.common.core.enums import SectionType
 from backend.common.core.utils import now
@@ -8,7 +8,33 @@ from backend.common.models.doc_document import DocDocument, IndicationTag
 from backend.common.models.document import RetrievedDocument
 from backend.common.models.site import FocusSectionConfig
 from backend.scrapeworker.document_tagging.base_tagger import BaseTagger
-from backend.scrapeworker.document_tagging.tag_focusing import FocusChecker
+from backend.scrapeworker.document_tagging.tag_focusing import (
+    FocusChecker,
+    FocusConfigProvider,
+    TaggingText,
+)
+
+
+class IndicationSpanTag(NamedTuple):
+    """Fields of an `IndicationTag`, cheap to build and deduplicate for every span"""
+
+    name: str
+    text: str
+    page: int
+    code: int
+    focus: bool
+    key: bool = False
+    text_area: tuple[int, int] | None = None
+
+    def materialize(self, created_at: datetime) -> IndicationTag:
+        return IndicationTag(**self._asdict(), created_at=created_at)
+
+
+@lru_cache(100_000)
+def parse_indication_label(label: str) -> tuple[str, str, int]:
+    """Split a `term|name|indication number` label"""
+    term, name, indication_number = label.split("|")
+    return term, name, int(indication_number)
 
 
 class IndicationTagger(BaseTagger):
@@ -23,6 +49,8 @@ class IndicationTagger(BaseTagger):
         link_text: str | None,
         focus_configs: list[FocusSectionConfig] | None = None,
         document: RetrievedDocument | DocDocument | None = None,
+        tagging_text: TaggingText | None = None,
+        focus_config_provider: FocusConfigProvider | None = None,
     ) -> tuple[list[IndicationTag], list[IndicationTag], list[IndicationTag]]:
         nlp = await self.model()
         if not nlp:
@@ -30,57 +58,60 @@ class IndicationTagger(BaseTagger):
         focus_checker: FocusChecker
         if focus_configs:
             focus_configs = self._filter_focus_configs(focus_configs, doc_type)
-            focus_checker = FocusChecker(text, focus_configs, url, link_text, doc_type)
+            focus_checker = FocusChecker(
+                text, focus_configs, url, link_text, doc_type, tagging_text
+            )
         elif document:
             focus_checker = await FocusChecker.with_all_location_configs(
-                document, SectionType.INDICATION, text, url, link_text
+                document,
+                SectionType.INDICATION,
+                text,
+                url,
+                link_text,
+                tagging_text,
+                focus_config_provider,
             )
         else:
             return ([], [], [])
 
-        tags = set()
-        url_tags = set()
-        link_tags = set()
-        pages = text.split("\f")
-        loop = asyncio.get_running_loop()
+        # dicts keep the first occurrence order while deduplicating
+        tags: dict[IndicationSpanTag, None] = {}
+        url_tags: dict[IndicationSpanTag, None] = {}
+        link_tags: dict[IndicationSpanTag, None] = {}
+        pages = tagging_text.pages if tagging_text else text.split("\f")
         char_offset = 0
         for i, page in enumerate(pages):
-            doc = await loop.run_in_executor(None, nlp, page)
-            spans: list[Span] = doc.spans.get("sc", [])
-            for span in spans:
+            for span in await self.page_spans(nlp, page):
                 focus_state = focus_checker.check_focus(span, offset=char_offset)
-                text = span.text
-                lexeme = span.vocab[span.label]
-                term, name, indication_number = lexeme.text.split("|")
+                term, name, indication_number = parse_indication_label(span.label)
 
                 if focus_state.is_in_link_text or focus_state.is_in_url:
-                    context_tag = IndicationTag(
-                        name=name,
-                        text=term,
-                        page=-1,
-                        code=int(indication_number),
-                        focus=focus_state.focus,
-                        created_at=now(),
+                    context_tag = IndicationSpanTag(
+                        name, term, -1, indication_number, focus_state.focus
                     )
                     if focus_state.is_in_link_text:
-                        link_tags.add(context_tag)
+                        link_tags[context_tag] = None
                     if focus_state.is_in_url:
-                        url_tags.add(context_tag)
-
-                tag = IndicationTag(
-                    name=name,
-                    text=term,
-                    page=i,
-                    code=int(indication_number),
-                    focus=focus_state.focus,
-                    key=focus_state.key,
-                    text_area=focus_state.section,
-                    created_at=now(),
+                        url_tags[context_tag] = None
+
+                tag = IndicationSpanTag(
+                    name,
+                    term,
+                    i,
+                    indication_number,
+                    focus_state.focus,
+                    focus_state.key,
+                    focus_state.section,
                 )
-                tags.add(tag)
+                tags[tag] = None
             char_offset += len(page) + 1
 
-        return list(tags), list(url_tags), list(link_tags)
+        created_at = now()
+        return (
+            [tag.materialize(created_at) for tag in tags],
+            [tag.materialize(created_at) for tag in url_tags],
+            [tag.materialize(created_at) for tag in link_tags],
+        )
 
 
 indication_tagger = IndicationTagger()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+
+from backend.common.storage.client import TagCacheStorageClient
+from backend.common.storage.hash import hash_bytes
+from backend.common.storage.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedSpan:
+    """The parts of a spaCy span taggers use, without holding on to its doc"""
+
+    text: str
+    start_char: int
+    end_char: int
+    label: str
+
+
+class PageSpanCache:
+    """
+    Raw model spans per page, keyed by model, model version and a hash of the exact page text,
+    so pages shared between document versions only go through the model once.
+    Recent pages are kept in memory, pinned model versions are also stored in S3.
+    """
+
+    def __init__(self, max_pages: int = 10_000, use_storage: bool = True) -> None:
+        self.max_pages = max_pages
+        self.use_storage = use_storage and bool(settings.tag_cache_path)
+        self.pages: OrderedDict[str, list[CachedSpan]] = OrderedDict()
+        self._client: TagCacheStorageClient | None = None
+
+    @property
+    def client(self) -> TagCacheStorageClient:
+        if not self._client:
+            self._client = TagCacheStorageClient()
+        return self._client
+
+    def key(self, model_key: str, version: str, page: str) -> str:
+        return f"{model_key}/{version}/{hash_bytes(page.encode())}.json"
+
+    def stored(self, version: str) -> bool:
+        # "latest" can point at a different model after a deploy, only cache it in memory
+        return self.use_storage and version != "latest"
+
+    def remember(self, key: str, spans: list[CachedSpan]) -> None:
+        self.pages[key] = spans
+        self.pages.move_to_end(key)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+
+    def read_stored(self, key: str) -> list[CachedSpan] | None:
+        if not self.client.object_exists(key):
+            return None
+        return [CachedSpan(*span) for span in json.loads(self.client.read_object(key))]
+
+    def write_stored(self, key: str, spans: list[CachedSpan]) -> None:
+        self.client.write_object_mem(key, json.dumps([astuple(span) for span in spans]).encode())
+
+    async def get(self, key: str, version: str) -> list[CachedSpan] | None:
+        if key in self.pages:
+            self.pages.move_to_end(key)
+            return self.pages[key]
+        if not self.stored(version):
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            spans = await loop.run_in_executor(None, self.read_stored, key)
+        except Exception:
+            logging.exception("tag cache read failed, caching in memory only")
+            self.use_storage = False
+            return None
+        if spans is not None:
+            self.remember(key, spans)
+        return spans
+
+    async def set(self, key: str, version: str, spans: list[CachedSpan]) -> None:
+        self.remember(key, spans)
+        if not self.stored(version):
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.write_stored, key, spans)
+        except Exception:
+            logging.exception("tag cache write failed, caching in memory only")
+            self.use_storage = False
+
+
+page_span_cache = PageSpanCache()
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.common.models.site import FocusSectionConfig
+from backend.scrapeworker.document_tagging import base_tagger
+from backend.scrapeworker.document_tagging.indication_tagging import IndicationTagger
+from backend.scrapeworker.document_tagging.span_cache import CachedSpan, PageSpanCache
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def object_exists(self, key: str) -> bool:
+        return key in self.objects
+
+    def read_object(self, key: str) -> bytes:
+        return self.objects[key]
+
+    def write_object_mem(self, key: str, object: bytes) -> None:
+        self.objects[key] = object
+
+
+class FakeNlp:
+    """Tags every occurrence of 'asthma' as indication 12"""
+
+    def __init__(self) -> None:
+        self.pages: list[str] = []
+        self.vocab = {"label": SimpleNamespace(text="asthma|Asthma|12")}
+
+    def __call__(self, page: str):
+        self.pages.append(page)
+        spans = []
+        start = page.find("asthma")
+        while start > -1:
+            end = start + len("asthma")
+            spans.append(SimpleNamespace(text="asthma", start_char=start, end_char=end))
+            start = page.find("asthma", end)
+        for span in spans:
+            span.label, span.vocab = "label", self.vocab
+        return SimpleNamespace(spans={"sc": spans})
+
+
+@pytest.mark.asyncio
+async def test_page_span_cache_evicts_oldest_pages():
+    cache = PageSpanCache(max_pages=2, use_storage=False)
+    spans = [CachedSpan("asthma", 0, 6, "asthma|Asthma|12")]
+    keys = [cache.key("indication", "v1", page) for page in ["a", "b", "c"]]
+    assert cache.key("indication", "v2", "a") != keys[0]
+
+    for key in keys:
+        await cache.set(key, "v1", spans)
+
+    assert await cache.get(keys[0], "v1") is None
+    assert await cache.get(keys[2], "v1") == spans
+
+
+@pytest.mark.asyncio
+async def test_page_span_cache_storage():
+    storage = FakeStorage()
+    cache = PageSpanCache()
+    cache.use_storage, cache._client = True, storage
+    spans = [CachedSpan("asthma", 0, 6, "asthma|Asthma|12")]
+
+    await cache.set("pinned", "v1", spans)
+    await cache.set("latest", "latest", spans)
+    assert list(storage.objects) == ["pinned"]
+
+    cache.pages.clear()
+    assert await cache.get("pinned", "v1") == spans
+    assert await cache.get("latest", "latest") is None
+
+
+@pytest.mark.asyncio
+async def test_tagger_only_runs_model_on_new_pages(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(base_tagger, "page_span_cache", PageSpanCache(use_storage=False))
+    nlp = FakeNlp()
+    tagger = IndicationTagger()
+    tagger.version = "v1"
+
+    async def model():
+        return nlp
+
+    monkeypatch.setattr(tagger, "model", model)
+    configs = [FocusSectionConfig(doc_type="Formulary", section_type=[])]
+
+    first_version = "for asthma\fshared page, asthma"
+    tags, _, _ = await tagger.tag_document(first_version, "Formulary", "", "", configs)
+    assert sorted(tag.page for tag in tags) == [0, 1]
+
+    second_version = "changed, asthma\fshared page, asthma"
+    tags, _, _ = await tagger.tag_document(second_version, "Formulary", "", "", configs)
+    assert sorted(tag.page for tag in tags) == [0, 1]
+    assert nlp.pages == ["for asthma", "shared page, asthma", "changed, asthma"]
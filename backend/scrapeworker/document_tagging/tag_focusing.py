@@ -1,12 +1,18 @@
-from bisect import bisect
+import asyncio
+import re
+from bisect import bisect, bisect_left
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Iterable
 
+from beanie import PydanticObjectId
 from spacy.tokens.span import Span
 
 from backend.common.core.enums import DocumentType, SectionType
 from backend.common.models.doc_document import DocDocument
 from backend.common.models.document import RetrievedDocument
 from backend.common.models.site import FocusSectionConfig, Site
+from backend.scrapeworker.document_tagging.span_cache import CachedSpan
 
 
 @dataclass
@@ -30,6 +36,108 @@ class FocusState:
     is_in_link_text: bool = False
 
 
+@lru_cache(256)
+def separators_rgx(separators: tuple[str, ...]) -> re.Pattern:
+    """One pattern matching (empty) at every position any of the separators starts"""
+    alternation = "|".join(re.escape(sep) for sep in sorted(separators, key=len, reverse=True))
+    return re.compile(f"(?=(?:{alternation}))")
+
+
+class FocusConfigProvider:
+    """
+    Focus configs of sites, fetched once and reused for every document of a batch or task.
+    Sites a document is on that are not known yet are fetched together on first use.
+    """
+
+    def __init__(self, sites: Iterable[Site] = ()) -> None:
+        self.site_configs: dict[PydanticObjectId, list[FocusSectionConfig]] = {}
+        self.lock = asyncio.Lock()
+        for site in sites:
+            self.add_site(site)
+
+    def add_site(self, site: Site) -> None:
+        self.site_configs[site.id] = site.scrape_method_configuration.focus_section_configs
+
+    async def prefetch(self, site_ids: Iterable[PydanticObjectId]) -> None:
+        async with self.lock:
+            missing = list({site_id for site_id in site_ids if site_id not in self.site_configs})
+            if not missing:
+                return
+            for site in await Site.find({"_id": {"$in": missing}}).to_list():
+                self.add_site(site)
+            # remember deleted sites too, they would otherwise be queried for every document
+            for site_id in missing:
+                self.site_configs.setdefault(site_id, [])
+
+    async def location_configs(
+        self, doc: RetrievedDocument | DocDocument, tag_type: SectionType | None = None
+    ) -> list[FocusSectionConfig]:
+        """Unique focus configs for all locations on this doc, of any tag type if None"""
+        site_ids = [location.site_id for location in doc.locations]
+        await self.prefetch(site_ids)
+        configs: set[FocusSectionConfig] = set()
+        for site_id in site_ids:
+            configs.update(
+                config
+                for config in self.site_configs[site_id]
+                if config.doc_type == doc.document_type
+                and (tag_type is None or tag_type in config.section_type)
+            )
+        return list(configs)
+
+
+class TaggingText:
+    """
+    Text of a document split once and shared by the taggers and their focus checkers,
+    including the focus configs of the document's sites, which are fetched once for all taggers.
+    """
+
+    def __init__(self, full_text: str) -> None:
+        self.full_text = full_text
+        self.pages = full_text.split("\f")
+        self.location_configs_lock = asyncio.Lock()
+        self._location_configs: list[FocusSectionConfig] | None = None
+        self._separator_positions: dict[tuple[str, ...], dict[str, list[int]]] = {}
+
+    @cached_property
+    def page_starts(self) -> list[int]:
+        char_offsets: list[int] = []
+        current_char_count = 0
+        for page in self.pages:
+            char_offsets.append(current_char_count)
+            current_char_count += len(page) + 1
+        return char_offsets
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.full_text.lower()
+
+    def separator_positions(self, separators: set[str]) -> dict[str, list[int]]:
+        """Sorted start positions of each lowercase separator in the text, from one scan"""
+        key = tuple(sorted(separators))
+        if key not in self._separator_positions:
+            positions: dict[str, list[int]] = {sep: [] for sep in key}
+            if key:
+                text_lower = self.text_lower
+                for match in separators_rgx(key).finditer(text_lower):
+                    start = match.start()
+                    for sep in key:
+                        if text_lower.startswith(sep, start):
+                            positions[sep].append(start)
+            self._separator_positions[key] = positions
+        return self._separator_positions[key]
+
+    async def location_configs(
+        self, doc: RetrievedDocument | DocDocument, provider: FocusConfigProvider | None = None
+    ) -> list[FocusSectionConfig]:
+        async with self.location_configs_lock:
+            if self._location_configs is None:
+                self._location_configs = await FocusChecker._location_focus_configs(
+                    doc, None, provider
+                )
+        return self._location_configs
+
+
 class FocusChecker:
     def __init__(
         self,
@@ -38,26 +146,19 @@ class FocusChecker:
         url: str,
         link_text: str | None,
         doc_type: str | None = None,
+        text: TaggingText | None = None,
     ) -> None:
         self.full_text = full_text
+        self.text = text or TaggingText(full_text)
         self.focus_configs = focus_configs
         self.url = url
         self.link_text = link_text
         self.all_focus = self._check_all_focus(doc_type)
         self.focus_areas: list[FocusArea] = []
         self.key_areas: list[FocusArea] = []
-        self.page_starts = self.get_page_starts()
+        self.page_starts = self.text.page_starts
         self.set_section_areas()
 
-    def get_page_starts(self):
-        pages = self.full_text.split("\f")
-        char_offsets: list[int] = []
-        current_char_count = 0
-        for page in pages:
-            char_offsets.append(current_char_count)
-            current_char_count += len(page) + 1
-        return char_offsets
-
     def _check_all_focus(self, doc_type: str | None):
         all_focus_doc_types = [
             DocumentType.Formulary,
@@ -75,21 +176,14 @@ class FocusChecker:
 
     @staticmethod
     async def _location_focus_configs(
-        doc: RetrievedDocument | DocDocument, tag_type: SectionType
+        doc: RetrievedDocument | DocDocument,
+        tag_type: SectionType | None = None,
+        provider: FocusConfigProvider | None = None,
     ) -> list[FocusSectionConfig]:
-        """Get unique focus configs for all locations on this doc"""
-        site_ids = [location.site_id for location in doc.locations]
-        sites = await Site.find({"_id": {"$in": site_ids}}).to_list()
-        configs: set[FocusSectionConfig] = set()
-        for site in sites:
-            filtered_configs = [
-                config
-                for config in site.scrape_method_configuration.focus_section_configs
-                if config.doc_type == doc.document_type and tag_type in config.section_type
-            ]
-            configs.update(filtered_configs)
-
-        return list(configs)
+        """Get unique focus configs for all locations on this doc, of any tag type if None.
+        Without a provider the doc's sites are queried every call."""
+        provider = provider or FocusConfigProvider()
+        return await provider.location_configs(doc, tag_type)
 
     @classmethod
     async def with_all_location_configs(
@@ -99,10 +193,18 @@ class FocusChecker:
         full_text: str,
         url: str,
         link_text: str | None,
+        text: TaggingText | None = None,
+        provider: FocusConfigProvider | None = None,
     ) -> "FocusChecker":
         """`FocusChecker` with all location's focus configs"""
-        focus_configs = await cls._location_focus_configs(doc, tag_type)
-        return cls(full_text, focus_configs, url, link_text, doc.document_type)
+        if text:
+            location_configs = await text.location_configs(doc, provider)
+            focus_configs = [
+                config for config in location_configs if tag_type in config.section_type
+            ]
+        else:
+            focus_configs = await cls._location_focus_configs(doc, tag_type, provider)
+        return cls(full_text, focus_configs, url, link_text, doc.document_type, text)
 
     def set_section_end(self, focus_areas: list[FocusArea]):
         for i, area in enumerate(focus_areas):
@@ -113,7 +215,20 @@ class FocusChecker:
         focus_areas: list[FocusArea] = []
         key_areas: list[FocusArea] = []
         doc_end = len(self.full_text)
-        text_lower = self.full_text.lower()
+        separators = {
+            separator.lower()
+            for config in self.focus_configs
+            for separator in [config.start_separator, config.end_separator]
+            if separator
+        }
+        positions = self.text.separator_positions(separators)
+
+        def find(separator: str, start: int) -> int:
+            # same as text_lower.find(separator, start)
+            separator_positions = positions[separator.lower()]
+            index = bisect_left(separator_positions, start)
+            return separator_positions[index] if index < len(separator_positions) else -1
+
         for config in self.focus_configs:
             is_key_area = SectionType.KEY in config.section_type
             last_match = 0
@@ -124,7 +239,7 @@ class FocusChecker:
                 if last_match == 0 and start_sep_is_new_page:
                     match = 0
                 elif config.start_separator:
-                    match = text_lower.find(config.start_separator.lower(), last_match)
+                    match = find(config.start_separator, last_match)
                 else:
                     match = 0
 
@@ -133,7 +248,7 @@ class FocusChecker:
                         start = match + len(config.start_separator)
                     end = doc_end
                     if config.end_separator:
-                        end_match = text_lower.find(config.end_separator.lower(), start)
+                        end_match = find(config.end_separator, start)
                         end = end_match if end_match > -1 else end
                     current_page = bisect(self.page_starts, start) - 1
                     focus_area = FocusArea(
@@ -145,7 +260,8 @@ class FocusChecker:
                     else:
                         focus_areas.append(focus_area)
                     last_match = end
-                    if not config.start_separator:
+                    # an empty document with a new page separator would never move on
+                    if not config.start_separator or end <= match:
                         break
                 else:
                     break
@@ -163,7 +279,7 @@ class FocusChecker:
         self.focus_areas = focus_areas
         self.key_areas = key_areas
 
-    def _get_sections(self, span: Span, offset: int):
+    def _get_sections(self, span: Span | CachedSpan, offset: int):
         key_area: FocusArea | None = None
         focus_area: FocusArea | None = None
         section: tuple[int, int] | None = None
@@ -189,7 +305,7 @@ class FocusChecker:
 
         return key_area, focus_area, section
 
-    def check_focus(self, span: Span, offset: int) -> FocusState:
+    def check_focus(self, span: Span | CachedSpan, offset: int) -> FocusState:
         """Check span tag for focus state.
         If tag is in key area, it is a key tag."""
         key_area, focus_area, section = self._get_sections(span, offset)
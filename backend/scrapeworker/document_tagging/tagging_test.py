@@ -1,3 +1,5 @@
+import asyncio
+import re
 from datetime import datetime
 from random import random
 
@@ -8,8 +10,13 @@ from backend.common.core.enums import DocumentType, ScrapeMethod, SectionType
 from backend.common.db.init import init_db
 from backend.common.models.document import RetrievedDocument, RetrievedDocumentLocation
 from backend.common.models.site import FocusSectionConfig, ScrapeMethodConfiguration, Site
-from backend.scrapeworker.document_tagging.tag_focusing import FocusArea, FocusState
-from backend.scrapeworker.document_tagging.therapy_tagging import FocusChecker
+from backend.scrapeworker.document_tagging.tag_focusing import FocusArea, FocusState, TaggingText
+from backend.scrapeworker.document_tagging.therapy_tagging import (
+    FocusChecker,
+    FocusConfigProvider,
+    TherapySpanTag,
+    parse_therapy_label,
+)
 
 
 @pytest_asyncio.fixture()
@@ -275,6 +282,37 @@ class TestCheckFocus:
             section = focus_areas[i].end, focus_areas[i].section_end
             assert focus_state == FocusState(focus=True, key=False, section=section)
 
+    def test_overlapping_separators(self):
+        # "authorization" also starts inside "prior authorization group"
+        config = simple_focus_config()
+        config.start_separator = "Prior Authorization Group"
+        config.end_separator = "Drug Names"
+        config_two = simple_focus_config()
+        config_two.start_separator = "Authorization"
+        config_two.end_separator = "Group"
+        focus_checker = FocusChecker(test_text, [config, config_two], "", None)
+
+        text_lower = test_text.lower()
+        positions = focus_checker.text.separator_positions(
+            {"prior authorization group", "authorization", "group", "drug names"}
+        )
+        for separator, starts in positions.items():
+            assert starts == [m.start() for m in re.finditer(re.escape(separator), text_lower)]
+        areas = [test_text[a.start : a.end] for a in focus_checker.focus_areas]  # noqa: E203
+        assert areas == [
+            " ",
+            " ACITRETIN\n    ",
+            " ",
+            " ADAPALENE\n    ",
+        ]
+
+    def test_empty_text_new_page_separator(self):
+        config = simple_focus_config()
+        config.start_separator = "\f"
+        config.end_separator = None
+        focus_checker = FocusChecker("", [config], "", None)
+        assert len(focus_checker.focus_areas) == 1
+
     def test_get_no_focus_areas(self):
         url = "www.test.com"
         link_text = "Download"
@@ -405,3 +443,88 @@ class TestCheckFocus:
             doc, tag_type=SectionType.INDICATION
         )
         assert len(all_configs) == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_tagging_text(self, new_db, monkeypatch: pytest.MonkeyPatch):
+        therapy_config = simple_focus_config()
+        therapy_config.section_type = [SectionType.THERAPY]
+        indication_config = simple_focus_config()
+        indication_config.section_type = [SectionType.INDICATION]
+        site1 = await simple_site(focus_configs=[therapy_config])
+        site2 = await simple_site(focus_configs=[indication_config])
+        doc = await simple_ret_doc(site1, site2).save()
+
+        queries = []
+        location_focus_configs = FocusChecker._location_focus_configs
+
+        async def count_queries(*args):
+            queries.append(args)
+            return await location_focus_configs(*args)
+
+        monkeypatch.setattr(FocusChecker, "_location_focus_configs", count_queries)
+        url = "www.test.com"
+        link_text = "test"
+        tagging_text = TaggingText(test_text)
+        checkers = await asyncio.gather(
+            *[
+                FocusChecker.with_all_location_configs(
+                    doc, tag_type, test_text, url, link_text, tagging_text
+                )
+                for tag_type in [SectionType.THERAPY, SectionType.INDICATION]
+            ]
+        )
+
+        assert len(queries) == 1
+        assert [
+            [list(config.section_type) for config in checker.focus_configs] for checker in checkers
+        ] == [[[SectionType.THERAPY]], [[SectionType.INDICATION]]]
+        assert all(checker.page_starts is tagging_text.page_starts for checker in checkers)
+
+    @pytest.mark.asyncio
+    async def test_focus_config_provider(self, new_db, monkeypatch: pytest.MonkeyPatch):
+        therapy_config = simple_focus_config()
+        therapy_config.section_type = [SectionType.THERAPY]
+        indication_config = simple_focus_config()
+        indication_config.section_type = [SectionType.INDICATION]
+        site1 = await simple_site(focus_configs=[therapy_config])
+        site2 = await simple_site(focus_configs=[indication_config])
+        docs = [await simple_ret_doc(site1, site2).save() for _ in range(3)]
+
+        queries = []
+        find = Site.find
+
+        def count_queries(*args, **kwargs):
+            queries.append(args)
+            return find(*args, **kwargs)
+
+        monkeypatch.setattr(Site, "find", count_queries)
+        provider = FocusConfigProvider([site1])
+        for doc in docs:
+            for tag_type in [SectionType.THERAPY, SectionType.INDICATION]:
+                checker = await FocusChecker.with_all_location_configs(
+                    doc, tag_type, test_text, "", None, provider=provider
+                )
+                assert [list(config.section_type) for config in checker.focus_configs] == [
+                    [tag_type]
+                ]
+
+        # only the site not given up front is fetched, once for every doc
+        assert queries == [({"_id": {"$in": [site2.id]}},)]
+
+
+def test_parse_therapy_label():
+    assert parse_therapy_label("D123|Drug") == ("D123", None, "Drug", 0)
+    assert parse_therapy_label("D123:2|4567|Drug") == ("D123", "4567", "Drug", 2)
+    assert parse_therapy_label("D123||Drug") == ("D123", None, "Drug", 0)
+
+
+def test_span_tags_deduplicate_before_materializing():
+    created_at = datetime.now()
+    first = TherapySpanTag("drug", "D123", None, "Drug", 0, True, 0, False, (0, 10))
+    second = TherapySpanTag("drug", "D123", None, "Drug", 0, True, 0, False, (0, 10))
+    tags = {first: None, second: None}
+
+    materialized = [tag.materialize(created_at) for tag in tags]
+    assert len(materialized) == 1
+    assert materialized[0].text_area == (0, 10)
+    assert materialized[0].created_at == created_at
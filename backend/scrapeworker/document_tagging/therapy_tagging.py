@@ -1,27 +1,65 @@
-import asyncio
-from functools import cached_property
+from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-
-from spacy.tokens.span import Span
+from typing import NamedTuple
 
 from backend.common.core.enums import SectionType
+from backend.common.core.text_normalization import char_table
 from backend.common.core.utils import now
 from backend.common.models.doc_document import DocDocument, TherapyTag
 from backend.common.models.document import RetrievedDocument
 from backend.common.models.site import FocusSectionConfig
 from backend.scrapeworker.document_tagging.base_tagger import BaseTagger
-from backend.scrapeworker.document_tagging.tag_focusing import FocusChecker
+from backend.scrapeworker.document_tagging.span_cache import CachedSpan
+from backend.scrapeworker.document_tagging.tag_focusing import (
+    FocusChecker,
+    FocusConfigProvider,
+    TaggingText,
+)
 
 SPECIAL_CHARACTERS = [
     "\u00AE",
     "\u2122",
-    "\24C7",
+    "\u24C7",
     "\u2020",
     "\u271D",
     "\u002A",
     "\u2038",
     "\uf0e2",
 ]
+special_characters_table = char_table(SPECIAL_CHARACTERS)
+
+
+class TherapySpanTag(NamedTuple):
+    """Fields of a `TherapyTag`, cheap to build and deduplicate for every span"""
+
+    text: str
+    code: str
+    rxcui: str | None
+    name: str
+    page: int
+    focus: bool
+    priority: int
+    key: bool = False
+    text_area: tuple[int, int] | None = None
+
+    def materialize(self, created_at: datetime) -> TherapyTag:
+        return TherapyTag(**self._asdict(), created_at=created_at)
+
+
+@lru_cache(100_000)
+def parse_therapy_label(label: str) -> tuple[str, str | None, str, int]:
+    """Split a `drugid[:priority]|[rxcui|]display name` label"""
+    splits = label.split("|")
+    rxcui, drugid, display_name, priority = "", "", "", 0
+    if len(splits) == 2:
+        drugid, display_name = splits
+    elif len(splits) == 3:
+        drugid, rxcui, display_name = splits
+    if ":" in drugid:
+        drugid, priority_str = drugid.split(":")
+        priority = int(priority_str)
+    return drugid, rxcui or None, display_name, priority
 
 
 class TherapyTagger(BaseTagger):
@@ -34,9 +72,8 @@ class TherapyTagger(BaseTagger):
         return {line.strip() for line in open(common_words_path)}
 
     def clean_page(self, page: str):
-        for symbol in SPECIAL_CHARACTERS:
-            page = page.replace(symbol, " ")
-        return page
+        # one char for one char, span offsets still match the uncleaned page
+        return page.translate(special_characters_table)
 
     async def tag_document(
         self,
@@ -46,82 +83,76 @@ class TherapyTagger(BaseTagger):
         link_text: str | None,
         focus_configs: list[FocusSectionConfig] | None = None,
         document: RetrievedDocument | DocDocument | None = None,
+        tagging_text: TaggingText | None = None,
+        focus_config_provider: FocusConfigProvider | None = None,
     ) -> tuple[list[TherapyTag], list[TherapyTag], list[TherapyTag]]:
         nlp = await self.model()
         if not nlp:
             return ([], [], [])
         if focus_configs is not None:
             focus_configs = self._filter_focus_configs(focus_configs, doc_type)
-            focus_checker = FocusChecker(full_text, focus_configs, url, link_text, doc_type)
+            focus_checker = FocusChecker(
+                full_text, focus_configs, url, link_text, doc_type, tagging_text
+            )
         elif document:
             focus_checker = await FocusChecker.with_all_location_configs(
-                document, SectionType.THERAPY, full_text, url, link_text
+                document,
+                SectionType.THERAPY,
+                full_text,
+                url,
+                link_text,
+                tagging_text,
+                focus_config_provider,
             )
         else:
             return ([], [], [])
 
-        tags: set[TherapyTag] = set()
-        url_tags = set()
-        link_tags = set()
-        pages = full_text.split("\f")
-        loop = asyncio.get_running_loop()
+        # dicts keep the first occurrence order while deduplicating
+        tags: dict[TherapySpanTag, None] = {}
+        url_tags: dict[TherapySpanTag, None] = {}
+        link_tags: dict[TherapySpanTag, None] = {}
+        pages = tagging_text.pages if tagging_text else full_text.split("\f")
         char_offset = 0
         for i, page in enumerate(pages):
             page = self.clean_page(page)
-            doc = await loop.run_in_executor(None, nlp, page)
-            span: Span
-            for span in doc.spans.get("sc", []):
+            span: CachedSpan
+            for span in await self.page_spans(nlp, page):
                 text = span.text
                 if text.lower() in self.common_words:
                     continue
 
                 focus_state = focus_checker.check_focus(span, offset=char_offset)
-                lexeme = span.vocab[span.label]
-                splits = lexeme.text.split("|")
-                rxcui, drugid, display_name, priority = "", "", "", 0
-                if len(splits) == 2:
-                    drugid, display_name = splits
-                elif len(splits) == 3:
-                    drugid, rxcui, display_name = splits
-                if ":" in drugid:
-                    drugid, priority_str = drugid.split(":")
-                    priority = int(priority_str)
-                if not rxcui:
-                    rxcui = None
+                drugid, rxcui, display_name, priority = parse_therapy_label(span.label)
 
                 if focus_state.is_in_link_text or focus_state.is_in_url:
-                    context_tag = TherapyTag(
-                        text=text.lower(),
-                        code=drugid,
-                        rxcui=rxcui,
-                        name=display_name,
-                        page=-1,
-                        focus=focus_state.focus,
-                        priority=priority,
-                        created_at=now(),
+                    context_tag = TherapySpanTag(
+                        text.lower(), drugid, rxcui, display_name, -1, focus_state.focus, priority
                     )
-
                     if focus_state.is_in_link_text:
-                        link_tags.add(context_tag)
+                        link_tags[context_tag] = None
                     if focus_state.is_in_url:
-                        url_tags.add(context_tag)
-
-                tag = TherapyTag(
-                    text=text,
-                    code=drugid,
-                    rxcui=rxcui,
-                    name=display_name,
-                    page=i,
-                    focus=focus_state.focus,
-                    key=focus_state.key,
-                    priority=priority,
-                    text_area=focus_state.section,
-                    created_at=now(),
+                        url_tags[context_tag] = None
+
+                tag = TherapySpanTag(
+                    text,
+                    drugid,
+                    rxcui,
+                    display_name,
+                    i,
+                    focus_state.focus,
+                    priority,
+                    focus_state.key,
+                    focus_state.section,
                 )
-                tags.add(tag)
+                tags[tag] = None
             char_offset += len(page) + 1
 
-        return list(tags), list(url_tags), list(link_tags)
+        created_at = now()
+        return (
+            [tag.materialize(created_at) for tag in tags],
+            [tag.materialize(created_at) for tag in url_tags],
+            [tag.materialize(created_at) for tag in link_tags],
+        )
 
 
 therapy_tagger = TherapyTagger()
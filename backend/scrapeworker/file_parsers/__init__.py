@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any
 
 from backend.common.models.doc_document import DocDocument
 from backend.common.models.site import FocusSectionConfig, ScrapeMethodConfiguration
 from backend.scrapeworker.common.models import DownloadContext
+from backend.scrapeworker.document_tagging.tag_focusing import TaggingText
 from backend.scrapeworker.document_tagging.taggers import Taggers, indication_tagger, therapy_tagger
 from backend.scrapeworker.file_parsers import doc, docx, html, pdf, text, xls, xlsx
 
@@ -63,25 +65,30 @@ async def get_tags(
         if document and document.document_type
         else parsed_content["document_type"]
     )
-    (therapy_tags, url_therapy_tags, link_therapy_tags) = await taggers.therapy.tag_document(
-        parsed_content["text"],
-        doc_type,
-        parsed_content["scrubbed_url"],
-        parsed_content["scrubbed_link_text"],
-        focus_configs,
-        document,
-    )
+    # both models tag at once, sharing the page split and the location focus configs
+    tagging_text = TaggingText(parsed_content["text"])
     (
-        indication_tags,
-        url_indication_tags,
-        link_indication_tags,
-    ) = await taggers.indication.tag_document(
-        parsed_content["text"],
-        doc_type,
-        parsed_content["scrubbed_url"],
-        parsed_content["scrubbed_link_text"],
-        focus_configs,
-        document,
+        (therapy_tags, url_therapy_tags, link_therapy_tags),
+        (indication_tags, url_indication_tags, link_indication_tags),
+    ) = await asyncio.gather(
+        taggers.therapy.tag_document(
+            parsed_content["text"],
+            doc_type,
+            parsed_content["scrubbed_url"],
+            parsed_content["scrubbed_link_text"],
+            focus_configs,
+            document,
+            tagging_text,
+        ),
+        taggers.indication.tag_document(
+            parsed_content["text"],
+            doc_type,
+            parsed_content["scrubbed_url"],
+            parsed_content["scrubbed_link_text"],
+            focus_configs,
+            document,
+            tagging_text,
+        ),
     )
 
     parsed_content["therapy_tags"] = therapy_tags
@@ -9,6 +9,7 @@ from backend.common.models.site import ScrapeMethodConfiguration
 from backend.scrapeworker.common.date_parser import DateParser
 from backend.scrapeworker.common.detect_lang import detect_lang
 from backend.scrapeworker.common.models import DownloadContext
+from backend.scrapeworker.common.text_features import TextFeatures
 from backend.scrapeworker.common.utils import date_rgxs, label_rgxs, normalize_string
 from backend.scrapeworker.doc_type_classifier import guess_doc_type
 
@@ -59,11 +60,12 @@ class FileParser(ABC):
         self.metadata = await self.get_info()
         self.text = await self.get_text()
         self.images = await self.get_images()
+        self.text_features = TextFeatures(self.text)
         title = self.get_title(self.metadata)
 
         is_searchable = self.download.is_searchable if self.download else False
         document_type, confidence, doc_vectors, doc_type_match = guess_doc_type(
-            self.text, self.link_text, self.url, title, is_searchable
+            self.text, self.link_text, self.url, title, is_searchable, self.text_features
         )
         lang_code = detect_lang(self.text)
 
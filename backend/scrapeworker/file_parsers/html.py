@@ -3,10 +3,16 @@ import re
 
 import bs4
 
+from backend.common.core.enums import HtmlParserBackend
 from backend.scrapeworker.file_parsers.base import FileParser
 
 
 class HtmlParser(FileParser):
+    @property
+    def html_parser(self) -> HtmlParserBackend:
+        if self.scrape_method_config:
+            return self.scrape_method_config.html_parser
+        return HtmlParserBackend.Python
 
     # TODO ask if our text has to match the old style...
     # that SO answer was from a decade ago. BS has been updated since then..
@@ -16,7 +22,7 @@ class HtmlParser(FileParser):
         # taggers assign tags by page, but html lacks pages
         # when converted to pdf later, all tags are marked as page 1
         document_bytes = await self.read_text_file(encoding="iso-8859-1")
-        self.soup = bs4.BeautifulSoup(document_bytes, features="html.parser")
+        self.soup = bs4.BeautifulSoup(document_bytes, features=self.html_parser.value)
 
         title_element = self.soup.find("title")
         self.title = (
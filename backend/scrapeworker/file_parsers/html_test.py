@@ -3,6 +3,8 @@ import os
 import aiofiles
 import pytest
 
+from backend.common.core.enums import HtmlParserBackend
+from backend.common.models.site import AttrSelector, ScrapeMethodConfiguration
 from backend.scrapeworker.file_parsers import html
 
 current_path = os.path.dirname(os.path.realpath(__file__))
@@ -22,3 +24,26 @@ async def test_html():
 
     assert parser.text == expected_text
     assert parser.metadata == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("html_parser", list(HtmlParserBackend))
+async def test_html_parser_backends(html_parser: HtmlParserBackend):
+    file_path = os.path.join(fixture_path, "test.html")
+    expected_path = os.path.join(fixture_path, "test_html.txt")
+
+    async with aiofiles.open(expected_path, mode="r") as file:
+        expected_text = await file.read()
+
+    config = ScrapeMethodConfiguration(html_parser=html_parser)
+    parser = html.HtmlParser(file_path, url=file_path, scrape_method_config=config)
+    assert await parser.get_text() == expected_text
+
+    exclusions = [AttrSelector(attr_element="ul", attr_name="class", attr_value="agencynav")]
+    texts = []
+    for backend in [HtmlParserBackend.Python, html_parser]:
+        config = ScrapeMethodConfiguration(html_parser=backend, html_exclusion_selectors=exclusions)
+        parser = html.HtmlParser(file_path, url=file_path, scrape_method_config=config)
+        texts.append(await parser.get_text())
+    assert len(texts[0]) < len(expected_text)
+    assert texts[0] == texts[1]
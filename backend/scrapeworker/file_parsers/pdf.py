@@ -1,7 +1,10 @@
 import asyncio
+import logging
 import os
 import random
 import string
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
@@ -9,11 +12,132 @@ import fitz
 import pytesseract
 from PIL import Image, ImageOps
 
+from backend.common.core.enums import PdfParserBackend
 from backend.scrapeworker.file_parsers.base import FileParser
 
+# pdfimages -raw file extensions, other filters are written decoded
+raw_image_extensions = {
+    "FlateDecode": "flate",
+    "DCTDecode": "jpg",
+    "JPXDecode": "jp2",
+    "JBIG2Decode": "jb2e",
+    "CCITTFaxDecode": "ccitt",
+}
+# only clip to the page, leaving out TEXT_PRESERVE_LIGATURES and TEXT_PRESERVE_WHITESPACE
+# expands ligatures and turns tabs and odd spaces into plain spaces, like pdftotext does
+mupdf_text_flags = fitz.TEXT_MEDIABOX_CLIP
+
+
+@dataclass
+class PdfContent:
+    metadata: dict[str, str] = field(default_factory=dict)
+    text: str = ""
+    images: list[Path] = field(default_factory=list)
+
+
+def format_pdf_date(value: str) -> str:
+    # D:20220201085249-06'00' -> Tue Feb  1 14:52:49 2022 UTC, the way pdfinfo prints it
+    value = value.removeprefix("D:").replace("'", "")
+    if value.endswith("Z"):
+        value = value[:-1] + "+0000"
+    try:
+        date = datetime.strptime(value, "%Y%m%d%H%M%S%z").astimezone(timezone.utc)
+    except ValueError:
+        return value
+    return f"{date:%a %b} {date.day:2d} {date:%H:%M:%S %Y} UTC"
+
 
 class PdfParse(FileParser):
+    def __init__(self, *args, **kwargs):
+        super(PdfParse, self).__init__(*args, **kwargs)
+        self.content: PdfContent | None = None
+        self.use_mupdf = bool(
+            self.scrape_method_config
+            and self.scrape_method_config.pdf_parser == PdfParserBackend.MuPdf
+        )
+
+    async def get_mupdf_content(self) -> PdfContent | None:
+        """
+        Extract metadata, text and images from one open of the document, in a thread.
+        Returns None if PyMuPDF is not selected or failed, so poppler is used instead.
+        """
+        if not self.use_mupdf:
+            return None
+        if not self.content:
+            loop = asyncio.get_running_loop()
+            try:
+                self.content = await loop.run_in_executor(None, self.extract_with_mupdf)
+            except Exception:
+                logging.exception(f"PyMuPDF failed on {self.url}, falling back to poppler")
+                self.use_mupdf = False
+        return self.content
+
+    def extract_with_mupdf(self) -> PdfContent:
+        with fitz.open(self.file_path) as doc:  # type: ignore
+            content = PdfContent(metadata=self.mupdf_info(doc))
+            pages = []
+            for page in doc:
+                lines = page.get_text("text", flags=mupdf_text_flags).splitlines()
+                pages.append("\n".join(line.rstrip() for line in lines if line.strip()))
+            content.text = "\n\f".join(pages).strip() or self.attempt_ocr(doc)
+            content.images = self.mupdf_images(doc)
+        return content
+
+    def mupdf_info(self, doc: fitz.Document) -> dict[str, str]:
+        # keys and formats of pdfinfo output
+        metadata: dict[str, str] = {}
+        fields = [
+            ("Title", "title"),
+            ("Subject", "subject"),
+            ("Keywords", "keywords"),
+            ("Author", "author"),
+            ("Creator", "creator"),
+            ("Producer", "producer"),
+        ]
+        doc_metadata = doc.metadata or {}
+        for key, mupdf_key in fields:
+            if value := doc_metadata.get(mupdf_key):
+                metadata[key] = value.strip()
+        for key, mupdf_key in [("CreationDate", "creationDate"), ("ModDate", "modDate")]:
+            if value := doc_metadata.get(mupdf_key):
+                metadata[key] = format_pdf_date(value)
+        metadata["Pages"] = str(doc.page_count)
+        encrypted = doc.is_encrypted or doc_metadata.get("encryption")
+        metadata["Encrypted"] = "yes" if encrypted else "no"
+        if doc.page_count:
+            rect = doc[0].rect
+            metadata["Page size"] = f"{rect.width:g} x {rect.height:g} pts"
+            metadata["Page rot"] = str(doc[0].rotation)
+        metadata["File size"] = f"{os.path.getsize(self.file_path)} bytes"
+        metadata["PDF version"] = doc_metadata.get("format", "").removeprefix("PDF ")
+        return metadata
+
+    def mupdf_images(self, doc: fitz.Document) -> list[Path]:
+        # same files as pdfimages -raw: encoded stream bytes, one per drawn image, in draw order
+        root_dir = Path(self.file_path).parent
+        prefix = "".join(random.choices(string.ascii_uppercase, k=32))
+        file_prefix = f"{prefix}-image-tmp"
+        images: list[Path] = []
+        for page in doc:
+            for info in page.get_image_info(xrefs=True):
+                xref = info["xref"]
+                if not xref:
+                    continue
+                image_filter = doc.xref_get_key(xref, "Filter")[1].lstrip("/")
+                if extension := raw_image_extensions.get(image_filter):
+                    image_bytes = doc.xref_stream_raw(xref)
+                else:
+                    image = doc.extract_image(xref)
+                    extension, image_bytes = image["ext"], image["image"]
+                image_path = root_dir / f"{file_prefix}-{len(images):03d}.{extension}"
+                image_path.write_bytes(image_bytes)
+                images.append(image_path)
+        return images
+
     async def get_info(self) -> dict[str, str]:
+        if content := await self.get_mupdf_content():
+            return content.metadata
+
         process = await asyncio.create_subprocess_exec(
             "pdfinfo",
             "-enc",
@@ -39,6 +163,9 @@ class PdfParse(FileParser):
         return metadata
 
     async def get_text(self):
+        if content := await self.get_mupdf_content():
+            return content.text
+
         process = await asyncio.create_subprocess_exec(
             "pdftotext",
             "-raw",
@@ -56,7 +183,7 @@ class PdfParse(FileParser):
             text = self.attempt_ocr()
         return text
 
-    def attempt_ocr(self):
+    def attempt_ocr(self, doc: fitz.Document | None = None):
         if not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0:
             return ""
 
@@ -65,7 +192,7 @@ class PdfParse(FileParser):
         matrix = fitz.Matrix(2, 2)
 
         pages = []
-        doc = fitz.open(self.file_path)  # type: ignore
+        doc = doc or fitz.open(self.file_path)  # type: ignore
         for page in doc:
             pix = page.get_pixmap(matrix=matrix)
             im = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
@@ -75,6 +202,9 @@ class PdfParse(FileParser):
         return "\f".join(pages).strip()
 
     async def get_images(self):
+        if content := await self.get_mupdf_content():
+            return content.images
+
         root_dir = Path(self.file_path).parent
         prefix = "".join(random.choices(string.ascii_uppercase, k=32))
         file_prefix = f"{prefix}-image-tmp"
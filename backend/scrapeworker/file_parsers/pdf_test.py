@@ -1,7 +1,10 @@
 import os
+import shutil
 
 import pytest
 
+from backend.common.core.enums import PdfParserBackend
+from backend.common.models.site import ScrapeMethodConfiguration
 from backend.scrapeworker.file_parsers import pdf
 
 current_path = os.path.dirname(os.path.realpath(__file__))
@@ -27,3 +30,47 @@ async def test_ocr():
     parser = pdf.PdfParse(file_path, url=file_path)
     await parser.parse()
     assert "PREFERRED BRAND NAME DRUG LIST" in parser.result["text"]
+
+
+def mupdf_config():
+    return ScrapeMethodConfiguration(pdf_parser=PdfParserBackend.MuPdf)
+
+
+@pytest.mark.asyncio
+async def test_mupdf_backend(tmp_path):
+    file_path = tmp_path / "test_tm.pdf"
+    shutil.copy(os.path.join(fixture_path, "test_tm.pdf"), file_path)
+
+    parser = pdf.PdfParse(str(file_path), url=str(file_path), scrape_method_config=mupdf_config())
+    text = await parser.get_text()
+    assert "ORBACTIV® or KIMYRSA™ (oritavancin)" in text
+    assert "Division: Pharmacy Policy\nSubject: Prior Authorization Criteria" in text
+    metadata = await parser.get_info()
+    assert parser.get_title(metadata) == "Kimyrsa and Orbactiv Criteria"
+    assert "KIMYRSA™" in metadata["Keywords"]
+    assert metadata["Pages"] == "1"
+    assert metadata["Page size"] == "612 x 792 pts"
+    assert metadata["CreationDate"] == "Tue Feb  1 14:52:49 2022 UTC"
+
+    # raw image streams in draw order, the same bytes pdfimages -raw writes
+    images = await parser.get_images()
+    assert [image.suffix for image in images] == [".flate", ".flate"]
+    for index, image in enumerate(images):
+        with open(os.path.join(fixture_path, f"image-tmp-000{index}.flate"), "rb") as expected:
+            assert image.read_bytes() == expected.read()
+
+
+@pytest.mark.asyncio
+async def test_mupdf_falls_back_to_poppler(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    file_path = tmp_path / "broken.pdf"
+    file_path.write_bytes(b"not a pdf")
+    parser = pdf.PdfParse(str(file_path), url=str(file_path), scrape_method_config=mupdf_config())
+
+    async def poppler_text(*args, **kwargs):
+        raise FileNotFoundError("pdftotext")
+
+    monkeypatch.setattr(pdf.asyncio, "create_subprocess_exec", poppler_text)
+    assert await parser.get_mupdf_content() is None
+    assert not parser.use_mupdf
+    with pytest.raises(FileNotFoundError):
+        await parser.get_text()
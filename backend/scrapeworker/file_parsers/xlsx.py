@@ -1,11 +1,73 @@
+import asyncio
+import logging
+from typing import Any
+
 import pandas as pd
 from openpyxl import load_workbook
 
+from backend.common.core.enums import XlsxParserBackend
 from backend.scrapeworker.file_parsers.base import FileParser
 
 
 class XlsxParser(FileParser):
+    # stop streaming once either cap is reached, keeps memory bounded on huge workbooks
+    max_rows: int = 100_000
+    max_cells: int = 1_000_000
+
+    def __init__(self, *args, **kwargs):
+        super(XlsxParser, self).__init__(*args, **kwargs)
+        self.workbook_content: tuple[str, dict[str, Any]] | None = None
+        self.use_streaming = bool(
+            self.scrape_method_config
+            and self.scrape_method_config.xlsx_parser == XlsxParserBackend.Streaming
+        )
+
+    async def read_workbook(self) -> tuple[str, dict[str, Any]]:
+        if not self.workbook_content:
+            loop = asyncio.get_running_loop()
+            self.workbook_content = await loop.run_in_executor(None, self.stream_workbook)
+        return self.workbook_content
+
+    def stream_workbook(self) -> tuple[str, dict[str, Any]]:
+        """
+        Read properties and sheet rows in one read-only pass, rows are streamed from the file
+        rather than loaded as a whole. Each non empty row becomes a line of its non empty cells.
+        """
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            props = vars(workbook.properties).copy()  # type: ignore
+            sheets: list[str] = []
+            rows, cells = 0, 0
+            truncated = False
+            for sheet in workbook.worksheets:
+                if truncated:
+                    break
+                sheet.reset_dimensions()  # type: ignore
+                lines: list[str] = []
+                for row in sheet.iter_rows(values_only=True):
+                    values = [str(value).strip() for value in row if value is not None]
+                    line = " ".join(value for value in values if value)
+                    if not line:
+                        continue
+                    lines.append(line)
+                    rows += 1
+                    cells += len(values)
+                    if rows >= self.max_rows or cells >= self.max_cells:
+                        truncated = True
+                        break
+                sheets.append("\n".join(lines))
+        finally:
+            workbook.close()
+        if truncated:
+            logging.warning(f"{self.url} truncated at {rows} rows and {cells} cells")
+        text = "".join(f"{sheet}\n\n" for sheet in sheets)
+        return text, props
+
     async def get_text(self) -> str:
+        if self.use_streaming:
+            text, _ = await self.read_workbook()
+            return text
+
         dataframes = pd.read_excel(
             self.file_path,
             engine="openpyxl",
@@ -17,6 +79,10 @@ class XlsxParser(FileParser):
         return text
 
     async def get_info(self) -> dict[str, str]:
+        if self.use_streaming:
+            _, props = await self.read_workbook()
+            return props
+
         with open(self.file_path, "rb") as f:
             workbook = load_workbook(f)
             props = vars(workbook.properties)  # type: ignore
@@ -1,6 +1,8 @@
 import os
 import pytest
 import aiofiles
+from backend.common.core.enums import XlsxParserBackend
+from backend.common.models.site import ScrapeMethodConfiguration
 from backend.scrapeworker.file_parsers import xlsx
 
 current_path = os.path.dirname(os.path.realpath(__file__))
@@ -22,3 +24,17 @@ async def test_xlsx():
     assert parser.metadata["title"] == "Test Title xlsx"
     assert parser.metadata["subject"] == "Test Subject xlsx"
     assert parser.metadata["category"] == "Test Category xlsx"
+
+
+@pytest.mark.asyncio
+async def test_xlsx_row_cap():
+    file_path = os.path.join(fixture_path, "test.xlsx")
+
+    config = ScrapeMethodConfiguration(xlsx_parser=XlsxParserBackend.Streaming)
+    parser = xlsx.XlsxParser(file_path, url=file_path, scrape_method_config=config)
+    parser.max_rows = 2
+    text = await parser.get_text()
+    metadata = await parser.get_info()
+
+    assert text == "The first sheet\nText in random cell\n\n"
+    assert metadata["title"] == "Test Title xlsx"
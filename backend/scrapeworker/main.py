@@ -23,6 +23,7 @@ sys.path.append(str(Path(__file__).parent.joinpath("../..").resolve()))
 from backend.common.core.config import config, is_local
 from backend.common.core.enums import CollectionMethod, TaskStatus
 from backend.common.db.init import init_db
+from backend.common.events.event_publisher import event_publisher
 from backend.common.models.site import Site
 from backend.common.models.site_scrape_task import SiteScrapeTask
 from backend.scrapeworker.common.exceptions import CanceledTaskException, NoDocsCollectedException
@@ -165,6 +166,8 @@ async def start_worker_async(task_arn):
     async with async_playwright() as playwright:
         await worker_fn(task_arn, playwright)
 
+    await event_publisher.close()
+
     typer.secho("Shutdown Complete", fg=typer.colors.BLUE)
 
 
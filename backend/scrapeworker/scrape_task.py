@@ -13,9 +13,8 @@ import aiofiles.os
 import fitz
 from async_lru import alru_cache
 from beanie.odm.operators.update.general import Inc, Set
-from playwright.async_api import Browser, BrowserContext, Cookie, Dialog, Page, ProxySettings
+from playwright.async_api import Browser, BrowserContext, Cookie, Page, ProxySettings
 from playwright.async_api import Response as PlaywrightResponse
-from playwright_stealth import stealth_async
 from tenacity._asyncio import AsyncRetrying
 from tenacity.stop import stop_after_attempt
 from tenacity.wait import wait_random_exponential
@@ -43,6 +42,7 @@ from backend.common.storage.hash import hash_content, hash_full_text
 from backend.common.storage.s3_client import AsyncS3Client
 from backend.common.storage.settings import settings as s3_settings
 from backend.scrapeworker.common.aio_downloader import AioDownloader, default_headers
+from backend.scrapeworker.common.download_pool import DownloadPool
 from backend.scrapeworker.common.exceptions import CanceledTaskException, NoDocsCollectedException
 from backend.scrapeworker.common.models import DownloadContext, Metadata, Request
 from backend.scrapeworker.common.proxy import convert_proxies_to_proxy_settings
@@ -55,7 +55,10 @@ from backend.scrapeworker.scrapers.by_domain import select_domain_scraper
 from backend.scrapeworker.scrapers.by_domain.tricare import TricareScraper
 from backend.scrapeworker.scrapers.cms.cms_scraper import CMSScrapeController
 from backend.scrapeworker.scrapers.follow_link import FollowLinkScraper
-from backend.scrapeworker.scrapers.playwright_base_scraper import PlaywrightBaseScraper
+from backend.scrapeworker.scrapers.playwright_base_scraper import (
+    PlaywrightBaseScraper,
+    new_stealth_page,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
@@ -88,6 +91,9 @@ class ScrapeTask:
         self.doc_client = doc_client
 
         self.downloader = AioDownloader(self.doc_client, scrape_logger, scrape_temp_path)
+        self.download_pool = DownloadPool(
+            self.attempt_download, self.stop_if_canceled, scrape_logger, fail_fast=True
+        )
         self.playbook = ScrapePlaybook(self.site.playbook)
 
         self.doc_updater = DocumentUpdater(scrape_logger, scrape_task, site)
@@ -267,6 +273,12 @@ class ScrapeTask:
             link_retrieved_task.valid_response = download.valid_response
             link_retrieved_task.invalid_responses = download.invalid_responses
 
+            if download.rejected_reason:
+                self.log.error(download.rejected_reason)
+                link_retrieved_task.error_message = download.rejected_reason
+                await link_retrieved_task.save()
+                return
+
             # log response error
             if not (temp_path and checksum):
                 message = f"Missing required value: temp_path={temp_path} checksum={checksum}"
@@ -320,7 +332,11 @@ class ScrapeTask:
 
             document = None
 
-            text_checksum = hash_full_text(parsed_content["text"])
+            text_checksum = (
+                download.text_checksum
+                if download.text_checksum and download.file_extension in ["txt", "csv"]
+                else hash_full_text(parsed_content["text"])
+            )
             parsed_content["content_checksum"] = await hash_content(
                 parsed_content["text"], parsed_content["images"]
             )
@@ -412,10 +428,6 @@ class ScrapeTask:
         selector = ", ".join(f":text('{wf}')" for wf in wait_for)
         await page.locator(selector).first.wait_for()
 
-    @staticmethod
-    async def handle_dialog(dialog: Dialog):
-        await dialog.accept()
-
     @asynccontextmanager
     async def playwright_context(
         self,
@@ -464,10 +476,7 @@ class ScrapeTask:
                     # probably goes away...
                     await context.add_cookies(cookies)  # type: ignore
 
-                    page = await context.new_page()
-                    await stealth_async(page)
-
-                    page.on("dialog", self.handle_dialog)
+                    page = await new_stealth_page(context)
                     if page_route:
                         await page.route("**/*", page_route)
 
@@ -754,29 +763,4 @@ class ScrapeTask:
 
     async def batch_downloads(self, all_downloads: list, batch_size: int = 10):
         await self.scrape_task.update(Inc({SiteScrapeTask.links_found: len(all_downloads)}))
-
-        batch_index = 0
-        while len(all_downloads) > 0:
-            downloads = all_downloads[:batch_size]
-            del all_downloads[:batch_size]
-
-            tasks = [self.attempt_download(download) for download in downloads]
-
-            done, pending = await asyncio.wait(fs=tasks)
-            self.log.info(f"after wait done={len(done)} pending={len(pending)}")
-
-            [task.cancel() for task in pending]
-
-            # prevents it from complaining about unretrieved exceptions
-            # fail on first
-            exception = None
-            for task in done:
-                if ex := task.exception() and not exception:
-                    exception = Exception(ex)
-
-            if exception:
-                raise Exception(exception)
-
-            batch_index += 1
-
-            await self.stop_if_canceled()
+        await self.download_pool.run(all_downloads, batch_size)
@@ -15,9 +15,8 @@ import aiofiles.os
 import fitz
 from async_lru import alru_cache
 from beanie.odm.operators.update.general import Inc, Set
-from playwright.async_api import Browser, BrowserContext, Cookie, Dialog, Page, ProxySettings
+from playwright.async_api import Browser, BrowserContext, Cookie, Page, ProxySettings
 from playwright.async_api import Response as PlaywrightResponse
-from playwright_stealth import stealth_async
 from tenacity._asyncio import AsyncRetrying
 from tenacity.stop import stop_after_attempt
 from tenacity.wait import wait_random_exponential
@@ -37,6 +36,7 @@ from backend.common.models.link_task_log import (
 from backend.common.models.proxy import Proxy
 from backend.common.models.site import Site
 from backend.common.models.site_scrape_task import SiteScrapeTask
+from backend.common.models.url_index import SiteUrlIndex
 from backend.common.services.doc_lifecycle.doc_lifecycle import DocLifecycleService
 from backend.common.services.doc_lifecycle.hooks import ChangeInfo, doc_document_save_hook
 from backend.common.services.lineage.core import LineageService
@@ -44,10 +44,12 @@ from backend.common.storage.client import DocumentStorageClient
 from backend.common.storage.hash import hash_content, hash_full_text
 from backend.common.storage.text_handler import TextHandler
 from backend.scrapeworker.common.aio_downloader import AioDownloader, default_headers
+from backend.scrapeworker.common.download_pool import DownloadPool
 from backend.scrapeworker.common.exceptions import CanceledTaskException, NoDocsCollectedException
 from backend.scrapeworker.common.models import DownloadContext, Metadata, Request
 from backend.scrapeworker.common.proxy import convert_proxies_to_proxy_settings
 from backend.scrapeworker.common.update_documents import DocumentUpdater
+from backend.scrapeworker.common.url_index import UrlIndex
 from backend.scrapeworker.common.utils import get_extension_from_path_like, supported_mimetypes
 from backend.scrapeworker.crawlers.search_crawler import SearchableCrawler
 from backend.scrapeworker.file_parsers import get_tags, parse_by_type, pdf
@@ -57,7 +59,10 @@ from backend.scrapeworker.scrapers.by_domain import select_domain_scraper
 from backend.scrapeworker.scrapers.by_domain.tricare import TricareScraper
 from backend.scrapeworker.scrapers.cms.cms_scraper import CMSScrapeController
 from backend.scrapeworker.scrapers.follow_link import FollowLinkScraper
-from backend.scrapeworker.scrapers.playwright_base_scraper import PlaywrightBaseScraper
+from backend.scrapeworker.scrapers.playwright_base_scraper import (
+    PlaywrightBaseScraper,
+    new_stealth_page,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
@@ -90,11 +95,13 @@ class ScrapeWorker:
         self.doc_client = DocumentStorageClient()
         self.text_handler = TextHandler()
         self.downloader = AioDownloader(self.doc_client, _log, self.scrape_temp_path)
+        self.download_pool = DownloadPool(self.attempt_download, self.stop_if_canceled, _log)
         self.playbook = ScrapePlaybook(self.site.playbook)
         self.search_crawler = SearchableCrawler(
-            config=self.site.scrape_method_configuration, log=_log
+            config=self.site.scrape_method_configuration, log=_log, scrape_task=scrape_task
         )
         self.doc_updater = DocumentUpdater(_log, scrape_task, site)
+        self.url_index = UrlIndex(site.id, _log)  # type: ignore
         self.lineage_service = LineageService(logger=_log)
         self.doc_lifecycle_service = DocLifecycleService(logger=_log)
         self.new_document_pairs: list[tuple[RetrievedDocument, DocDocument]] = []
@@ -226,12 +233,68 @@ class ScrapeWorker:
             )
         )
 
+    async def update_unchanged_document(
+        self,
+        download: DownloadContext,
+        index_entry: SiteUrlIndex,
+        link_retrieved_task: LinkRetrievedTask,
+    ) -> bool:
+        """
+        Refresh the location of a document that has not changed since the last scrape,
+        without parsing it again. Returns False if the indexed document is gone.
+        """
+        document = await RetrievedDocument.get(index_entry.retrieved_document_id)  # type: ignore
+        location = document.get_site_location(self.site.id) if document else None
+        if not document or not location:
+            return False
+
+        self.log.debug(f"unchanged doc {document.id} url={download.request.url}")
+        await self.doc_updater.update_collected_location(document, location, download)
+        await self.doc_updater.update_doc_document(document)
+        await self.url_index.record(download, index_entry.checksum, document.id)  # type: ignore
+
+        link_retrieved_task.file_metadata = FileMetadata(
+            checksum=document.checksum,
+            file_size=document.file_size,
+            mimetype=download.mimetype or document.content_type or "",
+            file_extension=document.file_extension or "",
+        )
+        await self.save_collected_document(document, link_retrieved_task)
+        return True
+
+    async def save_collected_document(
+        self, document: RetrievedDocument, link_retrieved_task: LinkRetrievedTask
+    ):
+        link_retrieved_task.retrieved_document_id = document.id
+        await asyncio.wait(
+            fs=[
+                self.scrape_task.update(
+                    {
+                        "$set": {"last_doc_collected": datetime.now(tz=timezone.utc)},
+                        "$inc": {"documents_found": 1},
+                        "$push": {"retrieved_document_ids": document.id},
+                    }
+                ),
+                link_retrieved_task.save(),
+            ]
+        )
+
     async def attempt_download(self, download: DownloadContext):
+        if await self.download_and_process(download):
+            # the indexed document is gone, download it again unconditionally
+            await self.download_and_process(download)
+
+    async def download_and_process(self, download: DownloadContext) -> bool:
+        """
+        Returns True if the server reported the file unchanged but its indexed document is gone.
+        The index entry is invalidated by then, so a second call downloads the whole file.
+        """
         url = download.request.url
         proxies = await self.get_proxy_settings()
         link_retrieved_task: LinkRetrievedTask = link_retrieved_task_from_download(
             download, self.scrape_task
         )
+        index_entry = await self.url_index.add_validators(download)
 
         scrape_method_config = self.site.scrape_method_configuration
         async with self.downloader.try_download_to_tempfile(download, proxies) as (
@@ -242,27 +305,42 @@ class ScrapeWorker:
             link_retrieved_task.valid_response = download.valid_response
             link_retrieved_task.invalid_responses = download.invalid_responses
 
+            # skip parsing when the server or the file hash says nothing changed
+            if index_entry and (download.not_modified or checksum == index_entry.checksum):
+                if await self.update_unchanged_document(download, index_entry, link_retrieved_task):
+                    return False
+                if download.not_modified:
+                    await self.url_index.invalidate(download)
+                    self.url_index.remove_validators(download)
+                    return True
+
+            if download.rejected_reason:
+                self.log.error(download.rejected_reason)
+                link_retrieved_task.error_message = download.rejected_reason
+                await link_retrieved_task.save()
+                return False
+
             # log response error
             if not (temp_path and checksum):
                 message = f"Missing required value: temp_path={temp_path} checksum={checksum}"
                 self.log.error(message)
                 link_retrieved_task.error_message = message
                 await link_retrieved_task.save()
-                return
+                return False
 
             if download.mimetype not in supported_mimetypes:
                 message = f"Mimetype not supported. mimetype={download.mimetype}"
                 self.log.error(message)
                 link_retrieved_task.error_message = message
                 await link_retrieved_task.save()
-                return
+                return False
 
             if self.is_unexpected_html(download):
                 message = f"Received an unexpected html response. mimetype={download.mimetype}"
                 self.log.error(message)
                 link_retrieved_task.error_message = message
                 await link_retrieved_task.save()
-                return
+                return False
 
             link_retrieved_task.file_metadata = FileMetadata(checksum=checksum, **download.dict())
 
@@ -277,7 +355,7 @@ class ScrapeWorker:
                 self.log.error(message)
                 link_retrieved_task.error_message = message
                 await link_retrieved_task.save()
-                return
+                return False
 
             dest_path = f"{checksum}.{download.file_extension}"
 
@@ -291,11 +369,15 @@ class ScrapeWorker:
                 self.log.error(message)
                 link_retrieved_task.error_message = message
                 await link_retrieved_task.save()
-                return
+                return False
 
             document = None
 
-            text_checksum = hash_full_text(parsed_content["text"])
+            text_checksum = (
+                download.text_checksum
+                if download.text_checksum and download.file_extension in ["txt", "csv"]
+                else hash_full_text(parsed_content["text"])
+            )
             parsed_content["content_checksum"] = await hash_content(
                 parsed_content["text"], parsed_content["images"]
             )
@@ -333,7 +415,7 @@ class ScrapeWorker:
                 )
                 if not doc_doc:
                     self.log.error(f"DocDocument not found id={document.id} ")
-                    return
+                    return False
 
                 new_location = await self.doc_updater.update_retrieved_document(
                     document=document,
@@ -365,23 +447,12 @@ class ScrapeWorker:
                 )
                 self.new_document_pairs.append((document, doc_document))
 
-            link_retrieved_task.retrieved_document_id = document.id
-
             if download.playwright_download and download.file_path:
                 await aiofiles.os.remove(download.file_path)
 
-            await asyncio.wait(
-                fs=[
-                    self.scrape_task.update(
-                        {
-                            "$set": {"last_doc_collected": datetime.now(tz=timezone.utc)},
-                            "$inc": {"documents_found": 1},
-                            "$push": {"retrieved_document_ids": document.id},
-                        }
-                    ),
-                    link_retrieved_task.save(),
-                ]
-            )
+            await self.url_index.record(download, download.file_hash or checksum, document.id)
+            await self.save_collected_document(document, link_retrieved_task)
+        return False
 
     async def try_each_proxy(self):
         """
@@ -421,9 +492,6 @@ class ScrapeWorker:
         page: Page | None = None
         response: PlaywrightResponse | None = None
 
-        async def handle_dialog(dialog: Dialog):
-            await dialog.accept()
-
         link_base_task: LinkBaseTask = LinkBaseTask(
             base_url=url,
             site_id=self.scrape_task.site_id,
@@ -441,10 +509,7 @@ class ScrapeWorker:
 
                 await context.add_cookies(cookies)  # type: ignore
 
-                page = await context.new_page()
-                await stealth_async(page)
-
-                page.on("dialog", handle_dialog)
+                page = await new_stealth_page(context)
                 if "page_route" in kwargs and kwargs["page_route"] is not None:
                     await page.route("**/*", kwargs["page_route"])
 
@@ -555,21 +620,33 @@ class ScrapeWorker:
                     scrape_method=self.site.scrape_method,
                 )
                 if not is_follow_link and await self.search_crawler.is_searchable(page):
-                    async for code in self.search_crawler.run_searchable(page, playbook_context):
+                    async for search_page, code in self.search_crawler.run_searchable_pool(
+                        page, playbook_context
+                    ):
+                        search_handler = ScrapeHandler(
+                            context=context,
+                            page=search_page,
+                            playbook_context=playbook_context,
+                            log=self.log,
+                            config=scrape_config,
+                            scrape_method=self.site.scrape_method,
+                        )
                         if not scrape_config.follow_links or scrape_config.scrape_base_page:
-                            await scrape_handler.run_scrapers(
+                            await search_handler.run_scrapers(
                                 url,
                                 base_url,
                                 downloads,
                                 {"file_name": code, "is_searchable": True},
                             )
-                        follow_links = await scrape_handler.run_follow_link_scraper(url)
+                        follow_links = await search_handler.run_follow_link_scraper(url)
                         follow_link_targets.update(follow_links)
                         yield downloads
                         async for follow_downloads in self.process_follow_links(
                             follow_link_targets, base_url
                         ):
                             yield follow_downloads
+                        # every result of the code is queued, checkpoint it once downloaded
+                        self.search_crawler.searched(code)
                         downloads = []
                         follow_link_targets = set()
                 else:
@@ -707,6 +784,8 @@ class ScrapeWorker:
     # NOTE: this is the effective entryppoint from main.py
     async def _run_scrape(self):
         all_downloads: list[DownloadContext] = []
+        # searched codes whose results wait in all_downloads
+        queued_codes: list[str] = []
         base_urls: list[str] = [base_url.url for base_url in self.active_base_urls()]
 
         # lets log this at runtime for debuggability
@@ -761,18 +840,22 @@ class ScrapeWorker:
                             for download in retrieved_downloads
                             if self.should_process_download(download)
                         ]
+                        searched_codes = self.search_crawler.take_searched()
                         await self.batch_downloads(download_queue, batch_size)
+                        await self.search_crawler.checkpoint(searched_codes)
                         retrieved_downloads = []
                 all_downloads += retrieved_downloads
             except Exception:
                 all_downloads += retrieved_downloads
                 self.log.error(f"Error queueing downloads for url {url}:", exc_info=True)
+            queued_codes += self.search_crawler.take_searched()
 
         download_queue = [
             download for download in all_downloads if self.should_process_download(download)
         ]
 
         await self.batch_downloads(download_queue)
+        await self.search_crawler.checkpoint(queued_codes)
 
         try:
             self.log.debug(
@@ -802,19 +885,7 @@ class ScrapeWorker:
 
     async def batch_downloads(self, all_downloads: list, batch_size: int = 20):
         await self.scrape_task.update(Inc({SiteScrapeTask.links_found: len(all_downloads)}))
-
-        batch_index = 0
-        while len(all_downloads) > 0:
-            downloads = all_downloads[:batch_size]
-            del all_downloads[:batch_size]
-
-            tasks = [self.attempt_download(download) for download in downloads]
-
-            done, pending = await asyncio.wait(fs=tasks)
-            self.log.debug(f"after wait done={len(done)} pending={len(pending)}")
-            batch_index += 1
-
-            await self.stop_if_canceled()
+        await self.download_pool.run(all_downloads, batch_size)
 
     async def close(self):
         pass
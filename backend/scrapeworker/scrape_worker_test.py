@@ -0,0 +1,71 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from random import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest_asyncio
+from beanie import PydanticObjectId
+
+from backend.common.db.init import init_db
+from backend.common.models.site import ScrapeMethodConfiguration, Site
+from backend.common.models.site_scrape_task import SiteScrapeTask
+from backend.common.models.url_index import SiteUrlIndex
+from backend.common.test.test_utils import mock_s3_client  # noqa
+from backend.scrapeworker.common.models import DownloadContext, Request
+from backend.scrapeworker.scrape_worker import ScrapeWorker
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def before_each_test():
+    random_name = str(random())
+    await init_db(mock=True, database_name=random_name)
+
+
+def simple_scrape_config():
+    return ScrapeMethodConfiguration(
+        document_extensions=[],
+        url_keywords=[],
+        proxy_exclusions=[],
+        follow_links=False,
+        follow_link_keywords=[],
+        follow_link_url_keywords=[],
+    )
+
+
+async def test_missing_indexed_document_is_downloaded_once_more(mock_s3_client):  # noqa
+    site = Site(name="Site", scrape_method_configuration=simple_scrape_config())
+    await site.save()
+    scrape_task = SiteScrapeTask(site_id=site.id, queued_time=datetime.now(tz=timezone.utc))
+    await scrape_task.save()
+    worker = ScrapeWorker(MagicMock(), MagicMock(), scrape_task, site)
+    worker.get_proxy_settings = AsyncMock(return_value=[])
+
+    url = "https://example.com/policy.pdf"
+    indexed = DownloadContext(request=Request(url=url))
+    indexed.response.etag = '"abc"'
+    # the indexed document no longer exists
+    await worker.url_index.record(indexed, "checksum", PydanticObjectId())
+
+    requests: list[dict] = []
+    open_downloads: list[str] = []
+
+    # the server says not modified to every conditional request
+    @asynccontextmanager
+    async def try_download_to_tempfile(download: DownloadContext, proxies):
+        assert not open_downloads
+        requests.append(dict(download.request.headers))
+        download.not_modified = "If-None-Match" in download.request.headers
+        open_downloads.append(download.request.url)
+        try:
+            yield None, None
+        finally:
+            open_downloads.pop()
+
+    worker.downloader.try_download_to_tempfile = try_download_to_tempfile
+    download = DownloadContext(request=Request(url=url))
+    download.metadata.base_url = "https://example.com"
+    await worker.attempt_download(download)
+
+    assert requests == [{"If-None-Match": '"abc"'}, {}]
+    entry = await SiteUrlIndex.find_one({"site_id": site.id, "url": url})
+    assert entry and entry.retrieved_document_id is None
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from logging import Logger
 from typing import Type
@@ -7,14 +8,16 @@ from playwright.async_api import BrowserContext, Page
 
 from backend.common.core.enums import ScrapeMethod
 from backend.common.models.site import ScrapeMethodConfiguration
+from backend.scrapeworker.common.exceptions import CanceledTaskException
 from backend.scrapeworker.common.models import DownloadContext
-from backend.scrapeworker.playbook import PlaybookContext
+from backend.scrapeworker.playbook import PlaybookContext, PlaybookException
 from backend.scrapeworker.scrapers.direct_download import (
     DirectDownloadScraper,
     PlaywrightBaseScraper,
 )
 from backend.scrapeworker.scrapers.follow_link import FollowLinkScraper
 from backend.scrapeworker.scrapers.javascript_click import JavascriptClick
+from backend.scrapeworker.scrapers.playwright_base_scraper import new_stealth_page
 from backend.scrapeworker.scrapers.targeted_html import TargetedHtmlScraper
 
 scrapers: list[Type[PlaywrightBaseScraper]] = [
@@ -67,28 +70,93 @@ class ScrapeHandler:
         )
         return scraper.execute()
 
+    async def clone_page(self) -> Page:
+        return await new_stealth_page(self.context)
+
+    def build_scraper(
+        self, Scraper: Type[PlaywrightBaseScraper], url: str, metadata: dict
+    ) -> PlaywrightBaseScraper:
+        return Scraper(
+            page=self.page,
+            context=self.context,
+            config=self.config,
+            playbook_context=self.playbook_context,
+            url=url,
+            log=self.log,
+            metadata=metadata,
+            scrape_method=self.scrape_method,
+        )
+
+    async def run_scraper(
+        self, scraper: PlaywrightBaseScraper, cloned: bool
+    ) -> list[DownloadContext]:
+        try:
+            if cloned:
+                scraper.page = await self.clone_page()
+                await scraper.nav_to_base()
+
+            if not await scraper.is_applicable():
+                return []
+            return await scraper.execute()
+        except (PlaybookException, CanceledTaskException):
+            # the task has to stop, not just this scraper
+            raise
+        except Exception:
+            # one failing scraper should not cost the documents found by the others
+            self.log.error(f"{scraper.__class__.__name__} failed", exc_info=True)
+            return []
+        finally:
+            if scraper.page is not self.page:
+                await scraper.page.close()
+
     async def run_scrapers(
         self, url: str, base_url: str, downloads: list[DownloadContext], metadata: dict = {}
     ) -> None:
+        is_searchable = metadata.get("is_searchable", False)
+        # search results can not be reloaded, scrapers that click share the page and run last
+        can_clone = not is_searchable
+        # scrapers without selectors can not apply, skip them before cloning or waiting on a page
+        candidates: dict[Type[PlaywrightBaseScraper], PlaywrightBaseScraper] = {}
         for Scraper in scrapers:
-            scraper = Scraper(
-                page=self.page,
-                context=self.context,
-                config=self.config,
-                playbook_context=self.playbook_context,
-                url=url,
-                log=self.log,
-                metadata=metadata,
-                scrape_method=self.scrape_method,
-            )
+            scraper = self.build_scraper(Scraper, url, metadata)
+            if scraper.has_selectors():
+                candidates[Scraper] = scraper
+        cloned = {Scraper for Scraper in candidates if can_clone and Scraper.interacts_with_page}
 
-            if not await scraper.is_applicable():
-                continue
+        # scrapers sharing the page would race each other dismissing its modals, do it once
+        shared = [scraper for Scraper, scraper in candidates.items() if Scraper not in cloned]
+        if shared:
+            await shared[0].prepare_page()
+            for scraper in shared:
+                scraper.page_prepared = True
 
-            is_searchable = metadata.get("is_searchable", False)
+        concurrent = [
+            Scraper for Scraper in candidates if can_clone or not Scraper.interacts_with_page
+        ]
+        outcomes = await asyncio.gather(
+            *[self.run_scraper(candidates[Scraper], Scraper in cloned) for Scraper in concurrent],
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        results: dict[Type[PlaywrightBaseScraper], list[DownloadContext]] = dict(
+            zip(concurrent, outcomes)
+        )
+        for Scraper in scrapers:
+            if Scraper in candidates and Scraper not in results:
+                results[Scraper] = await self.run_scraper(candidates[Scraper], False)
 
-            for download in await scraper.execute():
+        # the same document is often found by more than one strategy, keep the first
+        seen_urls: set[str] = set()
+        for Scraper in scrapers:
+            scraper_urls: set[str] = set()
+            for download in results.get(Scraper, []):
+                if download.request.url in seen_urls:
+                    continue
+                scraper_urls.add(download.request.url)
                 download.is_searchable = is_searchable
                 self.log.debug(f"downloads ... {base_url} {download.request.url}")
                 self.__preprocess_download(download, base_url, metadata)
                 downloads.append(download)
+            seen_urls |= scraper_urls
@@ -104,7 +104,10 @@ class CMSDownloader:
             request=Request(url=download_url), metadata=Metadata(base_url=download_url)
         )
         local_path = self.cms_doc.local_path()
-        async with self.downloader.try_download_to_tempfile(download, self.proxies) as (
+        # archives of the whole cms database, far larger than any document
+        async with self.downloader.try_download_to_tempfile(
+            download, self.proxies, max_file_size=None
+        ) as (
             temp_path,
             _checksum,
         ):
@@ -1,6 +1,6 @@
 from functools import cached_property
 
-from playwright.async_api import ElementHandle, Page
+from playwright.async_api import Page
 
 from backend.scrapeworker.common.models import DownloadContext, Metadata, Request
 from backend.scrapeworker.common.selectors import filter_by_hidden_value, filter_by_href, to_xpath
@@ -46,15 +46,14 @@ class DirectDownloadScraper(PlaywrightBaseScraper):
     async def queue_downloads(
         self,
         downloads: list[DownloadContext],
-        link_handles: list[ElementHandle],
+        link_metadata: list[Metadata],
         base_url: str,
-        resource_attr: str = "href",
     ) -> None:
-        link_handle: ElementHandle
+        if not link_metadata:
+            return
         base_tag_href = await self.get_base_href()
         cookies = await self.context.cookies(base_url)
-        for link_handle in link_handles:
-            metadata: Metadata = await self.extract_metadata(link_handle, resource_attr)
+        for metadata in link_metadata:
             url = normalize_url(base_url, metadata.resource_value, base_tag_href)
             metadata.base_url = base_url
             downloads.append(
@@ -63,12 +62,12 @@ class DirectDownloadScraper(PlaywrightBaseScraper):
 
     async def scrape_and_queue(self, downloads: list[DownloadContext], page: Page) -> None:
 
-        link_handles = await page.query_selector_all(self.css_selector)
-        await self.queue_downloads(downloads, link_handles, self.page.url)
+        link_metadata = await self.extract_all_metadata(page, self.css_selector)
+        await self.queue_downloads(downloads, link_metadata, self.page.url)
 
         for selector, attr_name in self.xpath_selectors():
-            link_handles = await page.query_selector_all(selector)
-            await self.queue_downloads(downloads, link_handles, self.page.url, attr_name)
+            link_metadata = await self.extract_all_metadata(page, selector, attr_name)
+            await self.queue_downloads(downloads, link_metadata, self.page.url)
 
     async def execute(self) -> list[DownloadContext]:
         downloads: list[DownloadContext] = []
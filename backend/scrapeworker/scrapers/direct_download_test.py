@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext, Page
+
+from backend.common.models.site import ScrapeMethodConfiguration
+from backend.scrapeworker.scrapers.direct_download import DirectDownloadScraper
+
+
+def simple_scrape_config():
+    return ScrapeMethodConfiguration(
+        document_extensions=["pdf"],
+        url_keywords=[],
+        proxy_exclusions=[],
+        follow_links=False,
+        follow_link_keywords=[],
+        follow_link_url_keywords=[],
+    )
+
+
+@pytest.fixture()
+def scraper():
+    page = MagicMock(spec=Page)
+    page.url = "https://www.example.com/policies/"
+    page.query_selector = AsyncMock(return_value=None)
+    page.eval_on_selector_all = AsyncMock(
+        return_value=[
+            {
+                "element_content": "  Policy A ",
+                "element_text": "Policy A",
+                "element_id": "a",
+                "resource_value": "a.pdf",
+                "closest_heading": " Policies\n",
+                "siblings_text": "",
+                "anchor_target": "_blank",
+            },
+            {
+                "element_content": "",
+                "element_text": "",
+                "element_id": None,
+                "resource_value": "/docs/b.pdf",
+                "closest_heading": "",
+                "siblings_text": " Effective 2022 ",
+                "anchor_target": None,
+            },
+            {
+                "element_content": None,
+                "element_text": None,
+                "element_id": None,
+                "resource_value": "/docs/c.pdf",
+                "closest_heading": "",
+                "siblings_text": "",
+                "anchor_target": None,
+            },
+        ]
+    )
+    context = MagicMock(spec=BrowserContext)
+    context.cookies = AsyncMock(return_value=[])
+
+    return DirectDownloadScraper(
+        context, page, "https://www.example.com/policies/", simple_scrape_config()
+    )
+
+
+@pytest.mark.asyncio
+async def test_scrape_and_queue_extracts_metadata_in_one_call(scraper: DirectDownloadScraper):
+    downloads = await scraper.execute()
+
+    scraper.page.eval_on_selector_all.assert_awaited_once()
+    assert [download.request.url for download in downloads] == [
+        "https://www.example.com/policies/a.pdf",
+        "https://www.example.com/docs/b.pdf",
+        "https://www.example.com/docs/c.pdf",
+    ]
+
+    first, second, third = [download.metadata for download in downloads]
+    assert first.link_text == "Policy A"
+    assert first.element_id == "a"
+    assert first.closest_heading == "Policies"
+    assert first.siblings_text is None
+    assert first.anchor_target == "_blank"
+    assert first.base_url == "https://www.example.com/policies/"
+    assert second.link_text == "Effective 2022"
+    assert third.link_text == "/docs/c.pdf"
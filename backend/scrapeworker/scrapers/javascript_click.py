@@ -4,6 +4,7 @@ import os
 from functools import cached_property
 
 from playwright.async_api import Download, ElementHandle, Page
+from playwright.async_api import Request as PageRequest
 from playwright.async_api import Response as PageResponse
 from playwright.async_api import TimeoutError as PlaywrightTimeout
 
@@ -12,9 +13,51 @@ from backend.scrapeworker.common.selectors import to_xpath
 from backend.scrapeworker.scrapers.playwright_base_scraper import PlaywrightBaseScraper
 
 
+class InFlightClick:
+    """
+    A click and the pages, downloads and responses it produced.
+    Holds a slot of the in flight window until all of them are processed.
+    """
+
+    def __init__(self, metadata: Metadata, window: asyncio.Semaphore) -> None:
+        self.metadata = metadata
+        self.window = window
+        self.triggered = asyncio.Event()
+        self.tasks: set[asyncio.Task] = set()
+
+    def track(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        self.triggered.set()
+        return task
+
+    async def settle(self, timeout: float, exclude: asyncio.Task | None = None) -> None:
+        # tasks can start more tasks (a popup's download), keep waiting until none are left
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while pending := [task for task in self.tasks if not task.done() and task is not exclude]:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.wait(pending, timeout=remaining)
+
+    async def complete(self, timeout: float) -> None:
+        try:
+            await self.settle(timeout)
+        finally:
+            self.window.release()
+
+
 class JavascriptClick(PlaywrightBaseScraper):
 
     type: str = "Javascript"
+    interacts_with_page: bool = True
+    # clicks whose pages, downloads or responses are still being processed
+    max_in_flight: int = 5
+    # how long a click has to open a page, start a download or make a request
+    click_timeout_ms: int = 2000
+    # how long a click's pages, downloads and responses have to finish
+    complete_timeout_ms: int = 10000
     requests: list[Request | None] = []
     metadatas: list[Metadata] = []
     downloads: list[DownloadContext] = []
@@ -72,96 +115,173 @@ class JavascriptClick(PlaywrightBaseScraper):
             )
         return None
 
+    async def postprocess_response(self, response: PageResponse, click: InFlightClick) -> None:
+        accepted_types = [
+            "application/pdf",
+            "application/vnd.ms-excel",
+            "application/msword",
+        ]
+        try:
+            await response.finished()
+            content_type: str | None = None
+            if "content-type" in response.headers:
+                content_type = response.headers["content-type"]
+            download = await self.handle_json(response)
+            cookies = await self.context.cookies(response.url)
+            if isinstance(download, DownloadContext) and download.content_type in accepted_types:
+                download.request.cookies = cookies
+                download.metadata = click.metadata.copy()
+                self.downloads.append(download)
+            elif content_type in accepted_types:
+                logging.info(f"Direct Download result: {content_type} - {response.url}")
+                download = DownloadContext(
+                    response=Response(content_type=content_type, status=response.status),
+                    request=Request(url=response.url, cookies=cookies),
+                )
+                download.metadata = click.metadata.copy()
+                self.downloads.append(download)
+            else:
+                self.log.debug(f"Unknown json response: {response.headers}")
+                return None
+        except Exception:
+            logging.error("exception", exc_info=True)
+
+    async def postprocess_download(self, download: Download, click: InFlightClick) -> None:
+        accepted_types = [".pdf", ".xls", ".xlsx", ".doc", ".docx"]
+        try:
+            # Response may not always have content-type header.
+            # Use filename ext instead.
+            # suggested_filename='PriorAuthorization.pdf'
+            filename, file_extension = os.path.splitext(download.suggested_filename)
+            if file_extension in accepted_types:
+                self.log.debug(f"javascript click -> direct download: {filename}.{file_extension}")
+                cookies = await self.context.cookies(download.url)
+                download_context = DownloadContext(
+                    response=Response(content_type=None),
+                    request=Request(url=download.url, cookies=cookies),
+                )
+                download_context.metadata = click.metadata.copy()
+                self.downloads.append(download_context)
+            else:
+                self.log.debug(f"unknown download extension: {file_extension}")
+                return None
+        except Exception:
+            logging.error("exception", exc_info=True)
+
+    async def process_popup(self, page: Page, click: InFlightClick) -> None:
+        timeout = self.complete_timeout_ms / 1000
+        page.on(
+            "download", lambda download: click.track(self.postprocess_download(download, click))
+        )
+        try:
+            # a popup either renders or turns into a download, whichever comes first
+            loaded = asyncio.create_task(page.wait_for_load_state("load"))
+            downloaded = asyncio.create_task(page.wait_for_event("download"))
+            done, pending = await asyncio.wait(
+                [loaded, downloaded], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
+            for task in done:
+                # retrieve the error of a page that closed itself, it is closed below anyway
+                task.exception()
+            # let the page's responses finish before closing it
+            await click.settle(timeout, exclude=asyncio.current_task())
+        finally:
+            await page.close()
+
     async def execute(self) -> list[DownloadContext]:
-        downloads: list[DownloadContext] = []
+        self.downloads = []
         link_handle: ElementHandle
-        page_process_queue: list[asyncio.Future[None]] = []
-
-        async def postprocess_response(response: PageResponse) -> None:
-            accepted_types = [
-                "application/pdf",
-                "application/vnd.ms-excel",
-                "application/msword",
-            ]
-            try:
-                await response.finished()
-                content_type: str | None = None
-                if "content-type" in response.headers:
-                    content_type = response.headers["content-type"]
-                download = await self.handle_json(response)
-                cookies = await self.context.cookies(response.url)
-                if (
-                    isinstance(download, DownloadContext)
-                    and download.content_type in accepted_types
-                ):
-                    download.request.cookies = cookies
-                    download.metadata = await self.extract_metadata(link_handle)
-                    downloads.append(download)
-                elif content_type in accepted_types:
-                    logging.info(f"Direct Download result: {content_type} - {response.url}")
-                    download = DownloadContext(
-                        response=Response(content_type=content_type, status=response.status),
-                        request=Request(url=response.url, cookies=cookies),
-                    )
-                    download.metadata = await self.extract_metadata(link_handle)
-                    downloads.append(download)
-                else:
-                    self.log.debug(f"Unknown json response: {response.headers}")
-                    return None
-            except Exception:
-                logging.error("exception", exc_info=True)
+        window = asyncio.Semaphore(self.max_in_flight)
+        completions: list[asyncio.Task] = []
+        # the click waiting for its first event, and where later events came from
+        current: InFlightClick | None = None
+        # popups and downloads showing up after the click timeout most likely belong to it
+        last: InFlightClick | None = None
+        clicks: list[InFlightClick] = []
+        stray_pages: list[asyncio.Task] = []
+        page_clicks: dict[Page, InFlightClick] = {}
+        request_clicks: dict[PageRequest, InFlightClick] = {}
+
+        def on_page(page: Page):
+            if click := current or last:
+                page_clicks[page] = click
+                click.track(self.process_popup(page, click))
+            else:
+                stray_pages.append(asyncio.create_task(page.close()))
 
-        async def postprocess_download(download: Download) -> None:
-            accepted_types = [".pdf", ".xls", ".xlsx", ".doc", ".docx"]
+        def on_request(request: PageRequest):
             try:
-                # Response may not always have content-type header.
-                # Use filename ext instead.
-                # suggested_filename='PriorAuthorization.pdf'
-                filename, file_extension = os.path.splitext(download.suggested_filename)
-                if file_extension in accepted_types:
-                    self.log.debug(
-                        f"javascript click -> direct download: {filename}.{file_extension}"
-                    )
-                    cookies = await self.context.cookies(download.url)
-                    download_context = DownloadContext(
-                        response=Response(content_type=None),
-                        request=Request(url=download.url, cookies=cookies),
-                    )
-                    download_context.metadata = await self.extract_metadata(link_handle)
-                    downloads.append(download_context)
-                else:
-                    self.log.debug(f"unknown download extension: {file_extension}")
-                    return None
+                page = request.frame.page
             except Exception:
-                logging.error("exception", exc_info=True)
+                # service worker requests have no frame
+                return
+            if page == self.page:
+                click = current
+            else:
+                # a popup's first requests can come before the page event registered it
+                click = page_clicks.get(page) or current or last
+            if click:
+                request_clicks[request] = click
+            if current and page == self.page:
+                current.triggered.set()
 
-        async def cleanup_page(page: Page):
-            page.on("download", postprocess_download)
-            cleanup_future = asyncio.Future()
-            page_process_queue.append(cleanup_future)
-            await asyncio.sleep(10)  # allow processes to complete
-            await page.close()
-            cleanup_future.set_result(None)
+        def on_response(response: PageResponse):
+            # Handle onclick json response where the json has link to pdf.
+            if click := request_clicks.pop(response.request, None):
+                click.track(self.postprocess_response(response, click))
 
-        self.context.on("page", cleanup_page)
-        # Handle onclick json response where the json has link to pdf.
-        self.context.on("response", postprocess_response)
-        # Handle onclick download directly to pdf rather than response.
-        self.page.on("download", postprocess_download)
+        def on_download(download: Download):
+            # Handle onclick download directly to pdf rather than response.
+            if click := current or last:
+                click.track(self.postprocess_download(download, click))
 
-        xpath_locator = self.page.locator(self.xpath_selector)
-        xpath_locator_count = await xpath_locator.count()
-        for index in range(0, xpath_locator_count):
-            try:
-                link_handle = await xpath_locator.nth(index).element_handle(timeout=1000)
-                await link_handle.click(timeout=10000, button="middle")
-                await asyncio.sleep(0.25)
-            except PlaywrightTimeout as ex:
-                # If Playwright Timeout, we likely haven't nav'd away
-                self.log.error(ex, exc_info=True)
-            except Exception as ex:
-                self.log.error(ex, exc_info=True, stack_info=True)
-                await self.nav_to_base()
-
-        await asyncio.gather(*page_process_queue)  # be sure all downloads complete
-        return downloads
+        self.context.on("page", on_page)
+        self.context.on("request", on_request)
+        self.context.on("response", on_response)
+        self.page.on("download", on_download)
+
+        try:
+            start_url = self.page.url
+            xpath_locator = self.page.locator(self.xpath_selector)
+            xpath_locator_count = await xpath_locator.count()
+            for index in range(0, xpath_locator_count):
+                await window.acquire()
+                click: InFlightClick | None = None
+                try:
+                    link_handle = await xpath_locator.nth(index).element_handle(timeout=1000)
+                    click = InFlightClick(await self.extract_metadata(link_handle), window)
+                    current = last = click
+                    clicks.append(click)
+                    await link_handle.click(timeout=10000, button="middle")
+                    await asyncio.wait_for(click.triggered.wait(), self.click_timeout_ms / 1000)
+                except asyncio.TimeoutError:
+                    self.log.debug(f"click {index} opened no page, download or request")
+                except PlaywrightTimeout as ex:
+                    # If Playwright Timeout, we likely haven't nav'd away
+                    self.log.error(ex, exc_info=True)
+                except Exception as ex:
+                    self.log.error(ex, exc_info=True, stack_info=True)
+                    if self.page.url != start_url:
+                        await self.nav_to_base()
+                finally:
+                    current = None
+                    if click:
+                        completion = click.complete(self.complete_timeout_ms / 1000)
+                        completions.append(asyncio.create_task(completion))
+                    else:
+                        window.release()
+
+            await asyncio.gather(*completions)  # be sure all downloads complete
+            # including those of events which arrived after their click completed
+            timeout = self.complete_timeout_ms / 1000
+            settled = [click.settle(timeout) for click in clicks]
+            await asyncio.gather(*settled, *stray_pages, return_exceptions=True)
+        finally:
+            self.context.remove_listener("page", on_page)
+            self.context.remove_listener("request", on_request)
+            self.context.remove_listener("response", on_response)
+            self.page.remove_listener("download", on_download)
+
+        return self.downloads
@@ -0,0 +1,165 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext, Download, Locator, Page
+
+from backend.common.models.site import AttrSelector, ScrapeMethodConfiguration
+from backend.scrapeworker.common.models import Metadata
+from backend.scrapeworker.scrapers.javascript_click import InFlightClick, JavascriptClick
+
+
+def simple_scrape_config():
+    return ScrapeMethodConfiguration(
+        document_extensions=[],
+        url_keywords=[],
+        proxy_exclusions=[],
+        follow_links=False,
+        follow_link_keywords=[],
+        follow_link_url_keywords=[],
+        attr_selectors=[AttrSelector(attr_element="a", attr_name="onclick")],
+    )
+
+
+class EventEmitter:
+    def __init__(self) -> None:
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners[event] = handler
+
+    def remove_listener(self, event, handler):
+        self.listeners.pop(event)
+
+    def emit(self, event, *args):
+        if handler := self.listeners.get(event):
+            handler(*args)
+
+
+def fake_download(url: str):
+    download = MagicMock(spec=Download)
+    download.url = url
+    download.suggested_filename = url.rsplit("/", 1)[-1]
+    return download
+
+
+@pytest.fixture()
+def scraper():
+    context_events, page_events = EventEmitter(), EventEmitter()
+    context = MagicMock(spec=BrowserContext)
+    context.on, context.remove_listener = context_events.on, context_events.remove_listener
+    context.cookies = AsyncMock(return_value=[])
+
+    page = MagicMock(spec=Page)
+    page.url = "https://www.example.com/"
+    page.on, page.remove_listener = page_events.on, page_events.remove_listener
+
+    # the first link downloads a pdf, the second does nothing
+    clicks = [lambda **_: page_events.emit("download", fake_download("https://e.com/a.pdf")), None]
+    link_handles = []
+    for index, click in enumerate(clicks):
+        link_handle = MagicMock()
+        link_handle.evaluate = AsyncMock(return_value={"element_content": f"Link {index}"})
+        link_handle.click = AsyncMock(side_effect=click)
+        link_handles.append(link_handle)
+
+    locator = MagicMock(spec=Locator)
+    locator.count = AsyncMock(return_value=len(link_handles))
+    locator.nth = lambda index: MagicMock(
+        element_handle=AsyncMock(return_value=link_handles[index])
+    )
+    page.locator.return_value = locator
+
+    js_scraper = JavascriptClick(context, page, "https://www.example.com/", simple_scrape_config())
+    js_scraper.click_timeout_ms = 10
+    return js_scraper, context_events, link_handles
+
+
+@pytest.mark.asyncio
+async def test_execute_attributes_downloads_to_clicks(scraper):
+    js_scraper, context_events, _ = scraper
+    downloads = await js_scraper.execute()
+
+    assert [download.request.url for download in downloads] == ["https://e.com/a.pdf"]
+    assert downloads[0].metadata.link_text == "Link 0"
+    assert context_events.listeners == {}
+
+
+@pytest.mark.asyncio
+async def test_execute_attributes_popups_opened_after_click_timeout(scraper):
+    js_scraper, context_events, link_handles = scraper
+    popup_events = EventEmitter()
+    popup = MagicMock(spec=Page)
+    popup.on = popup_events.on
+    popup.close = AsyncMock()
+    popup.wait_for_event = AsyncMock()
+    # the popup turns into a download once it loads
+    popup.wait_for_load_state = AsyncMock(
+        side_effect=lambda *_: popup_events.emit("download", fake_download("https://e.com/b.pdf"))
+    )
+    # the first link's popup opens after its click timed out, while the second link is found
+    link_handles[0].click.side_effect = lambda **_: asyncio.get_running_loop().call_later(
+        0.02, context_events.emit, "page", popup
+    )
+
+    async def slow_element_handle(**_):
+        await asyncio.sleep(0.05)
+        return link_handles[1]
+
+    locator = js_scraper.page.locator.return_value
+    locator.nth = lambda index: MagicMock(
+        element_handle=AsyncMock(return_value=link_handles[0])
+        if index == 0
+        else slow_element_handle
+    )
+    downloads = await js_scraper.execute()
+
+    assert [download.request.url for download in downloads] == ["https://e.com/b.pdf"]
+    assert downloads[0].metadata.link_text == "Link 0"
+    popup.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_execute_keeps_responses_of_popups_not_yet_registered(scraper):
+    js_scraper, context_events, link_handles = scraper
+    popup = MagicMock(spec=Page)
+    request = MagicMock()
+    request.frame.page = popup
+    response = MagicMock()
+    response.request, response.url, response.status = request, "https://e.com/c.pdf", 200
+    response.headers = {"content-type": "application/pdf"}
+    response.finished = AsyncMock()
+    response.json = AsyncMock(side_effect=ValueError("not json"))
+
+    # the new tab loads the pdf before the context reports the page
+    def click(**_):
+        context_events.emit("request", request)
+        context_events.emit("response", response)
+
+    link_handles[0].click.side_effect = click
+    downloads = await js_scraper.execute()
+
+    assert [download.request.url for download in downloads] == ["https://e.com/c.pdf"]
+    assert downloads[0].metadata.link_text == "Link 0"
+
+
+@pytest.mark.asyncio
+async def test_in_flight_click_holds_window_until_settled():
+    window = asyncio.Semaphore(1)
+    await window.acquire()
+    click = InFlightClick(Metadata(), window)
+    finished = asyncio.Event()
+
+    async def nested():
+        await asyncio.sleep(0)
+        finished.set()
+
+    async def work():
+        click.track(nested())
+
+    click.track(work())
+    assert click.triggered.is_set()
+
+    await click.complete(timeout=1)
+    assert finished.is_set()
+    assert not window.locked()
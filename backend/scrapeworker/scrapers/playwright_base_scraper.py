@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from abc import ABC, abstractmethod
 from functools import cached_property
@@ -7,6 +6,7 @@ from urllib.parse import urlparse, urlsplit
 
 from playwright.async_api import (
     BrowserContext,
+    Dialog,
     ElementHandle,
     Error,
     Page,
@@ -15,6 +15,7 @@ from playwright.async_api import (
     Route,
     TimeoutError,
 )
+from playwright_stealth import stealth_async
 
 from backend.common.core.config import config
 from backend.common.core.enums import ScrapeMethod
@@ -56,6 +57,35 @@ sibling_text_expression: str = """
     }
 """
 
+element_metadata_expression: str = f"""
+    (node, resourceAttr) => ({{
+        element_content: node.textContent,
+        element_text: node.innerText ?? null,
+        element_id: node.getAttribute('id'),
+        resource_value: node.getAttribute(resourceAttr),
+        closest_heading: ({closest_heading_expression})(node),
+        siblings_text: ({sibling_text_expression})(node),
+        anchor_target: node.getAttribute('target'),
+    }})
+"""
+
+elements_metadata_expression: str = f"""
+    (nodes, resourceAttr) => nodes.map(
+        (node) => ({element_metadata_expression})(node, resourceAttr)
+    )
+"""
+
+
+async def accept_dialog(dialog: Dialog):
+    await dialog.accept()
+
+
+async def new_stealth_page(context: BrowserContext) -> Page:
+    page = await context.new_page()
+    await stealth_async(page)
+    page.on("dialog", accept_dialog)
+    return page
+
 
 class PlaywrightBaseScraper(ABC):
     base_url: str = None
@@ -63,6 +93,8 @@ class PlaywrightBaseScraper(ABC):
     batch_size = 20
     page_route: Callable | None = None
     skip_hash_check: bool = False
+    # scrapers that click through the page need a page of their own to run alongside others
+    interacts_with_page: bool = False
 
     def __init__(
         self,
@@ -85,6 +117,8 @@ class PlaywrightBaseScraper(ABC):
         self.log = log
         self.metadata = metadata
         self.scrape_method = scrape_method
+        # set once the page was waited on and its modals dismissed
+        self.page_prepared = False
 
     @cached_property
     def css_selector(self) -> str | None:
@@ -157,12 +191,23 @@ class PlaywrightBaseScraper(ABC):
                     if button:
                         await button.click()
 
-    async def is_applicable(self) -> bool:
+    def has_selectors(self) -> bool:
+        # without selectors nothing can be found, no need to load the page to tell
+        return bool(self.css_selector or self.xpath_selector)
+
+    async def prepare_page(self):
+        if self.page_prepared:
+            return
 
         timeout = self.config.wait_for_timeout_ms
         await self.page.wait_for_timeout(timeout)
 
         await self.dismiss_modals()
+        self.page_prepared = True
+
+    async def is_applicable(self) -> bool:
+
+        await self.prepare_page()
 
         in_parent_frame = await self.find_in_page(self.page)
 
@@ -181,28 +226,12 @@ class PlaywrightBaseScraper(ABC):
             return await base_tag.get_attribute("href")
         return None
 
-    async def extract_metadata(
-        self, element: ElementHandle, resource_attr: str = "href"
-    ) -> Metadata:
-
-        closest_heading: str | None
-        (
-            element_content,
-            element_text,
-            element_id,
-            resource_value,
-            closest_heading,
-            siblings_text,
-            anchor_target,
-        ) = await asyncio.gather(
-            element.text_content(),
-            element.inner_text(),
-            element.get_attribute("id"),
-            element.get_attribute(resource_attr),
-            element.evaluate(closest_heading_expression),
-            element.evaluate(sibling_text_expression),
-            element.get_attribute("target"),
-        )
+    def build_metadata(self, attributes: dict) -> Metadata:
+        closest_heading: str | None = attributes.get("closest_heading")
+        element_content: str | None = attributes.get("element_content")
+        element_text: str | None = attributes.get("element_text")
+        resource_value: str | None = attributes.get("resource_value")
+        siblings_text: str | None = attributes.get("siblings_text")
 
         if isinstance(siblings_text, str):
             siblings_text = siblings_text.strip() or None
@@ -226,13 +255,28 @@ class PlaywrightBaseScraper(ABC):
 
         return Metadata(
             link_text=link_text,
-            element_id=element_id,
+            element_id=attributes.get("element_id"),
             resource_value=resource_value,
             closest_heading=closest_heading,
             playbook_context=self.playbook_context,
             siblings_text=siblings_text,
-            anchor_target=anchor_target,
+            anchor_target=attributes.get("anchor_target"),
+        )
+
+    async def extract_metadata(
+        self, element: ElementHandle, resource_attr: str = "href"
+    ) -> Metadata:
+        attributes = await element.evaluate(element_metadata_expression, resource_attr)
+        return self.build_metadata(attributes)
+
+    async def extract_all_metadata(
+        self, page: Page, selector: str, resource_attr: str = "href"
+    ) -> list[Metadata]:
+        # one round trip for every matching element, rather than one per attribute per element
+        elements_attributes = await page.eval_on_selector_all(
+            selector, elements_metadata_expression, resource_attr
         )
+        return [self.build_metadata(attributes) for attributes in elements_attributes]
 
     def convert_proxy(self, proxy: Proxy):
         username: str | None = None
@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import BrowserContext, Page
+
+from backend.common.models.site import ScrapeMethodConfiguration
+from backend.scrapeworker import scrapers as scrapers_module
+from backend.scrapeworker.common.models import DownloadContext, Metadata, Request
+from backend.scrapeworker.playbook import PlaybookException
+from backend.scrapeworker.scrapers import ScrapeHandler
+from backend.scrapeworker.scrapers.playwright_base_scraper import PlaywrightBaseScraper
+
+
+class FakeScraper(PlaywrightBaseScraper):
+    xpath_selector = "//a"
+    urls: list[str] = []
+    running: set[str] = set()
+    overlapped: bool = False
+    pages: list[Page] = []
+    dismissed: list[Page] = []
+
+    async def dismiss_modals(self):
+        FakeScraper.dismissed.append(self.page)
+
+    async def nav_to_base(self):
+        pass
+
+    async def find_in_page(self, page: Page) -> bool:
+        return True
+
+    async def execute(self) -> list[DownloadContext]:
+        FakeScraper.pages.append(self.page)
+        FakeScraper.running.add(self.type)
+        await asyncio.sleep(0.01)
+        FakeScraper.overlapped |= len(FakeScraper.running) > 1
+        FakeScraper.running.discard(self.type)
+        return [
+            DownloadContext(metadata=Metadata(link_text=url), request=Request(url=url))
+            for url in self.urls
+        ]
+
+
+class LinkScraper(FakeScraper):
+    type = "Link"
+    urls = ["https://example.com/a.pdf", "https://example.com/b.pdf"]
+
+
+class ClickScraper(FakeScraper):
+    type = "Click"
+    interacts_with_page = True
+    urls = ["https://example.com/b.pdf", "https://example.com/c.pdf", "https://example.com/c.pdf"]
+
+
+@pytest.fixture()
+def handler(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(scrapers_module, "scrapers", [LinkScraper, ClickScraper])
+    FakeScraper.pages = []
+    FakeScraper.dismissed = []
+    FakeScraper.overlapped = False
+
+    clone = MagicMock(spec=Page)
+    context = MagicMock(spec=BrowserContext)
+    context.new_page = AsyncMock(return_value=clone)
+    scrape_handler = ScrapeHandler(
+        context=context,
+        page=MagicMock(spec=Page),
+        playbook_context=[],
+        log=MagicMock(),
+        config=ScrapeMethodConfiguration(),
+    )
+    monkeypatch.setattr(scrape_handler, "clone_page", AsyncMock(return_value=clone))
+    return scrape_handler, clone
+
+
+@pytest.mark.asyncio
+async def test_run_scrapers_concurrently_and_deduplicate(handler):
+    scrape_handler, clone = handler
+    downloads: list[DownloadContext] = []
+    await scrape_handler.run_scrapers("https://example.com", "https://example.com", downloads)
+
+    assert FakeScraper.overlapped
+    assert FakeScraper.pages == [scrape_handler.page, clone]
+    assert FakeScraper.dismissed == [scrape_handler.page, clone]
+    clone.close.assert_awaited_once()
+    # urls found by an earlier scraper are dropped, a scraper's own repeats are kept
+    assert [download.request.url for download in downloads] == [
+        "https://example.com/a.pdf",
+        "https://example.com/b.pdf",
+        "https://example.com/c.pdf",
+        "https://example.com/c.pdf",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_scrapers_shares_searchable_page(handler):
+    scrape_handler, clone = handler
+    downloads: list[DownloadContext] = []
+    metadata = {"file_name": "J1234", "is_searchable": True}
+    await scrape_handler.run_scrapers(
+        "https://example.com", "https://example.com", downloads, metadata
+    )
+
+    assert not FakeScraper.overlapped
+    assert FakeScraper.pages == [scrape_handler.page, scrape_handler.page]
+    # modals of the shared page are dismissed once, not by every scraper
+    assert FakeScraper.dismissed == [scrape_handler.page]
+    assert all(download.is_searchable for download in downloads)
+    assert len(downloads) == 4
+
+
+@pytest.mark.asyncio
+async def test_run_scrapers_keeps_results_of_others_on_failure(handler, monkeypatch):
+    scrape_handler, clone = handler
+    monkeypatch.setattr(LinkScraper, "execute", AsyncMock(side_effect=ValueError("broken")))
+    downloads: list[DownloadContext] = []
+    await scrape_handler.run_scrapers("https://example.com", "https://example.com", downloads)
+
+    assert len(downloads) == 3
+    clone.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_scrapers_skips_scrapers_without_selectors(handler, monkeypatch):
+    scrape_handler, _ = handler
+    monkeypatch.setattr(ClickScraper, "xpath_selector", "")
+    downloads: list[DownloadContext] = []
+    await scrape_handler.run_scrapers("https://example.com", "https://example.com", downloads)
+
+    scrape_handler.clone_page.assert_not_awaited()
+    assert FakeScraper.pages == [scrape_handler.page]
+    assert len(downloads) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_scrapers_raises_playbook_errors(handler, monkeypatch):
+    scrape_handler, clone = handler
+    monkeypatch.setattr(ClickScraper, "nav_to_base", AsyncMock(side_effect=PlaybookException()))
+    with pytest.raises(PlaybookException):
+        await scrape_handler.run_scrapers("https://example.com", "https://example.com", [])
+
+    clone.close.assert_awaited_once()
@@ -78,7 +78,7 @@ class TargetedHtmlScraper(PlaywrightBaseScraper):
         return html_content
 
     def _clean_html(self, html: str) -> str:
-        soup = BeautifulSoup(html, features="html.parser")
+        soup = BeautifulSoup(html, features=self.config.html_parser.value)
         for selector in self.config.html_exclusion_selectors:
             attrs = {}
             attrs[selector.attr_name] = (
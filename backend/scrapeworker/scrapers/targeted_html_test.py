@@ -1,8 +1,10 @@
 from unittest.mock import MagicMock
 
 import pytest
+from bs4 import BeautifulSoup
 from playwright.async_api import BrowserContext, Page
 
+from backend.common.core.enums import HtmlParserBackend
 from backend.common.models.site import AttrSelector, ScrapeMethodConfiguration
 from backend.common.test.test_utils import mock_s3_client  # noqa
 from backend.scrapeworker.scrapers.targeted_html import TargetedHtmlScraper
@@ -65,3 +67,24 @@ def test_multiple_delete_clean_html(mock_s3_client, scraper: TargetedHtmlScraper
     html = '<div><span delete="me">byebye</span><div delete_me="test"></div><div>not me</div></div>'
     clean_html = scraper._clean_html(html)
     assert test_html == clean_html
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<div delete_me="test"></div><div>not me</div>',
+        '<html><div>not <span delete="me">me</span></div></html>',
+        "<html><body><p>some <b>text</b></p><table><tr><td>cell</td></tr></table></body></html>",
+    ],
+)
+def test_clean_html_parser_backends(
+    mock_s3_client, scraper: TargetedHtmlScraper, html: str  # noqa
+):
+    texts = []
+    for html_parser in HtmlParserBackend:
+        scraper.config.html_parser = html_parser
+        clean_html = scraper._clean_html(html)
+        soup = BeautifulSoup(clean_html, features="html.parser")
+        texts.append(" ".join(soup.body.stripped_strings))
+    assert texts[0].startswith("Code: 12345")
+    assert all(text == texts[0] for text in texts)
@@ -14,6 +14,7 @@ import logging
 
 from backend.app.core.settings import settings
 from backend.common.db.init import init_db
+from backend.common.events.event_publisher import event_publisher
 from backend.common.tasks.task_queue import TaskQueue
 
 worker_id = str(uuid4())
@@ -45,6 +46,7 @@ async def main():
         await queue.listen(worker_id)
     except (KeyboardInterrupt, SystemExit):
         await queue.onshutdown()
+        await event_publisher.close()
         sys.exit(0)
 
 
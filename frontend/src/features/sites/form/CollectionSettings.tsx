@@ -11,6 +11,9 @@ import {
   WaitForTimeout,
   SearchInFrames,
   PromptButtonSelector,
+  PdfParser,
+  XlsxParser,
+  HtmlParser,
 } from './ScrapeConfigFields';
 
 import { AttrSelectors } from './AttrSelectorField';
@@ -137,6 +140,9 @@ export function CollectionSettings({ initialValues }: CollectionSettingsPropType
               <Playbook />
               <SearchInFrames />
               <PromptButtonSelector />
+              <PdfParser />
+              <XlsxParser />
+              <HtmlParser />
               <ProxyExclusions />
               <FocusTagConfig initialValues={initialValues} />
               <Form.Item
@@ -2,7 +2,7 @@ import { Input, Form, Select, Tooltip, Switch, Checkbox } from 'antd';
 import { QuestionCircleOutlined } from '@ant-design/icons';
 
 import { useGetProxiesQuery } from '../../proxies/proxiesApi';
-import { ScrapeMethod } from '../types';
+import { HtmlParserBackend, PdfParserBackend, ScrapeMethod, XlsxParserBackend } from '../types';
 
 export function CmsDocTypes() {
   const scrapeMethod: ScrapeMethod = Form.useWatch(['scrape_method']);
@@ -162,6 +162,78 @@ export function SearchInFrames() {
   );
 }
 
+export function PdfParser() {
+  const parsers = [
+    { value: PdfParserBackend.Poppler, label: 'Poppler' },
+    { value: PdfParserBackend.MuPdf, label: 'PyMuPDF' },
+  ];
+  return (
+    <Form.Item
+      name={['scrape_method_configuration', 'pdf_parser']}
+      label={
+        <>
+          <span style={{ marginRight: '5px' }}>PDF Parser</span>
+          <Tooltip
+            placement="right"
+            title="PyMuPDF parses in process and falls back to Poppler on errors"
+          >
+            <QuestionCircleOutlined />
+          </Tooltip>
+        </>
+      }
+    >
+      <Select options={parsers} />
+    </Form.Item>
+  );
+}
+
+export function XlsxParser() {
+  const parsers = [
+    { value: XlsxParserBackend.Pandas, label: 'Pandas' },
+    { value: XlsxParserBackend.Streaming, label: 'Streaming' },
+  ];
+  return (
+    <Form.Item
+      name={['scrape_method_configuration', 'xlsx_parser']}
+      label={
+        <>
+          <span style={{ marginRight: '5px' }}>XLSX Parser</span>
+          <Tooltip
+            placement="right"
+            title="Streaming reads large workbooks with bounded memory, one line per row"
+          >
+            <QuestionCircleOutlined />
+          </Tooltip>
+        </>
+      }
+    >
+      <Select options={parsers} />
+    </Form.Item>
+  );
+}
+
+export function HtmlParser() {
+  const parsers = [
+    { value: HtmlParserBackend.Python, label: 'Python' },
+    { value: HtmlParserBackend.Lxml, label: 'lxml' },
+  ];
+  return (
+    <Form.Item
+      name={['scrape_method_configuration', 'html_parser']}
+      label={
+        <>
+          <span style={{ marginRight: '5px' }}>HTML Parser</span>
+          <Tooltip placement="right" title="lxml parses large pages faster to the same text">
+            <QuestionCircleOutlined />
+          </Tooltip>
+        </>
+      }
+    >
+      <Select options={parsers} />
+    </Form.Item>
+  );
+}
+
 export function PromptButtonSelector() {
   return (
     <Form.Item
@@ -1,5 +1,5 @@
 import { QuestionCircleOutlined } from '@ant-design/icons';
-import { Input, Form, Switch, Select, Tooltip } from 'antd';
+import { Input, InputNumber, Form, Switch, Select, Tooltip } from 'antd';
 import { SearchableType } from '../types';
 import { playbookValidator } from './utils';
 import { ElementInput, NameInput, ValueInput, ContainsTextInput } from './AttrSelectorField';
@@ -81,6 +81,13 @@ export function SearchTokens() {
             >
               <Input allowClear type="number" step={1} min={1} max={100}></Input>
             </Form.Item>
+            <Form.Item
+              name={['scrape_method_configuration', 'searchable_concurrency']}
+              label="Search Pages"
+              tooltip="Number of pages searching at the same time"
+            >
+              <InputNumber step={1} min={1} max={10} />
+            </Form.Item>
           </div>
           <Form.Item
             name={inputName}
@@ -1,6 +1,12 @@
 import { Card, Checkbox, Col, Form, Input, Row, Select, Typography } from 'antd';
 import { FormInstance } from 'antd/lib/form/Form';
-import { Site, CollectionMethod } from '../types';
+import {
+  Site,
+  CollectionMethod,
+  HtmlParserBackend,
+  PdfParserBackend,
+  XlsxParserBackend,
+} from '../types';
 import { UrlFormFields } from './UrlFormField';
 import { CollectionSettings } from './CollectionSettings';
 import { SiteStatus } from '../siteStatus';
@@ -55,6 +61,7 @@ const buildInitialValues = () => ({
     scrape_base_page: true,
     searchable: false,
     search_prefix_length: null,
+    searchable_concurrency: 1,
     searchable_playbook: null,
     searchable_type: [],
     searchable_input: null,
@@ -65,6 +72,9 @@ const buildInitialValues = () => ({
     focus_section_configs: [],
     cms_doc_types: [],
     prompt_button_selector: null,
+    pdf_parser: PdfParserBackend.Poppler,
+    xlsx_parser: XlsxParserBackend.Pandas,
+    html_parser: HtmlParserBackend.Python,
     debug: false,
   },
   doc_type_threshold_override: false,
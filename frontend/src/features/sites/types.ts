@@ -38,6 +38,7 @@ export interface Site extends BaseDocument {
     scrape_base_page: boolean;
     searchable: boolean;
     search_prefix_length: number | null;
+    searchable_concurrency: number;
     searchable_type: SearchableType[];
     searchable_input: AttrSelector | null;
     searchable_submit: AttrSelector | null;
@@ -47,6 +48,9 @@ export interface Site extends BaseDocument {
     html_exclusion_selectors: AttrSelector[];
     focus_section_configs: FocusSectionConfig[];
     cms_doc_types: CmsDocType[];
+    pdf_parser: PdfParserBackend;
+    xlsx_parser: XlsxParserBackend;
+    html_parser: HtmlParserBackend;
     debug: boolean;
   };
   tags: string[];
@@ -100,6 +104,21 @@ export enum SearchableType {
   Universal = 'UNIVERSAL',
 }
 
+export enum PdfParserBackend {
+  Poppler = 'POPPLER',
+  MuPdf = 'MUPDF',
+}
+
+export enum XlsxParserBackend {
+  Pandas = 'PANDAS',
+  Streaming = 'STREAMING',
+}
+
+export enum HtmlParserBackend {
+  Python = 'html.parser',
+  Lxml = 'lxml',
+}
+
 export enum SectionType {
   Therapy = 'THERAPY',
   Indication = 'INDICATION',